@@ -0,0 +1,244 @@
+"""Benchmark suite for the tradingagents dataflow layer.
+
+Generates a synthetic local DATA_DIR (see benchmarks/fixtures.py) and times:
+- every ``local`` implementation in VENDOR_METHODS
+- get_stock_stats_indicators_window for each supported indicator
+- the overhead route_to_vendor adds on top of a no-op implementation
+
+Results are written to benchmarks/results/<commit>.json and compared with the
+most recent earlier result file, so regressions show up commit over commit.
+
+Usage:
+    python benchmarks/bench_dataflows.py
+    python benchmarks/bench_dataflows.py --filter indicator --repeat 10
+    python benchmarks/bench_dataflows.py --compare 0817fbd --max-regression 20
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(PROJECT_DIR, "benchmarks", "results")
+sys.path.insert(0, PROJECT_DIR)
+
+SYMBOL = "AAPL"
+CURR_DATE = "2025-03-20"
+
+# Arguments each routed method is benchmarked with
+METHOD_ARGS = {
+    "get_stock_data": (SYMBOL, "2024-01-02", "2024-12-31"),
+    "get_indicators": (SYMBOL, "rsi", CURR_DATE, 30),
+    "get_indicators_batch": (SYMBOL, ["close_50_sma", "rsi", "macd", "boll", "atr"], CURR_DATE, 30),
+    "get_balance_sheet": (SYMBOL, "quarterly", CURR_DATE),
+    "get_cashflow": (SYMBOL, "quarterly", CURR_DATE),
+    "get_income_statement": (SYMBOL, "quarterly", CURR_DATE),
+    "get_news": (SYMBOL, "2025-03-06", "2025-03-20"),
+    "get_global_news": (CURR_DATE, 7, 5),
+    "get_insider_sentiment": (SYMBOL, CURR_DATE),
+    "get_insider_transactions": (SYMBOL, CURR_DATE),
+}
+
+def measure(func, repeat: int, number: int) -> dict:
+    """Time `func` like timeit: one warm-up call, then `repeat` rounds of `number` calls."""
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        func()
+        rounds = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            rounds.append((time.perf_counter() - start) / number * 1000)
+    return {
+        "min_ms": round(min(rounds), 4),
+        "median_ms": round(statistics.median(rounds), 4),
+        "mean_ms": round(statistics.mean(rounds), 4),
+        "repeat": repeat,
+        "number": number,
+    }
+
+
+def collect_cases():
+    """Build the (name, callable) pairs to benchmark."""
+    from tradingagents.dataflows.interface import VENDOR_METHODS, resolve_vendor_impl
+    from tradingagents.dataflows.y_finance import (
+        INDICATOR_DESCRIPTIONS,
+        get_stock_stats_indicators_window,
+    )
+
+    cases = []
+    for method, vendors in VENDOR_METHODS.items():
+        refs = vendors.get("local")
+        if refs is None or method not in METHOD_ARGS:
+            continue
+        for ref in refs if isinstance(refs, list) else [refs]:
+            impl = resolve_vendor_impl(ref)
+            args = METHOD_ARGS[method]
+            cases.append((f"local/{method}/{ref.split(':')[1]}", lambda impl=impl, args=args: impl(*args)))
+
+    for indicator in INDICATOR_DESCRIPTIONS:
+        cases.append(
+            (
+                f"indicator_window/{indicator}",
+                lambda indicator=indicator: get_stock_stats_indicators_window(
+                    SYMBOL, indicator, CURR_DATE, 30
+                ),
+            )
+        )
+    return cases
+
+
+def measure_routing_overhead(repeat: int, number: int) -> dict:
+    """route_to_vendor time minus the time of the no-op implementation it routes to."""
+    from tradingagents.dataflows import interface
+    from tradingagents.dataflows.config import get_config, set_config
+
+    def noop(*args, **kwargs):
+        return ""
+
+    method = "get_insider_sentiment"
+    previous_tool_vendors = get_config().get("tool_vendors", {})
+    interface.VENDOR_METHODS[method]["bench_noop"] = noop
+    set_config({"tool_vendors": {**previous_tool_vendors, method: "bench_noop"}})
+    try:
+        direct = measure(lambda: noop(SYMBOL, CURR_DATE), repeat, number)
+        routed = measure(lambda: interface.route_to_vendor(method, SYMBOL, CURR_DATE), repeat, number)
+    finally:
+        del interface.VENDOR_METHODS[method]["bench_noop"]
+        set_config({"tool_vendors": previous_tool_vendors})
+
+    overhead = {k: round(routed[k] - direct[k], 4) for k in ("min_ms", "median_ms", "mean_ms")}
+    overhead.update(repeat=repeat, number=number)
+    return overhead
+
+
+def git_revision():
+    """Short commit hash of the working tree and whether it has uncommitted changes."""
+    try:
+        sha = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(
+            subprocess.run(
+                ["git", "status", "--porcelain", "--", "tradingagents"],
+                cwd=PROJECT_DIR,
+                capture_output=True,
+                text=True,
+            ).stdout.strip()
+        )
+        return sha, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", True
+
+
+def load_baseline(ref, current_path):
+    """Load results for `ref` (commit or path), or the newest other result file when ref is None."""
+    if ref:
+        path = ref if os.path.exists(ref) else os.path.join(RESULTS_DIR, f"{ref}.json")
+    else:
+        candidates = [
+            os.path.join(RESULTS_DIR, name)
+            for name in os.listdir(RESULTS_DIR)
+            if name.endswith(".json") and os.path.join(RESULTS_DIR, name) != current_path
+        ] if os.path.isdir(RESULTS_DIR) else []
+        if not candidates:
+            return None
+        path = max(candidates, key=os.path.getmtime)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No benchmark results found for {ref}")
+    with open(path) as f:
+        return json.load(f)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filter", default=None, help="Only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing rounds per benchmark")
+    parser.add_argument("--number", type=int, default=1, help="Calls per timing round")
+    parser.add_argument("--data-dir", default=None, help="Reuse/generate fixtures here instead of a temp dir")
+    parser.add_argument("--compare", default=None, help="Commit or result file to compare against")
+    parser.add_argument("--no-save", action="store_true", help="Do not write benchmarks/results/<commit>.json")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=None,
+        help="Fail if any benchmark's median is this many percent slower than the baseline",
+    )
+    args = parser.parse_args()
+
+    from fixtures import build_fixtures
+    from tradingagents.dataflows.config import set_config
+    from tradingagents.default_config import DEFAULT_CONFIG
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_dir = args.data_dir or tmp_dir
+        print(f"Generating synthetic fixtures in {data_dir}")
+        overrides = build_fixtures(data_dir)
+        set_config(
+            {
+                **overrides,
+                "data_vendors": {category: "local" for category in DEFAULT_CONFIG["data_vendors"]},
+                "tool_vendors": {},
+                "vendor_fallback": False,
+                "output_encoding": {**DEFAULT_CONFIG["output_encoding"], "report_savings": False},
+            }
+        )
+
+        results = {}
+        cases = collect_cases()
+        cases.append(("route_to_vendor/overhead", None))
+        for name, func in cases:
+            if args.filter and args.filter not in name:
+                continue
+            if func is None:
+                results[name] = measure_routing_overhead(args.repeat, max(args.number, 1000))
+            else:
+                results[name] = measure(func, args.repeat, args.number)
+            print(f"{name:60s} {results[name]['median_ms']:>10.3f} ms")
+
+    sha, dirty = git_revision()
+    report = {
+        "commit": sha,
+        "dirty": dirty,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+    current_path = os.path.join(RESULTS_DIR, f"{sha}{'-dirty' if dirty else ''}.json")
+    baseline = load_baseline(args.compare, current_path)
+    failed = False
+    if baseline:
+        print(f"\nCompared with {baseline['commit']} ({baseline['timestamp']}):")
+        for name, stats in results.items():
+            before = baseline["results"].get(name)
+            if not before or before["median_ms"] <= 0:
+                continue
+            change = (stats["median_ms"] / before["median_ms"] - 1) * 100
+            marker = ""
+            if args.max_regression is not None and change > args.max_regression:
+                marker = "  REGRESSION"
+                failed = True
+            print(f"{name:60s} {before['median_ms']:>10.3f} -> {stats['median_ms']:>10.3f} ms ({change:+.1f}%){marker}")
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        with open(current_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved results to {os.path.relpath(current_path, PROJECT_DIR)}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
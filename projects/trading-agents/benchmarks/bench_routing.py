@@ -0,0 +1,160 @@
+"""Latency/cost profile of a per-node model routing table, fully offline.
+
+Runs TradingAgentsGraph.propagate on synthetic local data (see
+benchmarks/fixtures.py) with the deterministic "fake" LLM provider. Every
+named model of the routing table gets its own fake latency, so the effect of
+routing a node to a slower or faster model, and of its timeout fallback, can
+be measured per node before trying it against real providers.
+
+Prints, per node: the routed model, its timeout and fallback, how many calls
+timed out, wall and LLM seconds, and tokens/cost as priced by model_pricing.
+
+Usage:
+    python benchmarks/bench_routing.py
+    python benchmarks/bench_routing.py --model local=2.0 --quick-latency 0.2 --deep-latency 1.0 \\
+        --route "Bull Researcher=local:0.5" --route "Bear Researcher=local"
+    python benchmarks/bench_routing.py --routing routing.json --output results/routing.json
+
+--routing takes a JSON file with a model_routing section; --route and --model
+are applied on top of it.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+
+def parse_route(text):
+    """NODE=MODEL[:TIMEOUT] -> (node, route)."""
+    node, _, target = text.partition("=")
+    model, _, timeout = target.partition(":")
+    if not node or not model:
+        raise argparse.ArgumentTypeError(f"Expected NODE=MODEL[:TIMEOUT], got {text!r}")
+    route = {"model": model}
+    if timeout:
+        route["timeout"] = float(timeout)
+    return node, route
+
+
+def parse_model(text):
+    """NAME=LATENCY -> (name, latency)."""
+    name, _, latency = text.partition("=")
+    try:
+        return name, float(latency)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected NAME=LATENCY, got {text!r}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticker", default="AAPL")
+    parser.add_argument("--date", default="2025-03-20")
+    parser.add_argument("--runs", type=int, default=1, help="Number of propagate runs")
+    parser.add_argument("--routing", default=None, help="JSON file with a model_routing section")
+    parser.add_argument("--route", type=parse_route, action="append", default=[], help="NODE=MODEL[:TIMEOUT]")
+    parser.add_argument("--model", type=parse_model, action="append", default=[], help="NAME=LATENCY of a fake model")
+    parser.add_argument("--quick-latency", type=float, default=0.0, help="Fake seconds per quick_think_llm call")
+    parser.add_argument("--deep-latency", type=float, default=0.0, help="Fake seconds per deep_think_llm call")
+    parser.add_argument("--timeout", type=float, default=None, help="Default timeout of every route")
+    parser.add_argument("--output", default=None, help="Write the per-node results as JSON here")
+    args = parser.parse_args()
+
+    from fixtures import build_fixtures
+    from tradingagents.default_config import DEFAULT_CONFIG
+    from tradingagents.graph.accounting import create_token_accountant
+    from tradingagents.graph.profiling import DEFAULT_TOOL_SCRIPT, Profiler
+    from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+    routing = json.loads(json.dumps(DEFAULT_CONFIG["model_routing"]))
+    if args.routing:
+        with open(args.routing) as f:
+            overrides = json.load(f)
+        routing["models"].update(overrides.get("models", {}))
+        routing["nodes"].update(overrides.get("nodes", {}))
+        routing.update({k: v for k, v in overrides.items() if k not in ("models", "nodes")})
+    routing["nodes"].update(dict(args.route))
+    if args.timeout is not None:
+        routing["timeout"] = args.timeout
+
+    # Every named model becomes a fake model with its own latency
+    latencies = dict(args.model)
+    for name, spec in routing["models"].items():
+        spec.update(provider="fake", fake_llm={"latency": latencies.get(name, 0.0)})
+    for name, latency in latencies.items():
+        routing["models"].setdefault(name, {"model": name, "provider": "fake", "fake_llm": {"latency": latency}})
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config = DEFAULT_CONFIG.copy()
+        config.update(build_fixtures(os.path.join(tmp_dir, "data")))
+        config.update(
+            {
+                "results_dir": os.path.join(tmp_dir, "results"),
+                "llm_provider": "fake",
+                "fake_llm": {
+                    **DEFAULT_CONFIG["fake_llm"],
+                    # The local get_news implementation includes the Google News scraper
+                    "tool_script": {k: v for k, v in DEFAULT_TOOL_SCRIPT.items() if k != "get_news"},
+                },
+                "model_routing": routing,
+                "data_vendors": {category: "local" for category in DEFAULT_CONFIG["data_vendors"]},
+                "tool_vendors": {},
+                "checkpoint_enabled": False,
+            }
+        )
+
+        graph = TradingAgentsGraph(config=config)
+        # quick/deep (and their timeout variants) are built from the global
+        # fake_llm settings; give them their latencies
+        for tier, latency in (("quick", args.quick_latency), ("deep", args.deep_latency)):
+            for llm in graph.model_router.variants(tier):
+                llm.latency = latency
+
+        profiler = Profiler()
+        accountant = create_token_accountant(config)
+        for _ in range(args.runs):
+            graph.propagate(args.ticker, args.date, resume=False, callbacks=[profiler, accountant])
+
+    summary = profiler.summary()
+    usage = accountant.report()
+    results = {}
+    for node, route in graph.model_router.table().items():
+        stats = summary["nodes"].get(node, {})
+        node_usage = usage["nodes"].get(node, {})
+        results[node] = {
+            **route,
+            "wall_seconds": round(stats.get("wall_seconds", 0.0), 4),
+            "llm_seconds": round(stats.get("llm_seconds", 0.0), 4),
+            "total_tokens": node_usage.get("total_tokens", 0),
+            "cost": node_usage.get("cost", 0.0),
+        }
+
+    print(
+        f"\n{'node':22s} {'model':10s} {'timeout':>8s} {'fallback':10s} {'calls':>6s} "
+        f"{'timeouts':>8s} {'wall s':>8s} {'llm s':>8s} {'tokens':>8s} {'cost $':>9s}"
+    )
+    for node, row in results.items():
+        print(
+            f"{node:22s} {row['model']:10s} {str(row['timeout'] or '-'):>8s} {str(row['fallback']):10s} "
+            f"{row.get('calls', '-')!s:>6s} {row.get('timeouts', '-')!s:>8s} {row['wall_seconds']:8.3f} "
+            f"{row['llm_seconds']:8.3f} {row['total_tokens']:8d} {row['cost']:9.5f}"
+        )
+    print(
+        f"\ngraph {summary['graph_seconds']:.3f}s over {args.runs} run(s), "
+        f"{usage['totals']['total_tokens']} tokens, ~${usage['totals']['cost']:.4f}"
+    )
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump({"routing": routing, "nodes": results, "graph_seconds": summary["graph_seconds"]}, f, indent=2)
+        print(f"Saved results to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""Synthetic local-vendor data for the dataflow benchmarks.
+
+Builds a DATA_DIR with the same layout the ``local`` vendor reads: 15-year
+daily OHLCV CSVs, SimFin-shaped statement CSVs, finnhub JSON and a reddit
+JSONL corpus. Everything is generated from a fixed seed, so timings are
+comparable across commits.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+PRICE_FILE = "{symbol}-YFin-data-2015-01-01-2025-03-25.csv"
+PRICE_START = "2010-03-25"
+PRICE_END = "2025-03-25"
+
+SIMFIN_STATEMENTS = {
+    "balance_sheet": ("balance", ["Total Assets", "Total Liabilities", "Total Equity", "Cash, Cash Equivalents & Short Term Investments"]),
+    "cash_flow": ("cashflow", ["Net Cash from Operating Activities", "Net Cash from Investing Activities", "Net Cash from Financing Activities", "Net Change in Cash"]),
+    "income_statements": ("income", ["Revenue", "Cost of Revenue", "Gross Profit", "Operating Income (Loss)", "Net Income"]),
+}
+
+REDDIT_SUBREDDITS = {
+    "global_news": ["worldnews", "news", "economics"],
+    "company_news": ["stocks", "investing", "wallstreetbets"],
+}
+
+
+def _trading_days(start: str, end: str) -> pd.DatetimeIndex:
+    return pd.bdate_range(start, end)
+
+
+def write_price_data(data_dir: str, cache_dir: str, symbol: str, rng: np.random.Generator):
+    """Geometric random walk OHLCV, written where get_YFin_data and stockstats read it."""
+    dates = _trading_days(PRICE_START, PRICE_END)
+    returns = rng.normal(0.0004, 0.02, len(dates))
+    close = 100 * np.exp(np.cumsum(returns))
+    spread = np.abs(rng.normal(0, 0.01, len(dates))) * close
+    frame = pd.DataFrame(
+        {
+            "Date": dates.strftime("%Y-%m-%d"),
+            "Open": close * (1 + rng.normal(0, 0.005, len(dates))),
+            "High": close + spread,
+            "Low": close - spread,
+            "Close": close,
+            "Adj Close": close,
+            "Volume": rng.integers(1_000_000, 50_000_000, len(dates)),
+        }
+    )
+
+    price_dir = os.path.join(data_dir, "market_data", "price_data")
+    os.makedirs(price_dir, exist_ok=True)
+    os.makedirs(cache_dir, exist_ok=True)
+    for directory in (price_dir, cache_dir):
+        frame.to_csv(os.path.join(directory, PRICE_FILE.format(symbol=symbol)), index=False)
+
+
+def write_simfin_data(data_dir: str, symbols, rng: np.random.Generator):
+    """Quarterly and annual statements for every symbol, semicolon separated like SimFin bulk files."""
+    for folder, (prefix, columns) in SIMFIN_STATEMENTS.items():
+        directory = os.path.join(
+            data_dir, "fundamental_data", "simfin_data_all", folder, "companies", "us"
+        )
+        os.makedirs(directory, exist_ok=True)
+        for freq, months in (("quarterly", 3), ("annual", 12)):
+            rows = []
+            for simfin_id, symbol in enumerate(symbols):
+                report = pd.Timestamp(PRICE_START)
+                while report < pd.Timestamp(PRICE_END):
+                    row = {
+                        "Ticker": symbol,
+                        "SimFinId": simfin_id,
+                        "Currency": "USD",
+                        "Fiscal Year": report.year,
+                        "Fiscal Period": f"Q{(report.month - 1) // 3 + 1}" if months == 3 else "FY",
+                        "Report Date": report.strftime("%Y-%m-%d"),
+                        "Publish Date": (report + pd.Timedelta(days=35)).strftime("%Y-%m-%d"),
+                        "Shares (Basic)": int(rng.integers(1e8, 1e10)),
+                    }
+                    for column in columns:
+                        row[column] = int(rng.normal(1e9, 3e8))
+                    rows.append(row)
+                    report += pd.DateOffset(months=months)
+            pd.DataFrame(rows).to_csv(
+                os.path.join(directory, f"us-{prefix}-{freq}.csv"), sep=";", index=False
+            )
+
+
+def write_finnhub_data(data_dir: str, symbol: str, rng: np.random.Generator, days: int = 730):
+    """Daily news, insider sentiment and insider transactions for the last `days` days of history."""
+    end = datetime.strptime(PRICE_END, "%Y-%m-%d")
+    dates = [(end - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days)]
+
+    news = {
+        date: [
+            {
+                "headline": f"{symbol} headline {date} #{i}",
+                "summary": f"Synthetic summary of {symbol} news item {i} on {date}. " * 3,
+            }
+            for i in range(int(rng.integers(0, 6)))
+        ]
+        for date in dates
+    }
+    senti = {
+        date: [
+            {
+                "year": int(date[:4]),
+                "month": int(date[5:7]),
+                "change": int(rng.integers(-50000, 50000)),
+                "mspr": float(rng.uniform(-100, 100)),
+            }
+        ]
+        for date in dates[::30]
+    }
+    trans = {
+        date: [
+            {
+                "filingDate": date,
+                "name": f"Insider {i}",
+                "change": int(rng.integers(-20000, 20000)),
+                "share": int(rng.integers(1000, 1_000_000)),
+                "transactionPrice": float(rng.uniform(50, 500)),
+                "transactionCode": str(rng.choice(["S", "P", "M"])),
+            }
+            for i in range(int(rng.integers(0, 3)))
+        ]
+        for date in dates
+    }
+
+    for data_type, payload in (("news_data", news), ("insider_senti", senti), ("insider_trans", trans)):
+        directory = os.path.join(data_dir, "finnhub_data", data_type)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"{symbol}_data_formatted.json"), "w") as f:
+            json.dump(payload, f)
+
+
+def write_reddit_data(data_dir: str, symbols, rng: np.random.Generator, days: int = 120, posts_per_day: int = 40):
+    """One JSONL file per subreddit with `posts_per_day` posts for each of the last `days` days."""
+    end = datetime.strptime(PRICE_END, "%Y-%m-%d")
+    for category, subreddits in REDDIT_SUBREDDITS.items():
+        directory = os.path.join(data_dir, "reddit_data", category)
+        os.makedirs(directory, exist_ok=True)
+        for subreddit in subreddits:
+            with open(os.path.join(directory, f"{subreddit}.jsonl"), "w") as f:
+                for day in range(days):
+                    timestamp = (end - timedelta(days=day)).timestamp() + 43200
+                    for i in range(posts_per_day):
+                        symbol = symbols[i % len(symbols)]
+                        post = {
+                            "created_utc": timestamp,
+                            "title": f"{symbol} post {i} in r/{subreddit}",
+                            "selftext": "" if i % 4 == 0 else f"Discussion about {symbol}. " * 10,
+                            "url": f"https://reddit.com/r/{subreddit}/{day}/{i}",
+                            "ups": int(rng.integers(0, 10000)),
+                        }
+                        f.write(json.dumps(post) + "\n")
+
+
+def build_fixtures(data_dir: str, symbols=("AAPL", "NVDA"), seed: int = 0) -> dict:
+    """Generate the full synthetic DATA_DIR and return the config overrides that point at it."""
+    rng = np.random.default_rng(seed)
+    cache_dir = os.path.join(data_dir, "data_cache")
+    for symbol in symbols:
+        write_price_data(data_dir, cache_dir, symbol, rng)
+        write_finnhub_data(data_dir, symbol, rng)
+    write_simfin_data(data_dir, symbols, rng)
+    write_reddit_data(data_dir, list(symbols), rng)
+    return {"data_dir": data_dir, "data_cache_dir": cache_dir}
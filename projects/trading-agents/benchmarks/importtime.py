@@ -0,0 +1,109 @@
+"""Import-time regression benchmark for tradingagents.
+
+Runs ``python -X importtime`` on the modules the CLI and cron jobs import at
+startup and fails if any provider SDK or data vendor library is loaded before
+it is actually used.
+
+Usage:
+    python benchmarks/importtime.py
+    python benchmarks/importtime.py --module cli.main --max-ms 1500 --top 20
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = ["tradingagents.graph.trading_graph"]
+
+# Modules that must only be imported once a provider or vendor is selected
+FORBIDDEN_MODULES = [
+    "langchain_openai",
+    "langchain_anthropic",
+    "langchain_google_genai",
+    "openai",
+    "anthropic",
+    "chromadb",
+    "yfinance",
+    "stockstats",
+    "bs4",
+    "tenacity",
+    "pandas",
+]
+
+
+def measure(module: str):
+    """Import `module` in a fresh interpreter and parse the -X importtime report.
+
+    Returns a dict of top-level module name -> cumulative microseconds and the
+    total cumulative microseconds of the requested import.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        errors = [l for l in proc.stderr.splitlines() if not l.startswith("import time:")]
+        raise RuntimeError(f"Importing {module} failed:\n" + "\n".join(errors))
+
+    cumulative = {}
+    total = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|", 2)
+        name = name.strip()
+        cumulative[name] = int(cumulative_us)
+        if name == module:
+            total = int(cumulative_us)
+    return cumulative, total
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--module",
+        action="append",
+        help="Module to import (repeatable). Defaults to tradingagents.graph.trading_graph",
+    )
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        default=None,
+        help="Fail if a module takes longer than this to import",
+    )
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest imports to show")
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.module or DEFAULT_MODULES:
+        cumulative, total = measure(module)
+        print(f"{module}: {total / 1000:.1f} ms cumulative, {len(cumulative)} modules")
+
+        top_level = {
+            name: us for name, us in cumulative.items() if "." not in name and name != module
+        }
+        for name, us in sorted(top_level.items(), key=lambda item: item[1], reverse=True)[: args.top]:
+            print(f"  {us / 1000:8.1f} ms  {name}")
+
+        loaded = sorted(
+            name for name in FORBIDDEN_MODULES
+            if any(m == name or m.startswith(name + ".") for m in cumulative)
+        )
+        if loaded:
+            failed = True
+            print(f"FAIL: {module} eagerly imports {', '.join(loaded)}")
+
+        if args.max_ms is not None and total / 1000 > args.max_ms:
+            failed = True
+            print(f"FAIL: {module} took {total / 1000:.1f} ms (limit {args.max_ms} ms)")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""End-to-end latency profile of TradingAgentsGraph.propagate, fully offline.
+
+Runs the graph on synthetic local data (see benchmarks/fixtures.py) with the
+deterministic "fake" LLM provider, records every node, LLM call and tool call
+with graph.profiling.Profiler, and writes:
+- trace.json     Chrome trace (chrome://tracing, Perfetto or speedscope)
+- stacks.folded  folded stacks for flamegraph.pl / speedscope
+- summary.json   per-node wall, LLM and tool time, sizes and overhead
+
+With --latency 0 the LLM costs nothing, so what remains is tool I/O plus the
+graph's own orchestration overhead, which --max-overhead-ms can guard.
+
+Usage:
+    python benchmarks/profile_graph.py
+    python benchmarks/profile_graph.py --latency 0.5 --runs 3 --output profile/
+    python benchmarks/profile_graph.py --max-overhead-ms 250
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticker", default="AAPL")
+    parser.add_argument("--date", default="2025-03-20")
+    parser.add_argument("--runs", type=int, default=1, help="Number of propagate runs to profile")
+    parser.add_argument("--latency", type=float, default=0.0, help="Fake LLM seconds per call")
+    parser.add_argument("--seconds-per-token", type=float, default=0.0, help="Fake LLM seconds per output token")
+    parser.add_argument("--output", default=os.path.join(PROJECT_DIR, "benchmarks", "results", "profile"))
+    parser.add_argument(
+        "--max-overhead-ms",
+        type=float,
+        default=None,
+        help="Fail if orchestration plus in-node Python overhead per run exceeds this",
+    )
+    args = parser.parse_args()
+
+    from fixtures import build_fixtures
+    from tradingagents.default_config import DEFAULT_CONFIG
+    from tradingagents.graph.profiling import DEFAULT_TOOL_SCRIPT, Profiler
+    from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config = DEFAULT_CONFIG.copy()
+        config.update(build_fixtures(os.path.join(tmp_dir, "data")))
+        config.update(
+            {
+                "results_dir": os.path.join(tmp_dir, "results"),
+                "llm_provider": "fake",
+                "fake_llm": {
+                    **DEFAULT_CONFIG["fake_llm"],
+                    "latency": args.latency,
+                    "seconds_per_token": args.seconds_per_token,
+                    # The local get_news implementation includes the Google News scraper
+                    "tool_script": {k: v for k, v in DEFAULT_TOOL_SCRIPT.items() if k != "get_news"},
+                },
+                "data_vendors": {category: "local" for category in DEFAULT_CONFIG["data_vendors"]},
+                "tool_vendors": {},
+                "checkpoint_enabled": False,
+            }
+        )
+
+        graph = TradingAgentsGraph(config=config)
+        profiler = Profiler()
+        for _ in range(args.runs):
+            graph.propagate(args.ticker, args.date, resume=False, callbacks=[profiler])
+
+    paths = profiler.save(args.output)
+    summary = profiler.summary()
+
+    overhead = summary["orchestration_seconds"] + sum(
+        stats["overhead_seconds"] for stats in summary["nodes"].values()
+    )
+    per_run_ms = overhead / args.runs * 1000
+
+    print(f"\n{'node':32s} {'wall s':>9s} {'llm s':>9s} {'tool s':>9s} {'other s':>9s}")
+    for name, stats in summary["nodes"].items():
+        print(
+            f"{name:32s} {stats['wall_seconds']:9.3f} {stats.get('llm_seconds', 0):9.3f} "
+            f"{stats.get('tool_seconds', 0):9.3f} {stats['overhead_seconds']:9.3f}"
+        )
+    print(
+        f"\ngraph {summary['graph_seconds']:.3f}s = llm {summary['llm_seconds']:.3f}s"
+        f" + tools {summary['tool_seconds']:.3f}s + overhead {overhead:.3f}s"
+        f" ({per_run_ms:.1f} ms per run)"
+    )
+    print(json.dumps(paths, indent=2))
+
+    if args.max_overhead_ms is not None and per_run_ms > args.max_overhead_ms:
+        print(f"FAIL: overhead {per_run_ms:.1f} ms per run exceeds {args.max_overhead_ms} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
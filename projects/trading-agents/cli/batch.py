@@ -0,0 +1,244 @@
+"""Headless batch runs of TradingAgentsGraph over a job list.
+
+A job list is a YAML or CSV file of (ticker, date, analysts, depth, models)
+rows. YAML files hold either a list of jobs or a mapping with `defaults`
+applied to every entry of `jobs`:
+
+    defaults:
+      depth: 2
+      deep_think_llm: o4-mini
+    jobs:
+      - {ticker: NVDA, date: 2025-03-20}
+      - {ticker: AAPL, date: 2025-03-20, analysts: [market, news]}
+
+CSV files have a header row with the same field names; `analysts` is a
+space- or semicolon-separated list.
+
+Jobs that need the same graph (analysts, depth and models) share one
+TradingAgentsGraph instance, and all graphs share one tool result cache, so
+jobs run concurrently without rebuilding agents per job. Duplicate jobs
+(same graph, ticker and date) share a checkpoint thread and run one after
+the other.
+"""
+
+import csv
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, field_validator
+
+from cli.models import AnalystType
+
+ALL_ANALYSTS = [analyst for analyst in AnalystType]
+
+# Config keys a job can override, by job field
+MODEL_FIELDS = {
+    "llm_provider": "llm_provider",
+    "backend_url": "backend_url",
+    "quick_think_llm": "quick_think_llm",
+    "deep_think_llm": "deep_think_llm",
+}
+
+
+class BatchJob(BaseModel):
+    """One (ticker, date) run of a batch."""
+
+    ticker: str
+    date: str
+    analysts: List[AnalystType] = ALL_ANALYSTS
+    depth: int = 1
+    llm_provider: Optional[str] = None
+    backend_url: Optional[str] = None
+    quick_think_llm: Optional[str] = None
+    deep_think_llm: Optional[str] = None
+
+    @field_validator("ticker")
+    @classmethod
+    def _upper_ticker(cls, value):
+        value = value.strip().upper()
+        if not value:
+            raise ValueError("ticker must not be empty")
+        return value
+
+    @field_validator("date", mode="before")
+    @classmethod
+    def _check_date(cls, value):
+        value = str(value).strip()
+        datetime.strptime(value, "%Y-%m-%d")
+        return value
+
+    @field_validator("analysts", mode="before")
+    @classmethod
+    def _split_analysts(cls, value):
+        if value is None or value == "":
+            return ALL_ANALYSTS
+        if isinstance(value, str):
+            value = value.replace(";", " ").replace(",", " ").split()
+        return [str(analyst).strip().lower() for analyst in value]
+
+    @field_validator("depth")
+    @classmethod
+    def _check_depth(cls, value):
+        if value < 1:
+            raise ValueError("depth must be at least 1")
+        return value
+
+    def graph_key(self) -> tuple:
+        """Jobs with equal keys can share a graph."""
+        return (
+            tuple(analyst.value for analyst in self.analysts),
+            self.depth,
+            *(getattr(self, field) for field in MODEL_FIELDS),
+        )
+
+    def apply_to(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a copy of `config` with this job's depth and model overrides."""
+        config = config.copy()
+        config["max_debate_rounds"] = self.depth
+        config["max_risk_discuss_rounds"] = self.depth
+        for field, key in MODEL_FIELDS.items():
+            value = getattr(self, field)
+            if value:
+                config[key] = value.lower() if key == "llm_provider" else value
+        return config
+
+
+def load_jobs(path: str) -> List[BatchJob]:
+    """Read a YAML or CSV job list."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".yaml", ".yml"):
+        import yaml
+
+        with open(path) as f:
+            data = yaml.safe_load(f) or []
+        defaults = {}
+        if isinstance(data, dict):
+            defaults = data.get("defaults") or {}
+            data = data.get("jobs") or []
+        entries = [{**defaults, **entry} for entry in data]
+    elif ext == ".csv":
+        with open(path, newline="") as f:
+            entries = [
+                {key: value for key, value in row.items() if value not in (None, "")}
+                for row in csv.DictReader(f)
+            ]
+    else:
+        raise ValueError(f"Unsupported job file {path}; expected .yaml, .yml or .csv")
+
+    return [BatchJob(**entry) for entry in entries]
+
+
+def run_batch(
+    jobs: List[BatchJob],
+    config: Dict[str, Any],
+    workers: int = 4,
+    output: Optional[str] = None,
+    resume: bool = True,
+):
+    """Run jobs concurrently and write one summary row per job.
+
+    Args:
+        jobs: Jobs to run
+        config: Base configuration each job's overrides are applied to
+        workers: Maximum number of jobs to run concurrently
+        output: Summary file, .parquet (default) or .csv. Defaults to
+            results_dir/batches/<timestamp>.parquet
+        resume: Resume interrupted runs from their checkpoints
+
+    Returns:
+        The summary as a pandas DataFrame
+    """
+    import pandas as pd
+
+    from tradingagents.graph.accounting import create_token_accountant
+    from tradingagents.graph.tool_node import ToolResultCache
+    from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+    tool_cache = ToolResultCache(config.get("tool_cache_size", 256))
+    graphs = {}
+    graphs_lock = threading.Lock()
+    # Jobs that would share a checkpoint thread (same graph, ticker and date) run
+    # one at a time, so one cannot clear or resume the other's checkpoints mid-run
+    run_locks = {}
+
+    def get_graph(job: BatchJob):
+        key = job.graph_key()
+        with graphs_lock:
+            if key not in graphs:
+                graphs[key] = TradingAgentsGraph(
+                    [analyst.value for analyst in job.analysts],
+                    config=job.apply_to(config),
+                    tool_cache=tool_cache,
+                )
+            return graphs[key]
+
+    def run_lock(graph, job: BatchJob) -> threading.Lock:
+        key = (job.graph_key(), job.ticker, job.date)
+        if graph.checkpoints is not None:
+            key = graph.checkpoints.thread_id(job.ticker, job.date, graph.checkpoint_variant)
+        with graphs_lock:
+            return run_locks.setdefault(key, threading.Lock())
+
+    def run_job(job: BatchJob) -> Dict[str, Any]:
+        record = {
+            "ticker": job.ticker,
+            "trade_date": job.date,
+            "analysts": ",".join(analyst.value for analyst in job.analysts),
+            "depth": job.depth,
+        }
+        start = time.perf_counter()
+        try:
+            graph = get_graph(job)
+            record["quick_think_llm"] = graph.config["quick_think_llm"]
+            record["deep_think_llm"] = graph.config["deep_think_llm"]
+            # The graph's last_usage is shared by concurrent jobs, so count this one separately
+            usage = create_token_accountant({**graph.config, "run_budget": {}})
+            with run_lock(graph, job):
+                _, decision = graph.propagate(
+                    job.ticker, job.date, resume=resume, callbacks=[usage]
+                )
+            totals = usage.totals()
+            record.update(
+                status="completed",
+                decision=decision,
+                total_tokens=totals["total_tokens"],
+                cost=totals["cost"],
+                error=None,
+            )
+        except Exception as e:
+            record.update(status="failed", decision=None, error=f"{type(e).__name__}: {e}")
+        record["run_seconds"] = time.perf_counter() - start
+        return record
+
+    records = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = [executor.submit(run_job, job) for job in jobs]
+        for i, future in enumerate(as_completed(futures), 1):
+            record = future.result()
+            records.append(record)
+            outcome = record["decision"] if record["status"] == "completed" else f"FAILED: {record['error']}"
+            print(
+                f"[{i}/{len(jobs)}] {record['ticker']} {record['trade_date']}: "
+                f"{outcome} ({record['run_seconds']:.1f}s)",
+                flush=True,
+            )
+
+    results = pd.DataFrame(records)
+    if not results.empty:
+        results = results.sort_values(["ticker", "trade_date"]).reset_index(drop=True)
+
+    if output is None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(config["results_dir"], "batches", f"{stamp}.parquet")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    if output.lower().endswith(".csv"):
+        results.to_csv(output, index=False)
+    else:
+        results.to_parquet(output, index=False)
+    print(f"Batch summary saved to {output}")
+
+    return results
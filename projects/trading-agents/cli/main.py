@@ -18,6 +18,7 @@ from rich.text import Text
 from rich.live import Live
 from rich.table import Table
 from collections import deque
+import threading
 import time
 from rich.tree import Tree
 from rich import box
@@ -25,8 +26,10 @@ from rich.align import Align
 from rich.rule import Rule
 
 from tradingagents.graph.trading_graph import TradingAgentsGraph
+from tradingagents.graph.accounting import BudgetExceededError, create_token_accountant
 from tradingagents.default_config import DEFAULT_CONFIG
 from cli.models import AnalystType
+from cli.report_writer import BackgroundWriter
 from cli.utils import *
 
 console = Console()
@@ -38,13 +41,29 @@ app = typer.Typer(
 )
 
 
+# Titles of the report sections, in report order
+SECTION_TITLES = {
+    "market_report": "Market Analysis",
+    "sentiment_report": "Social Sentiment",
+    "news_report": "News Analysis",
+    "fundamentals_report": "Fundamentals Analysis",
+    "investment_plan": "Research Team Decision",
+    "trader_investment_plan": "Trading Team Plan",
+    "final_trade_decision": "Portfolio Management Decision",
+}
+ANALYST_SECTIONS = ("market_report", "sentiment_report", "news_report", "fundamentals_report")
+
+# Display frame rate; stream updates in between are coalesced into the next frame
+REFRESH_PER_SECOND = 4
+
+
 # Create a deque to store recent messages with a maximum length
 class MessageBuffer:
     def __init__(self, max_length=100):
         self.messages = deque(maxlen=max_length)
         self.tool_calls = deque(maxlen=max_length)
         self.current_report = None
-        self.final_report = None  # Store the complete final report
+        self.spinner_text = None
         self.agent_status = {
             # Analyst Team
             "Market Analyst": "pending",
@@ -65,113 +84,126 @@ class MessageBuffer:
             "Portfolio Manager": "pending",
         }
         self.current_agent = None
-        self.report_sections = {
-            "market_report": None,
-            "sentiment_report": None,
-            "news_report": None,
-            "fundamentals_report": None,
-            "investment_plan": None,
-            "trader_investment_plan": None,
-            "final_trade_decision": None,
-        }
+        self.report_sections = {section: None for section in SECTION_TITLES}
+
+        # The stream thread writes while the render loop reads
+        self.lock = threading.RLock()
+        # Bumped on every change so the display only redraws the regions that changed
+        self.versions = {"status": 0, "messages": 0, "report": 0}
+        # Formatted Markdown per section; the full report is joined lazily from these
+        self._report_parts = {}
+        self._final_report = None
+        self._final_report_stale = False
 
     def add_message(self, message_type, content):
         timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-        self.messages.append((timestamp, message_type, content))
+        with self.lock:
+            self.messages.append((timestamp, message_type, content))
+            self.versions["messages"] += 1
 
     def add_tool_call(self, tool_name, args):
         timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-        self.tool_calls.append((timestamp, tool_name, args))
+        with self.lock:
+            self.tool_calls.append((timestamp, tool_name, args))
+            self.versions["messages"] += 1
+
+    def set_spinner(self, text):
+        with self.lock:
+            if text != self.spinner_text:
+                self.spinner_text = text
+                self.versions["messages"] += 1
 
     def update_agent_status(self, agent, status):
         if agent in self.agent_status:
-            self.agent_status[agent] = status
-            self.current_agent = agent
+            with self.lock:
+                if self.agent_status[agent] != status:
+                    self.agent_status[agent] = status
+                    self.versions["status"] += 1
+                self.current_agent = agent
 
     def update_report_section(self, section_name, content):
         if section_name in self.report_sections:
-            self.report_sections[section_name] = content
-            self._update_current_report()
+            with self.lock:
+                if self.report_sections[section_name] == content:
+                    return
+                self.report_sections[section_name] = content
+                self._report_parts[section_name] = self._format_section(section_name, content)
+                self._final_report_stale = True
+                self._update_current_report()
+
+    def reset_reports(self):
+        with self.lock:
+            for section in self.report_sections:
+                self.report_sections[section] = None
+            self._report_parts.clear()
+            self._final_report = None
+            self._final_report_stale = False
+            self.current_report = None
+            self.versions["report"] += 1
 
     def _update_current_report(self):
         # For the panel display, only show the most recently updated section
         latest_section = None
-        latest_content = None
-
-        # Find the most recently updated section
         for section, content in self.report_sections.items():
-            if content is not None:
+            if content:
                 latest_section = section
-                latest_content = content
-               
-        if latest_section and latest_content:
-            # Format the current section for display
-            section_titles = {
-                "market_report": "Market Analysis",
-                "sentiment_report": "Social Sentiment",
-                "news_report": "News Analysis",
-                "fundamentals_report": "Fundamentals Analysis",
-                "investment_plan": "Research Team Decision",
-                "trader_investment_plan": "Trading Team Plan",
-                "final_trade_decision": "Portfolio Management Decision",
-            }
-            self.current_report = (
-                f"### {section_titles[latest_section]}\n{latest_content}"
-            )
 
-        # Update the final complete report
-        self._update_final_report()
-
-    def _update_final_report(self):
-        report_parts = []
-
-        # Analyst Team Reports
-        if any(
-            self.report_sections[section]
-            for section in [
-                "market_report",
-                "sentiment_report",
-                "news_report",
-                "fundamentals_report",
-            ]
-        ):
-            report_parts.append("## Analyst Team Reports")
-            if self.report_sections["market_report"]:
-                report_parts.append(
-                    f"### Market Analysis\n{self.report_sections['market_report']}"
-                )
-            if self.report_sections["sentiment_report"]:
-                report_parts.append(
-                    f"### Social Sentiment\n{self.report_sections['sentiment_report']}"
-                )
-            if self.report_sections["news_report"]:
-                report_parts.append(
-                    f"### News Analysis\n{self.report_sections['news_report']}"
-                )
-            if self.report_sections["fundamentals_report"]:
-                report_parts.append(
-                    f"### Fundamentals Analysis\n{self.report_sections['fundamentals_report']}"
-                )
+        if latest_section:
+            current_report = f"### {SECTION_TITLES[latest_section]}\n{self.report_sections[latest_section]}"
+            if current_report != self.current_report:
+                self.current_report = current_report
+                self.versions["report"] += 1
+
+    @staticmethod
+    def _format_section(section_name, content):
+        if not content:
+            return None
+        if section_name in ANALYST_SECTIONS:
+            return f"### {SECTION_TITLES[section_name]}\n{content}"
+        return f"## {SECTION_TITLES[section_name]}\n\n{content}"
+
+    @property
+    def final_report(self):
+        """The complete report, assembled from the cached sections when one changed."""
+        with self.lock:
+            if self._final_report_stale:
+                analyst_parts = [
+                    self._report_parts[section]
+                    for section in ANALYST_SECTIONS
+                    if self._report_parts.get(section)
+                ]
+                report_parts = ["## Analyst Team Reports"] + analyst_parts if analyst_parts else []
+                report_parts += [
+                    self._report_parts[section]
+                    for section in SECTION_TITLES
+                    if section not in ANALYST_SECTIONS and self._report_parts.get(section)
+                ]
+                self._final_report = "\n\n".join(report_parts) if report_parts else None
+                self._final_report_stale = False
+            return self._final_report
+
 
-        # Research Team Reports
-        if self.report_sections["investment_plan"]:
-            report_parts.append("## Research Team Decision")
-            report_parts.append(f"{self.report_sections['investment_plan']}")
+message_buffer = MessageBuffer()
 
-        # Trading Team Reports
-        if self.report_sections["trader_investment_plan"]:
-            report_parts.append("## Trading Team Plan")
-            report_parts.append(f"{self.report_sections['trader_investment_plan']}")
 
-        # Portfolio Management Decision
-        if self.report_sections["final_trade_decision"]:
-            report_parts.append("## Portfolio Management Decision")
-            report_parts.append(f"{self.report_sections['final_trade_decision']}")
+class CachedRender:
+    """Wrap a renderable and reuse its rendered lines while the available size is unchanged.
 
-        self.final_report = "\n\n".join(report_parts) if report_parts else None
+    Rich re-renders the whole layout on every refresh; parsing and laying out a
+    long Markdown report each frame is what made the CLI CPU-bound.
+    """
 
+    def __init__(self, renderable):
+        self.renderable = renderable
+        self._key = None
+        self._segments = None
 
-message_buffer = MessageBuffer()
+    def __rich_console__(self, console, options):
+        key = (options.max_width, options.height)
+        if key != self._key:
+            self._segments = list(console.render(self.renderable, options))
+            self._key = key
+        yield from self._segments
 
 
 def create_layout():
@@ -187,22 +219,26 @@ def create_layout():
     layout["upper"].split_row(
         Layout(name="progress", ratio=2), Layout(name="messages", ratio=3)
     )
+    _drawn_versions.clear()
     return layout
 
 
-def update_display(layout, spinner_text=None):
-    # Header with welcome message
-    layout["header"].update(
-        Panel(
-            "[bold green]Welcome to TradingAgents CLI[/bold green]\n"
-            "[dim]© [Tauric Research](https://github.com/TauricResearch)[/dim]",
-            title="Welcome to TradingAgents",
-            border_style="green",
-            padding=(1, 2),
-            expand=True,
-        )
-    )
+# Versions of the message buffer each layout region was last drawn from
+_drawn_versions = {}
+
+
+def _status_cell(status):
+    if status == "in_progress":
+        return Spinner("dots", text="[blue]in_progress[/blue]", style="bold cyan")
+    status_color = {
+        "pending": "yellow",
+        "completed": "green",
+        "error": "red",
+    }.get(status, "white")
+    return f"[{status_color}]{status}[/{status_color}]"
+
 
+def _draw_progress(layout):
     # Progress panel showing agent status
     progress_table = Table(
         show_header=True,
@@ -232,39 +268,10 @@ def update_display(layout, spinner_text=None):
     }
 
     for team, agents in teams.items():
-        # Add first agent with team name
-        first_agent = agents[0]
-        status = message_buffer.agent_status[first_agent]
-        if status == "in_progress":
-            spinner = Spinner(
-                "dots", text="[blue]in_progress[/blue]", style="bold cyan"
-            )
-            status_cell = spinner
-        else:
-            status_color = {
-                "pending": "yellow",
-                "completed": "green",
-                "error": "red",
-            }.get(status, "white")
-            status_cell = f"[{status_color}]{status}[/{status_color}]"
-        progress_table.add_row(team, first_agent, status_cell)
-
-        # Add remaining agents in team
-        for agent in agents[1:]:
-            status = message_buffer.agent_status[agent]
-            if status == "in_progress":
-                spinner = Spinner(
-                    "dots", text="[blue]in_progress[/blue]", style="bold cyan"
-                )
-                status_cell = spinner
-            else:
-                status_color = {
-                    "pending": "yellow",
-                    "completed": "green",
-                    "error": "red",
-                }.get(status, "white")
-                status_cell = f"[{status_color}]{status}[/{status_color}]"
-            progress_table.add_row("", agent, status_cell)
+        # Team name only on the first agent's row
+        for i, agent in enumerate(agents):
+            status_cell = _status_cell(message_buffer.agent_status[agent])
+            progress_table.add_row(team if i == 0 else "", agent, status_cell)
 
         # Add horizontal line after each team
         progress_table.add_row("─" * 20, "─" * 20, "─" * 20, style="dim")
@@ -273,6 +280,8 @@ def update_display(layout, spinner_text=None):
         Panel(progress_table, title="Progress", border_style="cyan", padding=(1, 2))
     )
 
+
+def _draw_messages(layout):
     # Messages panel showing recent messages and tool calls
     messages_table = Table(
         show_header=True,
@@ -302,22 +311,8 @@ def update_display(layout, spinner_text=None):
     # Add regular messages
     for timestamp, msg_type, content in message_buffer.messages:
         # Convert content to string if it's not already
-        content_str = content
-        if isinstance(content, list):
-            # Handle list of content blocks (Anthropic format)
-            text_parts = []
-            for item in content:
-                if isinstance(item, dict):
-                    if item.get('type') == 'text':
-                        text_parts.append(item.get('text', ''))
-                    elif item.get('type') == 'tool_use':
-                        text_parts.append(f"[Tool: {item.get('name', 'unknown')}]")
-                else:
-                    text_parts.append(str(item))
-            content_str = ' '.join(text_parts)
-        elif not isinstance(content_str, str):
-            content_str = str(content)
-            
+        content_str = extract_content_string(content)
+
         # Truncate message content if too long
         if len(content_str) > 200:
             content_str = content_str[:197] + "..."
@@ -339,8 +334,8 @@ def update_display(layout, spinner_text=None):
         wrapped_content = Text(content, overflow="fold")
         messages_table.add_row(timestamp, msg_type, wrapped_content)
 
-    if spinner_text:
-        messages_table.add_row("", "Spinner", spinner_text)
+    if message_buffer.spinner_text:
+        messages_table.add_row("", "Spinner", message_buffer.spinner_text)
 
     # Add a footer to indicate if messages were truncated
     if len(all_messages) > max_messages:
@@ -357,11 +352,13 @@ def update_display(layout, spinner_text=None):
         )
     )
 
+
+def _draw_report(layout):
     # Analysis panel showing current report
     if message_buffer.current_report:
         layout["analysis"].update(
             Panel(
-                Markdown(message_buffer.current_report),
+                CachedRender(Markdown(message_buffer.current_report)),
                 title="Current Report",
                 border_style="green",
                 padding=(1, 2),
@@ -377,6 +374,8 @@ def update_display(layout, spinner_text=None):
             )
         )
 
+
+def _draw_footer(layout):
     # Footer with statistics
     tool_calls_count = len(message_buffer.tool_calls)
     llm_calls_count = sum(
@@ -395,6 +394,41 @@ def update_display(layout, spinner_text=None):
     layout["footer"].update(Panel(stats_table, border_style="grey50"))
 
 
+def update_display(layout):
+    """Redraw only the layout regions whose buffer contents changed since the last call.
+
+    Called by Live on every refresh, so however fast chunks stream in the
+    layout is rebuilt at most REFRESH_PER_SECOND times and unchanged panels,
+    in particular the parsed Markdown report, are reused.
+    """
+    with message_buffer.lock:
+        versions = message_buffer.versions
+        regions = {
+            "progress": (_draw_progress, versions["status"]),
+            "messages": (_draw_messages, versions["messages"]),
+            "analysis": (_draw_report, versions["report"]),
+            "footer": (_draw_footer, (versions["messages"], versions["report"])),
+        }
+        if "header" not in _drawn_versions:
+            # Header with welcome message
+            layout["header"].update(
+                Panel(
+                    "[bold green]Welcome to TradingAgents CLI[/bold green]\n"
+                    "[dim]© [Tauric Research](https://github.com/TauricResearch)[/dim]",
+                    title="Welcome to TradingAgents",
+                    border_style="green",
+                    padding=(1, 2),
+                    expand=True,
+                )
+            )
+            _drawn_versions["header"] = True
+        for region, (draw, version) in regions.items():
+            if _drawn_versions.get(region) != version:
+                draw(layout)
+                _drawn_versions[region] = version
+    return layout
+
+
 def get_user_selections():
     """Get all user selections before starting the analysis display."""
     # Display ASCII art welcome message
@@ -753,6 +787,11 @@ def run_analysis():
         [analyst.value for analyst in selections["analysts"]], config=config, debug=True
     )
 
+    # Offer to resume an interrupted run for the same ticker and date
+    resume = False
+    if graph.has_resumable_run(selections["ticker"], selections["analysis_date"]):
+        resume = ask_resume(selections["ticker"], selections["analysis_date"])
+
     # Create result directory
     results_dir = Path(config["results_dir"]) / selections["ticker"] / selections["analysis_date"]
     results_dir.mkdir(parents=True, exist_ok=True)
@@ -761,6 +800,10 @@ def run_analysis():
     log_file = results_dir / "message_tool.log"
     log_file.touch(exist_ok=True)
 
+    # Log lines and report files are written by a background thread so disk
+    # I/O stays off the stream loop
+    writer = BackgroundWriter(log_file)
+
     def save_message_decorator(obj, func_name):
         func = getattr(obj, func_name)
         @wraps(func)
@@ -768,8 +811,7 @@ def run_analysis():
             func(*args, **kwargs)
             timestamp, message_type, content = obj.messages[-1]
             content = content.replace("\n", " ")  # Replace newlines with spaces
-            with open(log_file, "a") as f:
-                f.write(f"{timestamp} [{message_type}] {content}\n")
+            writer.log(f"{timestamp} [{message_type}] {content}")
         return wrapper
     
     def save_tool_call_decorator(obj, func_name):
@@ -779,8 +821,7 @@ def run_analysis():
             func(*args, **kwargs)
             timestamp, tool_name, args = obj.tool_calls[-1]
             args_str = ", ".join(f"{k}={v}" for k, v in args.items())
-            with open(log_file, "a") as f:
-                f.write(f"{timestamp} [Tool Call] {tool_name}({args_str})\n")
+            writer.log(f"{timestamp} [Tool Call] {tool_name}({args_str})")
         return wrapper
 
     def save_report_section_decorator(obj, func_name):
@@ -791,9 +832,7 @@ def run_analysis():
             if section_name in obj.report_sections and obj.report_sections[section_name] is not None:
                 content = obj.report_sections[section_name]
                 if content:
-                    file_name = f"{section_name}.md"
-                    with open(report_dir / file_name, "w") as f:
-                        f.write(content)
+                    writer.write_file(report_dir / f"{section_name}.md", content)
         return wrapper
 
     message_buffer.add_message = save_message_decorator(message_buffer, "add_message")
@@ -803,10 +842,12 @@ def run_analysis():
     # Now start the display layout
     layout = create_layout()
 
-    with Live(layout, refresh_per_second=4) as live:
-        # Initial display
-        update_display(layout)
-
+    # Live redraws at a fixed frame rate from its own thread; the stream loop
+    # below only updates the message buffer
+    with Live(
+        get_renderable=lambda: update_display(layout),
+        refresh_per_second=REFRESH_PER_SECOND,
+    ) as live:
         # Add initial messages
         message_buffer.add_message("System", f"Selected ticker: {selections['ticker']}")
         message_buffer.add_message(
@@ -816,270 +857,292 @@ def run_analysis():
             "System",
             f"Selected analysts: {', '.join(analyst.value for analyst in selections['analysts'])}",
         )
-        update_display(layout)
+        if resume:
+            message_buffer.add_message(
+                "System", "Resuming the interrupted run from its last completed step"
+            )
 
         # Reset agent statuses
         for agent in message_buffer.agent_status:
             message_buffer.update_agent_status(agent, "pending")
 
         # Reset report sections
-        for section in message_buffer.report_sections:
-            message_buffer.report_sections[section] = None
-        message_buffer.current_report = None
-        message_buffer.final_report = None
+        message_buffer.reset_reports()
 
         # Update agent status to in_progress for the first analyst
         first_analyst = f"{selections['analysts'][0].value.capitalize()} Analyst"
         message_buffer.update_agent_status(first_analyst, "in_progress")
-        update_display(layout)
 
-        # Create spinner text
-        spinner_text = (
+        # Show a spinner until the first chunk arrives
+        message_buffer.set_spinner(
             f"Analyzing {selections['ticker']} on {selections['analysis_date']}..."
         )
-        update_display(layout, spinner_text)
+        live.refresh()
 
-        # Initialize state and get graph args
-        init_agent_state = graph.propagator.create_initial_state(
-            selections["ticker"], selections["analysis_date"]
+        # Initialize state (or resume from checkpoint) and get graph args
+        init_agent_state, args = graph.prepare_run(
+            selections["ticker"], selections["analysis_date"], resume=resume
         )
-        args = graph.propagator.get_graph_args()
+        accountant = create_token_accountant(graph.config)
+        args["config"]["callbacks"] = [accountant]
 
-        # Stream the analysis
+        # Stream the analysis; a run stopped by its token budget is logged as
+        # over_budget and ends the command
         trace = []
-        for chunk in graph.graph.stream(init_agent_state, **args):
-            if len(chunk["messages"]) > 0:
-                # Get the last message from the chunk
-                last_message = chunk["messages"][-1]
-
-                # Extract message content and type
-                if hasattr(last_message, "content"):
-                    content = extract_content_string(last_message.content)  # Use the helper function
-                    msg_type = "Reasoning"
-                else:
-                    content = str(last_message)
-                    msg_type = "System"
-
-                # Add message to buffer
-                message_buffer.add_message(msg_type, content)                
-
-                # If it's a tool call, add it to tool calls
-                if hasattr(last_message, "tool_calls"):
-                    for tool_call in last_message.tool_calls:
-                        # Handle both dictionary and object tool calls
-                        if isinstance(tool_call, dict):
-                            message_buffer.add_tool_call(
-                                tool_call["name"], tool_call["args"]
-                            )
-                        else:
-                            message_buffer.add_tool_call(tool_call.name, tool_call.args)
-
-                # Update reports and agent status based on chunk content
-                # Analyst Team Reports
-                if "market_report" in chunk and chunk["market_report"]:
-                    message_buffer.update_report_section(
-                        "market_report", chunk["market_report"]
-                    )
-                    message_buffer.update_agent_status("Market Analyst", "completed")
-                    # Set next analyst to in_progress
-                    if "social" in selections["analysts"]:
-                        message_buffer.update_agent_status(
-                            "Social Analyst", "in_progress"
-                        )
-
-                if "sentiment_report" in chunk and chunk["sentiment_report"]:
-                    message_buffer.update_report_section(
-                        "sentiment_report", chunk["sentiment_report"]
-                    )
-                    message_buffer.update_agent_status("Social Analyst", "completed")
-                    # Set next analyst to in_progress
-                    if "news" in selections["analysts"]:
-                        message_buffer.update_agent_status(
-                            "News Analyst", "in_progress"
+        try:
+            for chunk in graph.graph.stream(init_agent_state, **args):
+                message_buffer.set_spinner(None)
+                if len(chunk["messages"]) > 0:
+                    # Get the last message from the chunk
+                    last_message = chunk["messages"][-1]
+
+                    # Extract message content and type
+                    if hasattr(last_message, "content"):
+                        content = extract_content_string(last_message.content)  # Use the helper function
+                        msg_type = "Reasoning"
+                    else:
+                        content = str(last_message)
+                        msg_type = "System"
+
+                    # Add message to buffer
+                    message_buffer.add_message(msg_type, content)                
+
+                    # If it's a tool call, add it to tool calls
+                    if hasattr(last_message, "tool_calls"):
+                        for tool_call in last_message.tool_calls:
+                            # Handle both dictionary and object tool calls
+                            if isinstance(tool_call, dict):
+                                message_buffer.add_tool_call(
+                                    tool_call["name"], tool_call["args"]
+                                )
+                            else:
+                                message_buffer.add_tool_call(tool_call.name, tool_call.args)
+
+                    # Update reports and agent status based on chunk content
+                    # Analyst Team Reports
+                    if "market_report" in chunk and chunk["market_report"]:
+                        message_buffer.update_report_section(
+                            "market_report", chunk["market_report"]
                         )
+                        message_buffer.update_agent_status("Market Analyst", "completed")
+                        # Set next analyst to in_progress
+                        if "social" in selections["analysts"]:
+                            message_buffer.update_agent_status(
+                                "Social Analyst", "in_progress"
+                            )
 
-                if "news_report" in chunk and chunk["news_report"]:
-                    message_buffer.update_report_section(
-                        "news_report", chunk["news_report"]
-                    )
-                    message_buffer.update_agent_status("News Analyst", "completed")
-                    # Set next analyst to in_progress
-                    if "fundamentals" in selections["analysts"]:
-                        message_buffer.update_agent_status(
-                            "Fundamentals Analyst", "in_progress"
+                    if "sentiment_report" in chunk and chunk["sentiment_report"]:
+                        message_buffer.update_report_section(
+                            "sentiment_report", chunk["sentiment_report"]
                         )
-
-                if "fundamentals_report" in chunk and chunk["fundamentals_report"]:
-                    message_buffer.update_report_section(
-                        "fundamentals_report", chunk["fundamentals_report"]
-                    )
-                    message_buffer.update_agent_status(
-                        "Fundamentals Analyst", "completed"
-                    )
-                    # Set all research team members to in_progress
-                    update_research_team_status("in_progress")
-
-                # Research Team - Handle Investment Debate State
-                if (
-                    "investment_debate_state" in chunk
-                    and chunk["investment_debate_state"]
-                ):
-                    debate_state = chunk["investment_debate_state"]
-
-                    # Update Bull Researcher status and report
-                    if "bull_history" in debate_state and debate_state["bull_history"]:
-                        # Keep all research team members in progress
-                        update_research_team_status("in_progress")
-                        # Extract latest bull response
-                        bull_responses = debate_state["bull_history"].split("\n")
-                        latest_bull = bull_responses[-1] if bull_responses else ""
-                        if latest_bull:
-                            message_buffer.add_message("Reasoning", latest_bull)
-                            # Update research report with bull's latest analysis
-                            message_buffer.update_report_section(
-                                "investment_plan",
-                                f"### Bull Researcher Analysis\n{latest_bull}",
+                        message_buffer.update_agent_status("Social Analyst", "completed")
+                        # Set next analyst to in_progress
+                        if "news" in selections["analysts"]:
+                            message_buffer.update_agent_status(
+                                "News Analyst", "in_progress"
                             )
 
-                    # Update Bear Researcher status and report
-                    if "bear_history" in debate_state and debate_state["bear_history"]:
-                        # Keep all research team members in progress
-                        update_research_team_status("in_progress")
-                        # Extract latest bear response
-                        bear_responses = debate_state["bear_history"].split("\n")
-                        latest_bear = bear_responses[-1] if bear_responses else ""
-                        if latest_bear:
-                            message_buffer.add_message("Reasoning", latest_bear)
-                            # Update research report with bear's latest analysis
-                            message_buffer.update_report_section(
-                                "investment_plan",
-                                f"{message_buffer.report_sections['investment_plan']}\n\n### Bear Researcher Analysis\n{latest_bear}",
+                    if "news_report" in chunk and chunk["news_report"]:
+                        message_buffer.update_report_section(
+                            "news_report", chunk["news_report"]
+                        )
+                        message_buffer.update_agent_status("News Analyst", "completed")
+                        # Set next analyst to in_progress
+                        if "fundamentals" in selections["analysts"]:
+                            message_buffer.update_agent_status(
+                                "Fundamentals Analyst", "in_progress"
                             )
 
-                    # Update Research Manager status and final decision
-                    if (
-                        "judge_decision" in debate_state
-                        and debate_state["judge_decision"]
-                    ):
-                        # Keep all research team members in progress until final decision
-                        update_research_team_status("in_progress")
-                        message_buffer.add_message(
-                            "Reasoning",
-                            f"Research Manager: {debate_state['judge_decision']}",
-                        )
-                        # Update research report with final decision
+                    if "fundamentals_report" in chunk and chunk["fundamentals_report"]:
                         message_buffer.update_report_section(
-                            "investment_plan",
-                            f"{message_buffer.report_sections['investment_plan']}\n\n### Research Manager Decision\n{debate_state['judge_decision']}",
+                            "fundamentals_report", chunk["fundamentals_report"]
                         )
-                        # Mark all research team members as completed
-                        update_research_team_status("completed")
-                        # Set first risk analyst to in_progress
                         message_buffer.update_agent_status(
-                            "Risky Analyst", "in_progress"
+                            "Fundamentals Analyst", "completed"
                         )
+                        # Set all research team members to in_progress
+                        update_research_team_status("in_progress")
 
-                # Trading Team
-                if (
-                    "trader_investment_plan" in chunk
-                    and chunk["trader_investment_plan"]
-                ):
-                    message_buffer.update_report_section(
-                        "trader_investment_plan", chunk["trader_investment_plan"]
-                    )
-                    # Set first risk analyst to in_progress
-                    message_buffer.update_agent_status("Risky Analyst", "in_progress")
-
-                # Risk Management Team - Handle Risk Debate State
-                if "risk_debate_state" in chunk and chunk["risk_debate_state"]:
-                    risk_state = chunk["risk_debate_state"]
-
-                    # Update Risky Analyst status and report
+                    # Research Team - Handle Investment Debate State
                     if (
-                        "current_risky_response" in risk_state
-                        and risk_state["current_risky_response"]
+                        "investment_debate_state" in chunk
+                        and chunk["investment_debate_state"]
                     ):
-                        message_buffer.update_agent_status(
-                            "Risky Analyst", "in_progress"
-                        )
-                        message_buffer.add_message(
-                            "Reasoning",
-                            f"Risky Analyst: {risk_state['current_risky_response']}",
-                        )
-                        # Update risk report with risky analyst's latest analysis only
-                        message_buffer.update_report_section(
-                            "final_trade_decision",
-                            f"### Risky Analyst Analysis\n{risk_state['current_risky_response']}",
-                        )
+                        debate_state = chunk["investment_debate_state"]
+
+                        # Update Bull Researcher status and report
+                        if "bull_history" in debate_state and debate_state["bull_history"]:
+                            # Keep all research team members in progress
+                            update_research_team_status("in_progress")
+                            # Extract latest bull response
+                            bull_responses = debate_state["bull_history"].split("\n")
+                            latest_bull = bull_responses[-1] if bull_responses else ""
+                            if latest_bull:
+                                message_buffer.add_message("Reasoning", latest_bull)
+                                # Update research report with bull's latest analysis
+                                message_buffer.update_report_section(
+                                    "investment_plan",
+                                    f"### Bull Researcher Analysis\n{latest_bull}",
+                                )
+
+                        # Update Bear Researcher status and report
+                        if "bear_history" in debate_state and debate_state["bear_history"]:
+                            # Keep all research team members in progress
+                            update_research_team_status("in_progress")
+                            # Extract latest bear response
+                            bear_responses = debate_state["bear_history"].split("\n")
+                            latest_bear = bear_responses[-1] if bear_responses else ""
+                            if latest_bear:
+                                message_buffer.add_message("Reasoning", latest_bear)
+                                # Update research report with bear's latest analysis
+                                message_buffer.update_report_section(
+                                    "investment_plan",
+                                    f"{message_buffer.report_sections['investment_plan']}\n\n### Bear Researcher Analysis\n{latest_bear}",
+                                )
+
+                        # Update Research Manager status and final decision
+                        if (
+                            "judge_decision" in debate_state
+                            and debate_state["judge_decision"]
+                        ):
+                            # Keep all research team members in progress until final decision
+                            update_research_team_status("in_progress")
+                            message_buffer.add_message(
+                                "Reasoning",
+                                f"Research Manager: {debate_state['judge_decision']}",
+                            )
+                            # Update research report with final decision
+                            message_buffer.update_report_section(
+                                "investment_plan",
+                                f"{message_buffer.report_sections['investment_plan']}\n\n### Research Manager Decision\n{debate_state['judge_decision']}",
+                            )
+                            # Mark all research team members as completed
+                            update_research_team_status("completed")
+                            # Set first risk analyst to in_progress
+                            message_buffer.update_agent_status(
+                                "Risky Analyst", "in_progress"
+                            )
 
-                    # Update Safe Analyst status and report
+                    # Trading Team
                     if (
-                        "current_safe_response" in risk_state
-                        and risk_state["current_safe_response"]
+                        "trader_investment_plan" in chunk
+                        and chunk["trader_investment_plan"]
                     ):
-                        message_buffer.update_agent_status(
-                            "Safe Analyst", "in_progress"
-                        )
-                        message_buffer.add_message(
-                            "Reasoning",
-                            f"Safe Analyst: {risk_state['current_safe_response']}",
-                        )
-                        # Update risk report with safe analyst's latest analysis only
                         message_buffer.update_report_section(
-                            "final_trade_decision",
-                            f"### Safe Analyst Analysis\n{risk_state['current_safe_response']}",
+                            "trader_investment_plan", chunk["trader_investment_plan"]
                         )
+                        # Set first risk analyst to in_progress
+                        message_buffer.update_agent_status("Risky Analyst", "in_progress")
+
+                    # Risk Management Team - Handle Risk Debate State
+                    if "risk_debate_state" in chunk and chunk["risk_debate_state"]:
+                        risk_state = chunk["risk_debate_state"]
+
+                        # Update Risky Analyst status and report
+                        if (
+                            "current_risky_response" in risk_state
+                            and risk_state["current_risky_response"]
+                        ):
+                            message_buffer.update_agent_status(
+                                "Risky Analyst", "in_progress"
+                            )
+                            message_buffer.add_message(
+                                "Reasoning",
+                                f"Risky Analyst: {risk_state['current_risky_response']}",
+                            )
+                            # Update risk report with risky analyst's latest analysis only
+                            message_buffer.update_report_section(
+                                "final_trade_decision",
+                                f"### Risky Analyst Analysis\n{risk_state['current_risky_response']}",
+                            )
 
-                    # Update Neutral Analyst status and report
-                    if (
-                        "current_neutral_response" in risk_state
-                        and risk_state["current_neutral_response"]
-                    ):
-                        message_buffer.update_agent_status(
-                            "Neutral Analyst", "in_progress"
-                        )
-                        message_buffer.add_message(
-                            "Reasoning",
-                            f"Neutral Analyst: {risk_state['current_neutral_response']}",
-                        )
-                        # Update risk report with neutral analyst's latest analysis only
-                        message_buffer.update_report_section(
-                            "final_trade_decision",
-                            f"### Neutral Analyst Analysis\n{risk_state['current_neutral_response']}",
-                        )
+                        # Update Safe Analyst status and report
+                        if (
+                            "current_safe_response" in risk_state
+                            and risk_state["current_safe_response"]
+                        ):
+                            message_buffer.update_agent_status(
+                                "Safe Analyst", "in_progress"
+                            )
+                            message_buffer.add_message(
+                                "Reasoning",
+                                f"Safe Analyst: {risk_state['current_safe_response']}",
+                            )
+                            # Update risk report with safe analyst's latest analysis only
+                            message_buffer.update_report_section(
+                                "final_trade_decision",
+                                f"### Safe Analyst Analysis\n{risk_state['current_safe_response']}",
+                            )
 
-                    # Update Portfolio Manager status and final decision
-                    if "judge_decision" in risk_state and risk_state["judge_decision"]:
-                        message_buffer.update_agent_status(
-                            "Portfolio Manager", "in_progress"
-                        )
-                        message_buffer.add_message(
-                            "Reasoning",
-                            f"Portfolio Manager: {risk_state['judge_decision']}",
-                        )
-                        # Update risk report with final decision only
-                        message_buffer.update_report_section(
-                            "final_trade_decision",
-                            f"### Portfolio Manager Decision\n{risk_state['judge_decision']}",
-                        )
-                        # Mark risk analysts as completed
-                        message_buffer.update_agent_status("Risky Analyst", "completed")
-                        message_buffer.update_agent_status("Safe Analyst", "completed")
-                        message_buffer.update_agent_status(
-                            "Neutral Analyst", "completed"
-                        )
-                        message_buffer.update_agent_status(
-                            "Portfolio Manager", "completed"
-                        )
+                        # Update Neutral Analyst status and report
+                        if (
+                            "current_neutral_response" in risk_state
+                            and risk_state["current_neutral_response"]
+                        ):
+                            message_buffer.update_agent_status(
+                                "Neutral Analyst", "in_progress"
+                            )
+                            message_buffer.add_message(
+                                "Reasoning",
+                                f"Neutral Analyst: {risk_state['current_neutral_response']}",
+                            )
+                            # Update risk report with neutral analyst's latest analysis only
+                            message_buffer.update_report_section(
+                                "final_trade_decision",
+                                f"### Neutral Analyst Analysis\n{risk_state['current_neutral_response']}",
+                            )
 
-                # Update the display
-                update_display(layout)
+                        # Update Portfolio Manager status and final decision
+                        if "judge_decision" in risk_state and risk_state["judge_decision"]:
+                            message_buffer.update_agent_status(
+                                "Portfolio Manager", "in_progress"
+                            )
+                            message_buffer.add_message(
+                                "Reasoning",
+                                f"Portfolio Manager: {risk_state['judge_decision']}",
+                            )
+                            # Update risk report with final decision only
+                            message_buffer.update_report_section(
+                                "final_trade_decision",
+                                f"### Portfolio Manager Decision\n{risk_state['judge_decision']}",
+                            )
+                            # Mark risk analysts as completed
+                            message_buffer.update_agent_status("Risky Analyst", "completed")
+                            message_buffer.update_agent_status("Safe Analyst", "completed")
+                            message_buffer.update_agent_status(
+                                "Neutral Analyst", "completed"
+                            )
+                            message_buffer.update_agent_status(
+                                "Portfolio Manager", "completed"
+                            )
 
-            trace.append(chunk)
+                trace.append(chunk)
 
-        # Get final state and decision
-        final_state = trace[-1]
-        decision = graph.process_signal(final_state["final_trade_decision"])
+            # Get final state and decision
+            final_state = trace[-1]
+            graph.clear_checkpoints(selections["ticker"], selections["analysis_date"])
+            decision = graph.decision_signal(final_state, callbacks=[accountant])
+        except BudgetExceededError as e:
+            graph.log_usage(
+                selections["ticker"], selections["analysis_date"], accountant, status="over_budget"
+            )
+            usage = graph.last_usage["totals"]
+            message_buffer.set_spinner(None)
+            message_buffer.add_message(
+                "Usage",
+                f"Stopped over budget ({e}) after {usage['total_tokens']} tokens in "
+                f"{usage['calls']} LLM calls (~${usage['cost']:.4f})",
+            )
+            live.refresh()
+            writer.close()
+            raise typer.Exit(code=1)
+
+        graph.log_usage(selections["ticker"], selections["analysis_date"], accountant)
+        usage = graph.last_usage["totals"]
+        message_buffer.add_message(
+            "Usage",
+            f"{usage['total_tokens']} tokens in {usage['calls']} LLM calls (~${usage['cost']:.4f})",
+        )
 
         # Update all agent statuses to completed
         for agent in message_buffer.agent_status:
@@ -1097,7 +1160,9 @@ def run_analysis():
         # Display the complete final report
         display_complete_report(final_state)
 
-        update_display(layout)
+        live.refresh()
+
+    writer.close()
 
 
 @app.command()
@@ -1105,5 +1170,116 @@ def analyze():
     run_analysis()
 
 
+@app.command()
+def backtest(
+    tickers: str = typer.Option(..., help="Comma-separated ticker symbols, e.g. NVDA,AAPL"),
+    start: str = typer.Option(..., help="First trade date (YYYY-MM-DD)"),
+    end: str = typer.Option(..., help="Last trade date (YYYY-MM-DD)"),
+    holding_days: int = typer.Option(1, help="Trading days each decision is held for"),
+    step: int = typer.Option(1, help="Run every N trading days"),
+    workers: int = typer.Option(1, help="Maximum number of dates to run concurrently"),
+    reflect: bool = typer.Option(True, help="Feed realized returns back into agent memories"),
+):
+    """Run a historical backtest on the local data vendor."""
+    from tradingagents.graph.backtest import Backtester
+
+    backtester = Backtester(
+        config=DEFAULT_CONFIG.copy(),
+        holding_days=holding_days,
+        max_workers=workers,
+        reflect=reflect,
+    )
+    results = backtester.run(
+        [t.strip().upper() for t in tickers.split(",") if t.strip()], start, end, step=step
+    )
+
+    summary = Backtester.summarize(results)
+    table = Table(title="Backtest Summary", box=box.SIMPLE_HEAD)
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", style="green")
+    for key in ("runs", "failed_runs", "scored_runs", "total_pnl", "mean_pnl", "hit_rate", "mean_run_seconds"):
+        table.add_row(key, str(summary.get(key)))
+    console.print(table)
+
+
+@app.command()
+def batch(
+    jobs: str = typer.Argument(..., help="YAML or CSV job list of ticker, date, analysts, depth and models"),
+    workers: int = typer.Option(4, help="Maximum number of jobs to run concurrently"),
+    output: Optional[str] = typer.Option(
+        None, help="Summary file (.parquet or .csv). Defaults to results_dir/batches/<timestamp>.parquet"
+    ),
+    resume: bool = typer.Option(True, help="Resume interrupted runs from their checkpoints"),
+):
+    """Run a job list headlessly, without the interactive prompts or live display."""
+    from cli.batch import load_jobs, run_batch
+
+    job_list = load_jobs(jobs)
+    print(f"Running {len(job_list)} jobs with {workers} workers")
+    results = run_batch(job_list, DEFAULT_CONFIG.copy(), workers=workers, output=output, resume=resume)
+    if not results.empty and (results["status"] != "completed").any():
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def snapshot(
+    tickers: str = typer.Option(..., help="Comma-separated ticker symbols, e.g. NVDA,AAPL"),
+    start: str = typer.Option(..., help="First trade date (YYYY-MM-DD)"),
+    end: str = typer.Option(..., help="Last trade date (YYYY-MM-DD)"),
+    output: str = typer.Option("snapshot.zip", help="Bundle to write; an existing bundle is extended"),
+):
+    """Record every dataflow result of runs over a ticker x date range into a snapshot bundle.
+
+    For each ticker and date the bundle gets the standard tool calls (every
+    vendor method with the tools' default arguments) plus whatever else a
+    fresh run requests. Replay it offline by setting every data vendor to
+    "snapshot" and `snapshot_path` to the bundle.
+    """
+    from tradingagents.dataflows.interface import route_to_vendor
+    from tradingagents.dataflows.snapshot import recording, standard_calls
+
+    ticker_list = [t.strip().upper() for t in tickers.split(",") if t.strip()]
+    first = datetime.datetime.strptime(start, "%Y-%m-%d").date()
+    last = datetime.datetime.strptime(end, "%Y-%m-%d").date()
+    trade_dates = [
+        (first + datetime.timedelta(days=i)).strftime("%Y-%m-%d")
+        for i in range((last - first).days + 1)
+        if (first + datetime.timedelta(days=i)).weekday() < 5
+    ]
+
+    graph = TradingAgentsGraph(config=DEFAULT_CONFIG.copy())
+    meta = {"tickers": ticker_list, "start_date": start, "end_date": end}
+    skipped_runs = []
+    with recording(output, meta=meta) as recorder:
+        for ticker in ticker_list:
+            for trade_date in trade_dates:
+                console.print(f"Recording {ticker} on {trade_date}")
+                for method, args in standard_calls(ticker, trade_date):
+                    try:
+                        route_to_vendor(method, *args)
+                    except Exception as e:
+                        console.print(f"[yellow]Skipped {method}{args}: {e}[/yellow]")
+                try:
+                    graph.propagate(ticker, trade_date, resume=False)
+                except Exception as e:
+                    # The standard calls of this date are still in the bundle
+                    console.print(f"[yellow]Skipped the run of {ticker} on {trade_date}: {e}[/yellow]")
+                    skipped_runs.append(f"{ticker} {trade_date}")
+
+    from tradingagents.dataflows.snapshot import SnapshotBundle
+
+    bundle = SnapshotBundle(output)
+    table = Table(title="Snapshot Bundle", box=box.SIMPLE_HEAD)
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", style="green")
+    table.add_row("path", output)
+    table.add_row("calls", str(len(bundle.calls)))
+    table.add_row("blobs", str(len({entry["blob"] for entry in bundle.calls.values()})))
+    table.add_row("bytes", str(Path(output).stat().st_size))
+    table.add_row("skipped runs", ", ".join(skipped_runs) or "none")
+    bundle.close()
+    console.print(table)
+
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,120 @@
+"""Background writer for the CLI's message log and report files.
+
+The stream thread only enqueues. A single writer thread appends log lines in
+batches through one open handle and replaces report files atomically, writing
+only the latest content of a file when it was updated several times in a batch.
+"""
+
+import atexit
+import os
+import queue
+import threading
+
+_STOP = object()
+
+
+class BackgroundWriter:
+    """Write log lines and report files off the caller's thread.
+
+    The queue is bounded: when the disk falls behind, producers block instead
+    of dropping entries. Everything queued is written by `close`, which also
+    runs at interpreter exit.
+    """
+
+    def __init__(self, log_file, max_queue=1000, batch_size=200, flush_interval=0.5):
+        self.log_file = log_file
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._log_handle = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="report-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def log(self, line):
+        """Append a line to the log file."""
+        self._put(("log", line))
+
+    def write_file(self, path, content):
+        """Replace the contents of `path` atomically."""
+        self._put(("file", (path, content)))
+
+    def flush(self):
+        """Block until everything queued so far has been written."""
+        self._queue.join()
+
+    def close(self):
+        """Write all queued entries and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        atexit.unregister(self.close)
+
+    def _put(self, item):
+        if self._closed:
+            raise RuntimeError("BackgroundWriter is closed")
+        self._queue.put(item)
+
+    def _run(self):
+        stopped = False
+        while not stopped:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines = []
+            files = {}
+            for item in batch:
+                if item is _STOP:
+                    stopped = True
+                    continue
+                kind, payload = item
+                if kind == "log":
+                    lines.append(payload)
+                else:
+                    path, content = payload
+                    files[path] = content
+
+            try:
+                self._write(lines, files)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+        if self._log_handle is not None:
+            self._log_handle.close()
+            self._log_handle = None
+
+    def _write(self, lines, files):
+        if lines:
+            try:
+                if self._log_handle is None:
+                    self._log_handle = open(self.log_file, "a")
+                self._log_handle.write("".join(f"{line}\n" for line in lines))
+                self._log_handle.flush()
+            except OSError as e:
+                print(f"WARNING: Failed to write {len(lines)} lines to {self.log_file}: {e}")
+
+        for path, content in files.items():
+            tmp_path = f"{path}.tmp"
+            try:
+                with open(tmp_path, "w") as f:
+                    f.write(content)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                print(f"WARNING: Failed to write {path}: {e}")
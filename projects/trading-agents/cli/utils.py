@@ -274,3 +274,19 @@ def select_llm_provider() -> tuple[str, str]:
     print(f"You selected: {display_name}\tURL: {url}")
     
     return display_name, url
+
+
+def ask_resume(ticker: str, analysis_date: str) -> bool:
+    """Ask whether to resume an interrupted run for the same ticker and date."""
+    choice = questionary.confirm(
+        f"An interrupted analysis of {ticker} on {analysis_date} was found. Resume it?",
+        default=True,
+        style=questionary.Style(
+            [
+                ("selected", "fg:green noinherit"),
+                ("highlighted", "fg:green noinherit"),
+            ]
+        ),
+    ).ask()
+
+    return bool(choice)
@@ -1,4 +1,4 @@
-from .utils.agent_utils import create_msg_delete
+from .utils.agent_utils import create_feature_precompute, create_msg_delete
 from .utils.agent_states import AgentState, InvestDebateState, RiskDebateState
 from .utils.memory import FinancialSituationMemory
 
@@ -23,6 +23,7 @@ __all__ = [
     "FinancialSituationMemory",
     "AgentState",
     "create_msg_delete",
+    "create_feature_precompute",
     "InvestDebateState",
     "RiskDebateState",
     "create_bear_researcher",
@@ -1,21 +1,33 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 import time
 import json
-from tradingagents.agents.utils.agent_utils import get_stock_data, get_indicators
+from tradingagents.agents.utils.agent_utils import (
+    get_stock_data,
+    get_indicators,
+    get_indicators_batch,
+    market_features_context,
+    analyst_tool_instructions,
+    bind_analyst_tools,
+    routable_tools,
+    is_final_analyst_turn,
+)
 from tradingagents.dataflows.config import get_config
 
 
-def create_market_analyst(llm):
+def create_market_analyst(llm, tool_budget=None):
 
     def market_analyst_node(state):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
         company_name = state["company_of_interest"]
 
-        tools = [
+        tools = routable_tools([
             get_stock_data,
+            get_indicators_batch,
             get_indicators,
-        ]
+        ])
+        # Once the tool call budget is used up, this turn must produce the report
+        final_turn = is_final_analyst_turn(state["messages"], tool_budget)
 
         system_message = (
             """You are a trading assistant tasked with analyzing financial markets. Your role is to select the **most relevant indicators** for a given market condition or trading strategy from the following list. The goal is to choose up to **8 indicators** that provide complementary insights without redundancy. Categories and each category's indicators are:
@@ -42,10 +54,18 @@ Volatility Indicators:
 Volume-Based Indicators:
 - vwma: VWMA: A moving average weighted by volume. Usage: Confirm trends by integrating price action with volume data. Tips: Watch for skewed results from volume spikes; use in combination with other volume analyses.
 
-- Select indicators that provide diverse and complementary information. Avoid redundancy (e.g., do not select both rsi and stochrsi). Also briefly explain why they are suitable for the given market context. When you tool call, please use the exact name of the indicators provided above as they are defined parameters, otherwise your call will fail. Please make sure to call get_stock_data first to retrieve the CSV that is needed to generate indicators. Then use get_indicators with the specific indicator names. Write a very detailed and nuanced report of the trends you observe. Do not simply state the trends are mixed, provide detailed and finegrained analysis and insights that may help traders make decisions."""
+- Select indicators that provide diverse and complementary information. Avoid redundancy (e.g., do not select both rsi and stochrsi). Also briefly explain why they are suitable for the given market context. When you tool call, please use the exact name of the indicators provided above as they are defined parameters, otherwise your call will fail. Call get_stock_data to retrieve the price CSV and get_indicators_batch once with all of your selected indicator names, which returns every indicator in a single table; these calls do not depend on each other, so request them in the same response. Only use get_indicators for a single indicator you missed. Write a very detailed and nuanced report of the trends you observe. Do not simply state the trends are mixed, provide detailed and finegrained analysis and insights that may help traders make decisions."""
             + """ Make sure to append a Markdown table at the end of the report to organize key points in the report, organized and easy to read."""
         )
 
+        features_context = market_features_context(state)
+        if features_context:
+            system_message += (
+                " The latest value of every indicator listed above is already in the precomputed market features below,"
+                " together with returns, realized volatility and drawdowns; do not fetch indicators just to read their"
+                " current value, and use the tools only for the history behind the trends you analyze."
+            )
+
         prompt = ChatPromptTemplate.from_messages(
             [
                 (
@@ -54,6 +74,7 @@ Volume-Based Indicators:
                     " Use the provided tools to progress towards answering the question."
                     " If you are unable to fully answer, that's OK; another assistant with different tools"
                     " will help where you left off. Execute what you can to make progress."
+                    " {tool_instructions}"
                     " If you or any other assistant has the FINAL TRANSACTION PROPOSAL: **BUY/HOLD/SELL** or deliverable,"
                     " prefix your response with FINAL TRANSACTION PROPOSAL: **BUY/HOLD/SELL** so the team knows to stop."
                     " You have access to the following tools: {tool_names}.\n{system_message}"
@@ -63,18 +84,19 @@ Volume-Based Indicators:
             ]
         )
 
-        prompt = prompt.partial(system_message=system_message)
+        prompt = prompt.partial(system_message=system_message + features_context)
         prompt = prompt.partial(tool_names=", ".join([tool.name for tool in tools]))
+        prompt = prompt.partial(tool_instructions=analyst_tool_instructions(final_turn))
         prompt = prompt.partial(current_date=current_date)
         prompt = prompt.partial(ticker=ticker)
 
-        chain = prompt | llm.bind_tools(tools)
+        chain = prompt | bind_analyst_tools(llm, tools, final_turn)
 
         result = chain.invoke(state["messages"])
 
         report = ""
 
-        if len(result.tool_calls) == 0:
+        if len(result.tool_calls) == 0 or final_turn:
             report = result.content
        
         return {
@@ -1,6 +1,8 @@
 import time
 import json
 
+from tradingagents.agents.utils.trade_decision import decide
+
 
 def create_research_manager(llm, memory):
     def research_manager_node(state) -> dict:
@@ -13,7 +15,9 @@ def create_research_manager(llm, memory):
         investment_debate_state = state["investment_debate_state"]
 
         curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        past_memories = memory.get_memories(
+            curr_situation, n_matches=2, **memory.retrieval_filters(state)
+        )
 
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
@@ -36,20 +40,21 @@ Here are your past reflections on mistakes:
 Here is the debate:
 Debate History:
 {history}"""
-        response = llm.invoke(prompt)
+        decision, plan = decide(llm, prompt)
 
         new_investment_debate_state = {
-            "judge_decision": response.content,
+            "judge_decision": plan,
             "history": investment_debate_state.get("history", ""),
             "bear_history": investment_debate_state.get("bear_history", ""),
             "bull_history": investment_debate_state.get("bull_history", ""),
-            "current_response": response.content,
+            "current_response": plan,
             "count": investment_debate_state["count"],
         }
 
         return {
             "investment_debate_state": new_investment_debate_state,
-            "investment_plan": response.content,
+            "investment_plan": plan,
+            "investment_decision": decision,
         }
 
     return research_manager_node
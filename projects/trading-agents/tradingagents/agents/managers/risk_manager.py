@@ -1,6 +1,8 @@
 import time
 import json
 
+from tradingagents.agents.utils.trade_decision import decide
+
 
 def create_risk_manager(llm, memory):
     def risk_manager_node(state) -> dict:
@@ -16,7 +18,9 @@ def create_risk_manager(llm, memory):
         trader_plan = state["investment_plan"]
 
         curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        past_memories = memory.get_memories(
+            curr_situation, n_matches=2, **memory.retrieval_filters(state)
+        )
 
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
@@ -43,10 +47,10 @@ Deliverables:
 
 Focus on actionable insights and continuous improvement. Build on past lessons, critically evaluate all perspectives, and ensure each decision advances better outcomes."""
 
-        response = llm.invoke(prompt)
+        decision, final_decision = decide(llm, prompt)
 
         new_risk_debate_state = {
-            "judge_decision": response.content,
+            "judge_decision": final_decision,
             "history": risk_debate_state["history"],
             "risky_history": risk_debate_state["risky_history"],
             "safe_history": risk_debate_state["safe_history"],
@@ -60,7 +64,8 @@ Focus on actionable insights and continuous improvement. Build on past lessons,
 
         return {
             "risk_debate_state": new_risk_debate_state,
-            "final_trade_decision": response.content,
+            "final_trade_decision": final_decision,
+            "final_decision": decision,
         }
 
     return risk_manager_node
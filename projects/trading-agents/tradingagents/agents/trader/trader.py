@@ -2,6 +2,10 @@ import functools
 import time
 import json
 
+from langchain_core.messages import AIMessage
+
+from tradingagents.agents.utils.trade_decision import decide
+
 
 def create_trader(llm, memory):
     def trader_node(state, name):
@@ -13,7 +17,9 @@ def create_trader(llm, memory):
         fundamentals_report = state["fundamentals_report"]
 
         curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        past_memories = memory.get_memories(
+            curr_situation, n_matches=2, **memory.retrieval_filters(state)
+        )
 
         past_memory_str = ""
         if past_memories:
@@ -35,11 +41,12 @@ def create_trader(llm, memory):
             context,
         ]
 
-        result = llm.invoke(messages)
+        decision, plan = decide(llm, messages)
 
         return {
-            "messages": [result],
-            "trader_investment_plan": result.content,
+            "messages": [AIMessage(content=plan, name=name)],
+            "trader_investment_plan": plan,
+            "trader_decision": decision,
             "sender": name,
         }
 
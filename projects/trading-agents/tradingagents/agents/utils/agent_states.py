@@ -1,10 +1,7 @@
 from typing import Annotated, Sequence
 from datetime import date, timedelta, datetime
 from typing_extensions import TypedDict, Optional
-from langchain_openai import ChatOpenAI
-from tradingagents.agents import *
-from langgraph.prebuilt import ToolNode
-from langgraph.graph import END, StateGraph, START, MessagesState
+from langgraph.graph import MessagesState
 
 
 # Researcher team state
@@ -53,6 +50,10 @@ class AgentState(MessagesState):
 
     sender: Annotated[str, "Agent that sent this message"]
 
+    # deterministic features from daily prices, see dataflows/features.py
+    market_features: Annotated[dict, "Precomputed market features of the ticker and date"]
+    volatility_regime: Annotated[Optional[str], "Volatility regime: low, normal or high"]
+
     # research step
     market_report: Annotated[str, "Report from the Market Analyst"]
     sentiment_report: Annotated[str, "Report from the Social Media Analyst"]
@@ -66,11 +67,14 @@ class AgentState(MessagesState):
         InvestDebateState, "Current state of the debate on if to invest or not"
     ]
     investment_plan: Annotated[str, "Plan generated by the Analyst"]
+    investment_decision: Annotated[Optional[dict], "Research Manager's TradeDecision, when structured"]
 
     trader_investment_plan: Annotated[str, "Plan generated by the Trader"]
+    trader_decision: Annotated[Optional[dict], "Trader's TradeDecision, when structured"]
 
     # risk management team discussion step
     risk_debate_state: Annotated[
         RiskDebateState, "Current state of the debate on evaluating risk"
     ]
     final_trade_decision: Annotated[str, "Final decision made by the Risk Analysts"]
+    final_decision: Annotated[Optional[dict], "Risk Judge's TradeDecision, when structured"]
@@ -1,11 +1,12 @@
-from langchain_core.messages import HumanMessage, RemoveMessage
+from langchain_core.messages import HumanMessage, RemoveMessage, ToolMessage
 
 # Import tools from separate utility files
 from tradingagents.agents.utils.core_stock_tools import (
     get_stock_data
 )
 from tradingagents.agents.utils.technical_indicators_tools import (
-    get_indicators
+    get_indicators,
+    get_indicators_batch
 )
 from tradingagents.agents.utils.fundamental_data_tools import (
     get_fundamentals,
@@ -19,6 +20,52 @@ from tradingagents.agents.utils.news_data_tools import (
     get_insider_transactions,
     get_global_news
 )
+from tradingagents.dataflows.interface import method_available
+
+PARALLEL_TOOL_CALLS_INSTRUCTION = (
+    "When you need several independent pieces of data, request all of those tool calls"
+    " in a single response so they are fetched together; identical calls are answered from cache."
+)
+FINAL_TURN_INSTRUCTION = (
+    "Your tool call budget is used up and no more tools can be called:"
+    " write your final report now from the data you already have."
+)
+
+
+def tool_calls_used(messages):
+    """Count the tool results in an analyst's message history"""
+    return sum(isinstance(message, ToolMessage) for message in messages)
+
+
+def is_final_analyst_turn(messages, tool_budget=None):
+    """Whether an analyst has used up its tool call budget and must write its report"""
+    return tool_budget is not None and tool_calls_used(messages) >= tool_budget
+
+
+def routable_tools(tools, config=None):
+    """The tools whose data the vendor config can serve; all of them unless vendor_fallback is off"""
+    return [tool for tool in tools if method_available(tool.name, config)]
+
+
+def analyst_tool_instructions(final_turn):
+    """The tool calling part of an analyst's system prompt"""
+    return FINAL_TURN_INSTRUCTION if final_turn else PARALLEL_TOOL_CALLS_INSTRUCTION
+
+
+def bind_analyst_tools(llm, tools, final_turn):
+    """Bind an analyst's tools, with tool calls disabled on its final turn.
+
+    The tools stay bound on the final turn (providers reject tool results in
+    the history otherwise) but tool_choice="none" forbids calling them; models
+    that do not support it get no tools at all.
+    """
+    if not final_turn:
+        return llm.bind_tools(tools)
+    try:
+        return llm.bind_tools(tools, tool_choice="none")
+    except (NotImplementedError, TypeError, ValueError):
+        return llm
+
 
 def create_msg_delete():
     def delete_messages(state):
@@ -36,4 +83,37 @@ def create_msg_delete():
     return delete_messages
 
 
-        
\ No newline at end of file
+        
+def create_feature_precompute():
+    def feature_precompute(state):
+        """Put the deterministic market features of the ticker and date into state"""
+        from tradingagents.dataflows.features import get_market_features
+
+        ticker = state["company_of_interest"]
+        try:
+            market_features = get_market_features(ticker, state["trade_date"])
+        except Exception as e:
+            # Missing, failing or stale price data only costs the analysts the features
+            print(f"WARNING: No precomputed market features for {ticker}: {e}")
+            return {"market_features": {}, "volatility_regime": None}
+
+        return {
+            "market_features": market_features,
+            "volatility_regime": market_features["volatility_regime"],
+        }
+
+    return feature_precompute
+
+
+def market_features_context(state):
+    """Prompt section with the precomputed market features, empty when there are none"""
+    from tradingagents.dataflows.features import format_market_features
+
+    table = format_market_features(state.get("market_features"))
+    if not table:
+        return ""
+    return (
+        f"\n\nPrecomputed market features of {state['company_of_interest']} as of "
+        f"{state['market_features']['as_of']} (deterministic, from daily prices; "
+        f"returns and drawdowns are fractions, volatilities annualized):\n{table}\n"
+    )
@@ -0,0 +1,278 @@
+"""Offline text embeddings and an in-memory vector index for agent memories.
+
+HashingEmbedder maps word unigrams and bigrams into a fixed number of buckets
+with a signed hash (the "hashing trick"), using sublinear term frequencies.
+No model or vocabulary has to be downloaded or fitted, and the same text
+always gets the same vector in every process.
+
+VectorIndex keeps the vectors in a NumPy matrix and applies IDF weights
+learned from the documents it holds, so common words like "market" count
+less than rare ones. Metadata filters and a point-in-time date narrow the
+candidates before scoring, and a query is one matrix-vector product over them.
+"""
+
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_DIM = 2048
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[.'][a-z0-9]+)*")
+# Multiplier used to combine two token hashes into a bigram hash
+_BIGRAM_MIX = np.uint64(0x9E3779B1)
+
+
+class HashingEmbedder:
+    """Signed feature-hashing embedder over word unigrams and bigrams."""
+
+    def __init__(self, dim: int = DEFAULT_DIM, cache_size: int = 1024):
+        """Initialize the embedder.
+
+        Args:
+            dim: Number of hash buckets, i.e. the embedding size
+            cache_size: Number of recent texts whose embeddings are kept
+        """
+        self.dim = dim
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        # Token -> 32-bit hash; tokens repeat heavily across reports
+        self._token_hashes = {}
+
+    def _hash_tokens(self, tokens: List[str]) -> np.ndarray:
+        hashes = self._token_hashes
+        if len(hashes) > 200_000:
+            hashes.clear()
+        out = np.empty(len(tokens), dtype=np.uint64)
+        for i, token in enumerate(tokens):
+            h = hashes.get(token)
+            if h is None:
+                h = hashes[token] = zlib.crc32(token.encode("utf-8"))
+            out[i] = h
+        return out
+
+    def _embed(self, text: str) -> np.ndarray:
+        tokens = _TOKEN_RE.findall(text.lower())
+        vector = np.zeros(self.dim, dtype=np.float32)
+        if not tokens:
+            return vector
+
+        unigrams = self._hash_tokens(tokens)
+        bigrams = (unigrams[:-1] * _BIGRAM_MIX) ^ (unigrams[1:] + np.uint64(1))
+        hashes = np.concatenate([unigrams, bigrams & np.uint64(0xFFFFFFFF)])
+
+        buckets = (hashes % np.uint64(self.dim)).astype(np.intp)
+        # The top bit decides the sign so collisions tend to cancel out
+        signs = np.where((hashes >> np.uint64(31)) & np.uint64(1), -1.0, 1.0)
+        counts = np.bincount(buckets, weights=signs, minlength=self.dim)
+        vector[:] = np.sign(counts) * np.log1p(np.abs(counts))
+        return vector
+
+    def embed(self, text: str) -> np.ndarray:
+        """Embedding of one text; recent texts are served from the cache."""
+        with self._lock:
+            vector = self._cache.get(text)
+            if vector is not None:
+                self._cache.move_to_end(text)
+                return vector
+        vector = self._embed(text)
+        vector.flags.writeable = False
+        with self._lock:
+            self._cache[text] = vector
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return vector
+
+    def embed_many(self, texts: List[str]) -> np.ndarray:
+        """Embeddings of several texts as an (n, dim) matrix."""
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.vstack([self.embed(text) for text in texts])
+
+
+def date_key(value) -> int:
+    """yyyy-mm-dd (or a date) as an integer yyyymmdd for vectorized comparisons."""
+    return int(str(value)[:10].replace("-", ""))
+
+
+class _Column:
+    """NumPy array (of scalars, or of rows when `width` is set) grown by doubling."""
+
+    def __init__(self, dtype, fill, width: int = 0):
+        self.dtype = dtype
+        self.fill = fill
+        self.width = width
+        self.data = np.full((16, width) if width else 16, fill, dtype=dtype)
+        self.size = 0
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=self.dtype)
+        needed = self.size + len(values)
+        if needed > len(self.data):
+            capacity = max(needed, 2 * len(self.data))
+            grown = np.full((capacity, self.width) if self.width else capacity, self.fill, dtype=self.dtype)
+            grown[: self.size] = self.data[: self.size]
+            self.data = grown
+        self.data[self.size : needed] = values
+        self.size = needed
+
+    def view(self) -> np.ndarray:
+        return self.data[: self.size]
+
+
+class VectorIndex:
+    """Append-only cosine-similarity index with IDF weighting and metadata filters.
+
+    Each row can carry metadata: equality-filterable fields such as ticker,
+    sector or volatility regime are stored as integer codes per field, and an
+    `available_date` as yyyymmdd. `search` first narrows the candidates with
+    vectorized masks and only scores the rows that pass.
+
+    IDF weights are refreshed when the index has grown by `reweight_growth`
+    since they were last computed; rows added in between are weighted with the
+    current weights, so adding is amortized O(1) instead of a full rebuild.
+    """
+
+    def __init__(self, dim: int = DEFAULT_DIM, idf: bool = True, reweight_growth: float = 0.1):
+        self.dim = dim
+        self.idf = idf
+        self.reweight_growth = reweight_growth
+        self._lock = threading.Lock()
+        self._raw = _Column(np.float32, 0.0, width=dim)
+        self._weighted = _Column(np.float32, 0.0, width=dim)
+        self._available = _Column(np.int64, 0)
+        self._fields = {}
+        self._codes = {}
+        self._payloads: List[Any] = []
+        self._doc_freq = np.zeros(dim, dtype=np.float64)
+        self._weights: Optional[np.ndarray] = None
+        self._weights_n = 0
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+    def add(self, vectors: np.ndarray, payloads: List[Any], metadata: Optional[List[dict]] = None):
+        """Add one row per payload, optionally with a metadata dict per row.
+
+        A row's `available_date` metadata (yyyy-mm-dd) is what `as_of`
+        searches compare against; rows without one are always visible. Other
+        metadata values are matched exactly by `where` searches.
+        """
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        metadata = metadata or [{} for _ in payloads]
+        if not (len(vectors) == len(payloads) == len(metadata)):
+            raise ValueError("vectors, payloads and metadata must have the same length")
+
+        with self._lock:
+            n = len(self._payloads)
+            self._raw.extend(vectors)
+            self._payloads.extend(payloads)
+            self._doc_freq += (vectors != 0).sum(axis=0)
+            self._available.extend(
+                [date_key(meta["available_date"]) if meta.get("available_date") else 0 for meta in metadata]
+            )
+
+            names = {name for meta in metadata for name in meta if name != "available_date"}
+            for name in names:
+                if name not in self._fields:
+                    self._fields[name] = _Column(np.int32, -1)
+                    self._fields[name].extend(np.full(n, -1))
+                    self._codes[name] = {}
+            for name, column in self._fields.items():
+                codes = self._codes[name]
+                column.extend(
+                    [
+                        codes.setdefault(meta[name], len(codes)) if meta.get(name) is not None else -1
+                        for meta in metadata
+                    ]
+                )
+
+    def _refresh(self):
+        n = len(self._payloads)
+        if self._weights is None or n > self._weights_n * (1 + self.reweight_growth):
+            if self.idf:
+                weights = (np.log((1 + n) / (1 + self._doc_freq)) + 1).astype(np.float32)
+            else:
+                weights = np.ones(self.dim, dtype=np.float32)
+            self._weights = weights
+            self._weights_n = n
+            self._weighted = _Column(np.float32, 0.0, width=self.dim)
+        start = self._weighted.size
+        if start < n:
+            rows = self._raw.view()[start:n] * self._weights
+            norms = np.linalg.norm(rows, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            self._weighted.extend(rows / norms)
+
+    def _mask(self, where: Optional[dict], as_of) -> Optional[np.ndarray]:
+        mask = None
+        if as_of is not None:
+            available = self._available.view()
+            mask = available <= date_key(as_of)
+        for name, value in (where or {}).items():
+            if name not in self._fields:
+                return np.zeros(len(self._payloads), dtype=bool)
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            codes = [self._codes[name][v] for v in values if v in self._codes[name]]
+            column_mask = np.isin(self._fields[name].view(), codes)
+            mask = column_mask if mask is None else mask & column_mask
+        return mask
+
+    def search(
+        self,
+        vector: np.ndarray,
+        k: int = 1,
+        where: Optional[dict] = None,
+        as_of=None,
+    ) -> List[Tuple[Any, float]]:
+        """The `k` most similar payloads with their cosine similarity, best first.
+
+        Args:
+            vector: Query embedding
+            k: Number of results
+            where: Metadata values rows must match, {field: value or list of values}
+            as_of: Only rows whose available_date is on or before this date
+        """
+        with self._lock:
+            if not self._payloads or k <= 0:
+                return []
+            self._refresh()
+            matrix, weights, payloads = self._weighted.view(), self._weights, self._payloads
+            mask = self._mask(where, as_of)
+
+        query = np.asarray(vector, dtype=np.float32) * weights
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return []
+        query /= norm
+
+        if mask is None:
+            candidates = None
+            scores = matrix @ query
+        else:
+            candidates = np.flatnonzero(mask)
+            if len(candidates) == 0:
+                return []
+            scores = matrix[candidates] @ query
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        rows = top if candidates is None else candidates[top]
+        return [(payloads[row], float(scores[i])) for row, i in zip(rows, top)]
+
+
+_embedders = {}
+_embedders_lock = threading.Lock()
+
+
+def get_hashing_embedder(dim: int = DEFAULT_DIM) -> HashingEmbedder:
+    """Process-wide embedder, so every memory shares one embedding cache."""
+    with _embedders_lock:
+        if dim not in _embedders:
+            _embedders[dim] = HashingEmbedder(dim)
+        return _embedders[dim]
@@ -1,51 +1,146 @@
 import os
-import chromadb
-from chromadb.config import Settings
-from openai import OpenAI
+
+from tradingagents.default_config import DEFAULT_CONFIG
+
+
+def situation_metadata(state, sectors=None):
+    """Metadata stored with, and filtered on by, memories of a run's situation."""
+    ticker = state["company_of_interest"]
+    return {
+        "ticker": ticker,
+        "trade_date": str(state["trade_date"])[:10],
+        "sector": (sectors or {}).get(ticker),
+        "volatility_regime": state.get("volatility_regime"),
+    }
+
+
+def _chroma_where(where, as_of):
+    clauses = []
+    for name, value in (where or {}).items():
+        if isinstance(value, (list, tuple, set)):
+            clauses.append({name: {"$in": list(value)}})
+        else:
+            clauses.append({name: value})
+    if as_of is not None:
+        clauses.append({"available_date": {"$lte": int(str(as_of)[:10].replace("-", ""))}})
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
 
 
 class FinancialSituationMemory:
     def __init__(self, name, config):
+        from tradingagents.dataflows.llm_pool import get_openai_client
+
+        self.name = name
         self.config = config
         self.llm_provider = config.get("llm_provider", "").lower()
-        
-        if config["backend_url"] == "http://localhost:11434/v1":
+        embedding_config = config.get("memory_embedding") or {}
+        self.client = None
+        self.embedding = None
+
+        if embedding_config.get("backend", "auto") == "hashing":
+            # Offline embeddings requested explicitly
+            pass
+        elif config["backend_url"] == "http://localhost:11434/v1":
             self.embedding = "nomic-embed-text"
-            self.client = OpenAI(base_url=config["backend_url"])
+            self.client = get_openai_client(config["backend_url"], provider=self.llm_provider)
+        elif self.llm_provider == "fake":
+            # Offline profiling runs make no embedding calls
+            pass
         elif self.llm_provider == "minimax":
             # MiniMax doesn't support OpenAI-compatible embeddings via Anthropic API
             # Use text-embedding-3-small from OpenAI as fallback if API key available
             openai_key = os.environ.get("OPENAI_API_KEY", "")
             if openai_key:
-                self.client = OpenAI(api_key=openai_key)
+                self.client = get_openai_client(api_key=openai_key)
                 self.embedding = "text-embedding-3-small"
-            else:
-                # No embedding available - disable memory functionality
-                self.client = None
-                self.embedding = None
         else:
             self.embedding = "text-embedding-3-small"
-            self.client = OpenAI(base_url=config["backend_url"])
-        
-        self.chroma_client = chromadb.Client(Settings(allow_reset=True))
-        self.situation_collection = self.chroma_client.create_collection(name=name)
+            self.client = get_openai_client(config["backend_url"], provider=self.llm_provider)
+
+        if self.client is None:
+            # Without an embedding API, memories use hashed n-gram embeddings in
+            # an in-memory NumPy index, so retrieval still works fully offline
+            from .embeddings import DEFAULT_DIM, VectorIndex, get_hashing_embedder
+
+            dim = embedding_config.get("dim", DEFAULT_DIM)
+            self.embedder = get_hashing_embedder(dim)
+            self.index = VectorIndex(dim)
+            self.situation_collection = None
+        else:
+            # Imported on construction so importing the agents package stays cheap
+            import chromadb
+            from chromadb.config import Settings
+
+            self.embedder = None
+            self.index = None
+            self.chroma_client = chromadb.Client(Settings(allow_reset=True))
+            # The in-process client is shared, so several graphs in one process
+            # (batch runs, backtests) reuse the same named collection
+            self.situation_collection = self.chroma_client.get_or_create_collection(name=name)
 
     def get_embedding(self, text):
         """Get embedding for a text"""
-        if self.client is None or self.embedding is None:
-            # Return a simple hash-based embedding for MiniMax without OpenAI key
-            import hashlib
-            hash_val = hashlib.md5(text.encode()).hexdigest()
-            # Return a fixed-size list of floats based on hash
-            return [float(int(hash_val[i:i8], 16)) / 255.0 for i in range(0, 32, 8)]
-        
+        if self.client is None:
+            return self.embedder.embed(text)
+
         response = self.client.embeddings.create(
             model=self.embedding, input=text
         )
         return response.data[0].embedding
 
-    def add_situations(self, situations_and_advice):
-        """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)"""
+    def retrieval_filters(self, state):
+        """get_memories keyword arguments for a run's state, from the memory_retrieval config.
+
+        With point_in_time (the default) only memories whose outcome was known
+        on or before the run's trade date are recalled, so backtests cannot
+        learn from the future.
+        """
+        settings = DEFAULT_CONFIG["memory_retrieval"].copy()
+        settings.update(self.config.get("memory_retrieval") or {})
+        metadata = situation_metadata(state, settings["sectors"])
+
+        where = {}
+        for flag, field in (
+            ("same_ticker", "ticker"),
+            ("same_sector", "sector"),
+            ("same_regime", "volatility_regime"),
+        ):
+            if settings[flag] and metadata[field] is not None:
+                where[field] = metadata[field]
+        return {
+            "where": where or None,
+            "as_of": metadata["trade_date"] if settings["point_in_time"] else None,
+        }
+
+    def add_situations(self, situations_and_advice, metadata=None):
+        """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)
+
+        `metadata` is a dict stored with every situation, e.g. from
+        situation_metadata plus the `available_date` (yyyy-mm-dd) on which the
+        outcome behind the advice became known.
+        """
+        metadata = {k: v for k, v in (metadata or {}).items() if v is not None}
+
+        if self.index is not None:
+            situations = [situation for situation, _ in situations_and_advice]
+            self.index.add(
+                self.embedder.embed_many(situations),
+                [
+                    {"situation": situation, "recommendation": recommendation}
+                    for situation, recommendation in situations_and_advice
+                ],
+                [metadata] * len(situations),
+            )
+            return
+
+        # Stored as yyyymmdd, 0 when unknown, like VectorIndex: rows without it
+        # would never match the point-in-time $lte filter
+        available_date = metadata.get("available_date")
+        metadata["available_date"] = (
+            int(str(available_date)[:10].replace("-", "")) if available_date else 0
+        )
 
         situations = []
         advice = []
@@ -62,22 +157,38 @@ class FinancialSituationMemory:
 
         self.situation_collection.add(
             documents=situations,
-            metadatas=[{"recommendation": rec} for rec in advice],
+            metadatas=[{**metadata, "recommendation": rec} for rec in advice],
             embeddings=embeddings,
             ids=ids,
         )
 
-    def get_memories(self, current_situation, n_matches=1):
-        """Find matching recommendations using embeddings"""
-        if self.client is None:
-            # Return empty results when embeddings not available
-            return []
-            
+    def get_memories(self, current_situation, n_matches=1, where=None, as_of=None):
+        """Find matching recommendations using embeddings
+
+        Args:
+            current_situation: Situation to match
+            n_matches: Number of memories to return
+            where: Metadata the memories must match, {field: value or list of values}
+            as_of: Only memories available on or before this yyyy-mm-dd date
+        """
+        if self.index is not None:
+            return [
+                {
+                    "matched_situation": entry["situation"],
+                    "recommendation": entry["recommendation"],
+                    "similarity_score": score,
+                }
+                for entry, score in self.index.search(
+                    self.get_embedding(current_situation), n_matches, where=where, as_of=as_of
+                )
+            ]
+
         query_embedding = self.get_embedding(current_situation)
 
         results = self.situation_collection.query(
             query_embeddings=[query_embedding],
             n_results=n_matches,
+            where=_chroma_where(where, as_of),
             include=["metadatas", "documents", "distances"],
         )
 
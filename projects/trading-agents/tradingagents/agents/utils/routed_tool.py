@@ -0,0 +1,43 @@
+import inspect
+from typing import Iterator, Optional
+
+from langchain_core.tools import StructuredTool
+
+from tradingagents.dataflows.interface import route_to_vendor_async, route_to_vendor_stream
+
+# Signatures of the routed tools, by tool name
+_signatures = {}
+
+
+def routed_tool(func):
+    """Like @tool, for a data tool whose body is route_to_vendor(<its name>, <its parameters in order>).
+
+    The tool also gets a coroutine that makes the same call through
+    route_to_vendor_async, so ainvoke, and graphs run with ainvoke, await the
+    data vendors instead of blocking a thread on them.
+    """
+    signature = inspect.signature(func)
+    _signatures[func.__name__] = signature
+
+    async def coroutine(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return await route_to_vendor_async(func.__name__, *bound.arguments.values())
+
+    return StructuredTool.from_function(func=func, coroutine=coroutine, name=func.__name__)
+
+
+def stream_routed_tool(tool, args: dict) -> Optional[Iterator[str]]:
+    """A routed tool's output for `args` as chunks from route_to_vendor_stream.
+
+    Returns None for tools not made with routed_tool. The arguments are
+    validated against the tool's schema, as tool.invoke would.
+    """
+    signature = _signatures.get(tool.name)
+    if signature is None:
+        return None
+    if tool.args_schema is not None:
+        args = tool.args_schema.model_validate(args).model_dump()
+    bound = signature.bind(**args)
+    bound.apply_defaults()
+    return route_to_vendor_stream(tool.name, *bound.arguments.values())
@@ -0,0 +1,87 @@
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from tradingagents.dataflows.config import get_config
+from tradingagents.default_config import DEFAULT_CONFIG
+
+
+class TradeDecision(BaseModel):
+    """A trading decision with its conviction, sizing, exits and key reasons."""
+
+    decision: Literal["BUY", "SELL", "HOLD"] = Field(description="The recommended action")
+    conviction: float = Field(
+        ge=0, le=1, description="Confidence in the decision, from 0 (none) to 1 (certain)"
+    )
+    position_size: float = Field(
+        ge=0, le=1, description="Fraction of the portfolio to commit to the position, 0 for HOLD"
+    )
+    stop_loss: Optional[float] = Field(
+        default=None, description="Price at which to exit to limit losses, if any"
+    )
+    take_profit: Optional[float] = Field(
+        default=None, description="Price at which to take profits, if any"
+    )
+    time_horizon: Optional[str] = Field(
+        default=None, description="Expected holding period, e.g. '2-4 weeks'"
+    )
+    key_reasons: List[str] = Field(
+        description="The three to five most important reasons, one short sentence each"
+    )
+    summary: str = Field(description="Rationale and strategic actions in at most three sentences")
+
+
+def format_trade_decision(decision: TradeDecision) -> str:
+    """Compact Markdown rendering of a decision, used in downstream prompts and reports."""
+    exits = [
+        f"stop loss {decision.stop_loss:g}" if decision.stop_loss is not None else None,
+        f"take profit {decision.take_profit:g}" if decision.take_profit is not None else None,
+        f"horizon {decision.time_horizon}" if decision.time_horizon else None,
+    ]
+    lines = [
+        f"**Decision: {decision.decision}** (conviction {decision.conviction:.2f}, "
+        f"position size {decision.position_size:.0%} of portfolio)",
+    ]
+    if any(exits):
+        lines.append("Exits: " + ", ".join(item for item in exits if item))
+    lines.append("Key reasons:")
+    lines.extend(f"{i}. {reason}" for i, reason in enumerate(decision.key_reasons, 1))
+    lines.append("")
+    lines.append(decision.summary)
+    lines.append("")
+    lines.append(f"FINAL TRANSACTION PROPOSAL: **{decision.decision}**")
+    return "\n".join(lines)
+
+
+def decide(llm, messages):
+    """Ask a judge or the trader for its decision, structured when enabled.
+
+    With structured_decisions enabled, the model fills a TradeDecision
+    through the provider's JSON or tool calling mode (structured_decisions
+    "method", the provider default when None). Returns (decision dict or None,
+    text): the text is the compact rendering of the decision, or the model's
+    prose when structured output is disabled or the provider cannot produce it.
+    """
+    from tradingagents.graph.accounting import BudgetExceededError
+
+    settings = DEFAULT_CONFIG["structured_decisions"].copy()
+    settings.update(get_config().get("structured_decisions") or {})
+
+    if settings["enabled"]:
+        kwargs = {"method": settings["method"]} if settings["method"] else {}
+        try:
+            decision = llm.with_structured_output(TradeDecision, **kwargs).invoke(messages)
+            if decision is None:
+                raise ValueError("the model returned no decision")
+            if isinstance(decision, dict):
+                decision = TradeDecision(**decision)
+            return decision.model_dump(), format_trade_decision(decision)
+        except BudgetExceededError:
+            raise
+        except Exception as e:
+            print(
+                f"WARNING: Structured decision failed ({type(e).__name__}: {e}), "
+                f"asking for a prose decision instead"
+            )
+
+    return None, llm.invoke(messages).content
@@ -0,0 +1,166 @@
+import asyncio
+import atexit
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from .config import get_config
+
+API_BASE_URL = "https://www.alphavantage.co/query"
+
+
+class AlphaVantageRateLimitError(Exception):
+    """Exception raised when Alpha Vantage API rate limit is exceeded."""
+    pass
+
+
+class AlphaVantageClient:
+    """Asynchronous Alpha Vantage client shared by every graph in the process.
+
+    Requests run on an aiohttp session owned by a background event loop, so
+    both synchronous callers (tools running in worker threads) and coroutines
+    can use it. Identical requests that are in flight at the same time share a
+    single HTTP call (single-flight), and successful responses are kept for
+    `cache_ttl` seconds so repeated slices of the same series never refetch.
+    """
+
+    def __init__(self, cache_ttl: float = 300, max_concurrency: int = 4, cache_size: int = 128):
+        """Initialize the client.
+
+        Args:
+            cache_ttl: Seconds a successful response is reused. 0 disables caching
+            max_concurrency: Maximum HTTP requests in flight at once
+            cache_size: Maximum number of cached responses
+        """
+        self.cache_ttl = cache_ttl
+        self.max_concurrency = max(1, max_concurrency)
+        self.cache_size = cache_size
+
+        self._cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._in_flight = {}
+        self._session = None
+        self._semaphore = None
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="alpha-vantage-client", daemon=True
+        )
+        self._thread.start()
+
+    @staticmethod
+    def request_key(function_name: str, params: dict) -> tuple:
+        """Build the coalescing/cache key of a request (the API key is excluded)."""
+        items = {k: v for k, v in params.items() if k != "apikey"}
+        items["function"] = function_name
+        return tuple(sorted((k, str(v)) for k, v in items.items()))
+
+    def request(self, function_name: str, params: dict) -> str:
+        """Fetch a response from a synchronous caller."""
+        future = asyncio.run_coroutine_threadsafe(self._fetch(function_name, params), self._loop)
+        return future.result()
+
+    async def arequest(self, function_name: str, params: dict) -> str:
+        """Fetch a response from a coroutine running on any event loop."""
+        future = asyncio.run_coroutine_threadsafe(self._fetch(function_name, params), self._loop)
+        return await asyncio.wrap_future(future)
+
+    async def _fetch(self, function_name: str, params: dict) -> str:
+        # Runs on the client loop, so the cache and in-flight maps need no lock
+        key = self.request_key(function_name, params)
+
+        cached = self._cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < self.cache_ttl:
+            self._cache.move_to_end(key)
+            return cached[1]
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            print(f"DEBUG: Alpha Vantage {function_name} request coalesced with one already in flight")
+            return await asyncio.shield(in_flight)
+
+        task = self._loop.create_task(self._download(function_name, params))
+        self._in_flight[key] = task
+        try:
+            text = await asyncio.shield(task)
+        finally:
+            self._in_flight.pop(key, None)
+
+        if self.cache_ttl > 0:
+            self._cache[key] = (time.monotonic(), text)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return text
+
+    async def _download(self, function_name: str, params: dict) -> str:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._semaphore:
+            try:
+                import aiohttp
+            except ImportError:
+                # Fall back to a blocking request on the loop's default executor
+                import requests
+
+                def blocking_get():
+                    response = requests.get(API_BASE_URL, params=params)
+                    response.raise_for_status()
+                    return response.text
+
+                text = await self._loop.run_in_executor(None, blocking_get)
+            else:
+                if self._session is None:
+                    self._session = aiohttp.ClientSession()
+                async with self._session.get(API_BASE_URL, params=params) as response:
+                    response.raise_for_status()
+                    text = await response.text()
+
+        # Check if response is JSON (error responses are typically JSON)
+        try:
+            response_json = json.loads(text)
+            # Check for rate limit error
+            if isinstance(response_json, dict) and "Information" in response_json:
+                info_message = response_json["Information"]
+                if "rate limit" in info_message.lower() or "api key" in info_message.lower():
+                    raise AlphaVantageRateLimitError(f"Alpha Vantage rate limit exceeded: {info_message}")
+        except json.JSONDecodeError:
+            # Response is not JSON (likely CSV data), which is normal
+            pass
+
+        return text
+
+    def close(self):
+        """Close the HTTP session and stop the background loop."""
+        if not self._loop.is_running():
+            return
+
+        async def shutdown():
+            if self._session is not None:
+                await self._session.close()
+
+        try:
+            asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result(timeout=5)
+        except Exception:
+            pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> AlphaVantageClient:
+    """Get the process-wide Alpha Vantage client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                config = get_config()
+                _client = AlphaVantageClient(
+                    cache_ttl=config.get("alpha_vantage_cache_ttl", 300),
+                    max_concurrency=config.get("alpha_vantage_max_concurrency", 4),
+                )
+                atexit.register(_client.close)
+    return _client
@@ -1,11 +1,16 @@
 import os
-import requests
-import pandas as pd
-import json
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from io import StringIO
 
-API_BASE_URL = "https://www.alphavantage.co/query"
+from .alpha_vantage_client import API_BASE_URL, AlphaVantageRateLimitError, get_client
+
+# Parsed CSV responses, keyed by the response text, so repeated date-range
+# slices of the same series are done in memory
+_FRAME_CACHE_SIZE = 32
+_frame_cache: "OrderedDict[str, object]" = OrderedDict()
+_frame_cache_lock = threading.Lock()
 
 def get_api_key() -> str:
     """Retrieve the API key for Alpha Vantage from environment variables."""
@@ -35,16 +40,8 @@ def format_datetime_for_api(date_input) -> str:
     else:
         raise ValueError(f"Date must be string or datetime object, got {type(date_input)}")
 
-class AlphaVantageRateLimitError(Exception):
-    """Exception raised when Alpha Vantage API rate limit is exceeded."""
-    pass
-
-def _make_api_request(function_name: str, params: dict) -> dict | str:
-    """Helper function to make API requests and handle responses.
-    
-    Raises:
-        AlphaVantageRateLimitError: When API rate limit is exceeded
-    """
+def _build_api_params(function_name: str, params: dict) -> dict:
+    """Add the function name, API key and entitlement to the request parameters."""
     # Create a copy of params to avoid modifying the original
     api_params = params.copy()
     api_params.update({
@@ -63,25 +60,46 @@ def _make_api_request(function_name: str, params: dict) -> dict | str:
         # Remove entitlement if it's None or empty
         api_params.pop("entitlement", None)
     
-    response = requests.get(API_BASE_URL, params=api_params)
-    response.raise_for_status()
+    return api_params
+
+
+def _make_api_request(function_name: str, params: dict) -> dict | str:
+    """Helper function to make API requests and handle responses.
 
-    response_text = response.text
+    Requests go through the shared AlphaVantageClient, so concurrent identical
+    requests share one HTTP call and recent responses are reused.
     
-    # Check if response is JSON (error responses are typically JSON)
-    try:
-        response_json = json.loads(response_text)
-        # Check for rate limit error
-        if "Information" in response_json:
-            info_message = response_json["Information"]
-            if "rate limit" in info_message.lower() or "api key" in info_message.lower():
-                raise AlphaVantageRateLimitError(f"Alpha Vantage rate limit exceeded: {info_message}")
-    except json.JSONDecodeError:
-        # Response is not JSON (likely CSV data), which is normal
-        pass
+    Raises:
+        AlphaVantageRateLimitError: When API rate limit is exceeded
+    """
+    return get_client().request(function_name, _build_api_params(function_name, params))
+
+
+async def _make_api_request_async(function_name: str, params: dict) -> dict | str:
+    """Async variant of _make_api_request for callers running on an event loop."""
+    return await get_client().arequest(function_name, _build_api_params(function_name, params))
 
-    return response_text
 
+def _parse_csv_frame(csv_data: str):
+    """Parse a CSV response into a DataFrame with a datetime first column, with caching."""
+    import pandas as pd
+
+    with _frame_cache_lock:
+        df = _frame_cache.get(csv_data)
+        if df is not None:
+            _frame_cache.move_to_end(csv_data)
+            return df
+
+    df = pd.read_csv(StringIO(csv_data))
+    # Assume the first column is the date column (timestamp)
+    date_col = df.columns[0]
+    df[date_col] = pd.to_datetime(df[date_col])
+
+    with _frame_cache_lock:
+        _frame_cache[csv_data] = df
+        while len(_frame_cache) > _FRAME_CACHE_SIZE:
+            _frame_cache.popitem(last=False)
+    return df
 
 
 def _filter_csv_by_date_range(csv_data: str, start_date: str, end_date: str) -> str:
@@ -99,13 +117,12 @@ def _filter_csv_by_date_range(csv_data: str, start_date: str, end_date: str) ->
     if not csv_data or csv_data.strip() == "":
         return csv_data
 
-    try:
-        # Parse CSV data
-        df = pd.read_csv(StringIO(csv_data))
+    import pandas as pd
 
-        # Assume the first column is the date column (timestamp)
+    try:
+        # Parse CSV data (cached, so only the slicing below is repeated)
+        df = _parse_csv_frame(csv_data)
         date_col = df.columns[0]
-        df[date_col] = pd.to_datetime(df[date_col])
 
         # Filter by date range
         start_dt = pd.to_datetime(start_date)
@@ -1,4 +1,4 @@
-from .alpha_vantage_common import _make_api_request
+from .alpha_vantage_common import _make_api_request, _make_api_request_async
 
 
 def get_fundamentals(ticker: str, curr_date: str = None) -> str:
@@ -75,3 +75,22 @@ def get_income_statement(ticker: str, freq: str = "quarterly", curr_date: str =
 
     return _make_api_request("INCOME_STATEMENT", params)
 
+
+async def get_fundamentals_async(ticker: str, curr_date: str = None) -> str:
+    """Async variant of get_fundamentals."""
+    return await _make_api_request_async("OVERVIEW", {"symbol": ticker})
+
+
+async def get_balance_sheet_async(ticker: str, freq: str = "quarterly", curr_date: str = None) -> str:
+    """Async variant of get_balance_sheet."""
+    return await _make_api_request_async("BALANCE_SHEET", {"symbol": ticker})
+
+
+async def get_cashflow_async(ticker: str, freq: str = "quarterly", curr_date: str = None) -> str:
+    """Async variant of get_cashflow."""
+    return await _make_api_request_async("CASH_FLOW", {"symbol": ticker})
+
+
+async def get_income_statement_async(ticker: str, freq: str = "quarterly", curr_date: str = None) -> str:
+    """Async variant of get_income_statement."""
+    return await _make_api_request_async("INCOME_STATEMENT", {"symbol": ticker})
@@ -1,4 +1,63 @@
 from .alpha_vantage_common import _make_api_request
+from .output_encoding import encode_frame, encode_series
+
+SUPPORTED_INDICATORS = {
+    "close_50_sma": ("50 SMA", "close"),
+    "close_200_sma": ("200 SMA", "close"),
+    "close_10_ema": ("10 EMA", "close"),
+    "macd": ("MACD", "close"),
+    "macds": ("MACD Signal", "close"),
+    "macdh": ("MACD Histogram", "close"),
+    "rsi": ("RSI", "close"),
+    "boll": ("Bollinger Middle", "close"),
+    "boll_ub": ("Bollinger Upper Band", "close"),
+    "boll_lb": ("Bollinger Lower Band", "close"),
+    "atr": ("ATR", None),
+    "vwma": ("VWMA", "close")
+}
+
+INDICATOR_DESCRIPTIONS = {
+    "close_50_sma": "50 SMA: A medium-term trend indicator. Usage: Identify trend direction and serve as dynamic support/resistance. Tips: It lags price; combine with faster indicators for timely signals.",
+    "close_200_sma": "200 SMA: A long-term trend benchmark. Usage: Confirm overall market trend and identify golden/death cross setups. Tips: It reacts slowly; best for strategic trend confirmation rather than frequent trading entries.",
+    "close_10_ema": "10 EMA: A responsive short-term average. Usage: Capture quick shifts in momentum and potential entry points. Tips: Prone to noise in choppy markets; use alongside longer averages for filtering false signals.",
+    "macd": "MACD: Computes momentum via differences of EMAs. Usage: Look for crossovers and divergence as signals of trend changes. Tips: Confirm with other indicators in low-volatility or sideways markets.",
+    "macds": "MACD Signal: An EMA smoothing of the MACD line. Usage: Use crossovers with the MACD line to trigger trades. Tips: Should be part of a broader strategy to avoid false positives.",
+    "macdh": "MACD Histogram: Shows the gap between the MACD line and its signal. Usage: Visualize momentum strength and spot divergence early. Tips: Can be volatile; complement with additional filters in fast-moving markets.",
+    "rsi": "RSI: Measures momentum to flag overbought/oversold conditions. Usage: Apply 70/30 thresholds and watch for divergence to signal reversals. Tips: In strong trends, RSI may remain extreme; always cross-check with trend analysis.",
+    "boll": "Bollinger Middle: A 20 SMA serving as the basis for Bollinger Bands. Usage: Acts as a dynamic benchmark for price movement. Tips: Combine with the upper and lower bands to effectively spot breakouts or reversals.",
+    "boll_ub": "Bollinger Upper Band: Typically 2 standard deviations above the middle line. Usage: Signals potential overbought conditions and breakout zones. Tips: Confirm signals with other tools; prices may ride the band in strong trends.",
+    "boll_lb": "Bollinger Lower Band: Typically 2 standard deviations below the middle line. Usage: Indicates potential oversold conditions. Tips: Use additional analysis to avoid false reversal signals.",
+    "atr": "ATR: Averages true range to measure volatility. Usage: Set stop-loss levels and adjust position sizes based on current market volatility. Tips: It's a reactive measure, so use it as part of a broader risk management strategy.",
+    "vwma": "VWMA: A moving average weighted by volume. Usage: Confirm trends by integrating price action with volume data. Tips: Watch for skewed results from volume spikes; use in combination with other volume analyses."
+}
+
+# Map internal indicator names to expected CSV column names from Alpha Vantage
+COLUMN_NAMES = {
+    "macd": "MACD", "macds": "MACD_Signal", "macdh": "MACD_Hist",
+    "boll": "Real Middle Band", "boll_ub": "Real Upper Band", "boll_lb": "Real Lower Band",
+    "rsi": "RSI", "atr": "ATR", "close_10_ema": "EMA",
+    "close_50_sma": "SMA", "close_200_sma": "SMA"
+}
+
+
+def _indicator_request(indicator: str, symbol: str, interval: str, time_period: int, series_type: str):
+    """Get the Alpha Vantage function name and parameters that return an indicator."""
+    if indicator == "close_50_sma":
+        return "SMA", {"symbol": symbol, "interval": interval, "time_period": "50", "series_type": series_type, "datatype": "csv"}
+    if indicator == "close_200_sma":
+        return "SMA", {"symbol": symbol, "interval": interval, "time_period": "200", "series_type": series_type, "datatype": "csv"}
+    if indicator == "close_10_ema":
+        return "EMA", {"symbol": symbol, "interval": interval, "time_period": "10", "series_type": series_type, "datatype": "csv"}
+    if indicator in ["macd", "macds", "macdh"]:
+        return "MACD", {"symbol": symbol, "interval": interval, "series_type": series_type, "datatype": "csv"}
+    if indicator == "rsi":
+        return "RSI", {"symbol": symbol, "interval": interval, "time_period": str(time_period), "series_type": series_type, "datatype": "csv"}
+    if indicator in ["boll", "boll_ub", "boll_lb"]:
+        return "BBANDS", {"symbol": symbol, "interval": interval, "time_period": "20", "series_type": series_type, "datatype": "csv"}
+    if indicator == "atr":
+        return "ATR", {"symbol": symbol, "interval": interval, "time_period": str(time_period), "datatype": "csv"}
+    raise ValueError(f"Indicator {indicator} not implemented yet.")
+
 
 def get_indicator(
     symbol: str,
@@ -27,127 +86,30 @@ def get_indicator(
     from datetime import datetime
     from dateutil.relativedelta import relativedelta
 
-    supported_indicators = {
-        "close_50_sma": ("50 SMA", "close"),
-        "close_200_sma": ("200 SMA", "close"),
-        "close_10_ema": ("10 EMA", "close"),
-        "macd": ("MACD", "close"),
-        "macds": ("MACD Signal", "close"),
-        "macdh": ("MACD Histogram", "close"),
-        "rsi": ("RSI", "close"),
-        "boll": ("Bollinger Middle", "close"),
-        "boll_ub": ("Bollinger Upper Band", "close"),
-        "boll_lb": ("Bollinger Lower Band", "close"),
-        "atr": ("ATR", None),
-        "vwma": ("VWMA", "close")
-    }
-
-    indicator_descriptions = {
-        "close_50_sma": "50 SMA: A medium-term trend indicator. Usage: Identify trend direction and serve as dynamic support/resistance. Tips: It lags price; combine with faster indicators for timely signals.",
-        "close_200_sma": "200 SMA: A long-term trend benchmark. Usage: Confirm overall market trend and identify golden/death cross setups. Tips: It reacts slowly; best for strategic trend confirmation rather than frequent trading entries.",
-        "close_10_ema": "10 EMA: A responsive short-term average. Usage: Capture quick shifts in momentum and potential entry points. Tips: Prone to noise in choppy markets; use alongside longer averages for filtering false signals.",
-        "macd": "MACD: Computes momentum via differences of EMAs. Usage: Look for crossovers and divergence as signals of trend changes. Tips: Confirm with other indicators in low-volatility or sideways markets.",
-        "macds": "MACD Signal: An EMA smoothing of the MACD line. Usage: Use crossovers with the MACD line to trigger trades. Tips: Should be part of a broader strategy to avoid false positives.",
-        "macdh": "MACD Histogram: Shows the gap between the MACD line and its signal. Usage: Visualize momentum strength and spot divergence early. Tips: Can be volatile; complement with additional filters in fast-moving markets.",
-        "rsi": "RSI: Measures momentum to flag overbought/oversold conditions. Usage: Apply 70/30 thresholds and watch for divergence to signal reversals. Tips: In strong trends, RSI may remain extreme; always cross-check with trend analysis.",
-        "boll": "Bollinger Middle: A 20 SMA serving as the basis for Bollinger Bands. Usage: Acts as a dynamic benchmark for price movement. Tips: Combine with the upper and lower bands to effectively spot breakouts or reversals.",
-        "boll_ub": "Bollinger Upper Band: Typically 2 standard deviations above the middle line. Usage: Signals potential overbought conditions and breakout zones. Tips: Confirm signals with other tools; prices may ride the band in strong trends.",
-        "boll_lb": "Bollinger Lower Band: Typically 2 standard deviations below the middle line. Usage: Indicates potential oversold conditions. Tips: Use additional analysis to avoid false reversal signals.",
-        "atr": "ATR: Averages true range to measure volatility. Usage: Set stop-loss levels and adjust position sizes based on current market volatility. Tips: It's a reactive measure, so use it as part of a broader risk management strategy.",
-        "vwma": "VWMA: A moving average weighted by volume. Usage: Confirm trends by integrating price action with volume data. Tips: Watch for skewed results from volume spikes; use in combination with other volume analyses."
-    }
-
-    if indicator not in supported_indicators:
+    if indicator not in SUPPORTED_INDICATORS:
         raise ValueError(
-            f"Indicator {indicator} is not supported. Please choose from: {list(supported_indicators.keys())}"
+            f"Indicator {indicator} is not supported. Please choose from: {list(SUPPORTED_INDICATORS.keys())}"
         )
 
     curr_date_dt = datetime.strptime(curr_date, "%Y-%m-%d")
     before = curr_date_dt - relativedelta(days=look_back_days)
 
     # Get the full data for the period instead of making individual calls
-    _, required_series_type = supported_indicators[indicator]
+    _, required_series_type = SUPPORTED_INDICATORS[indicator]
 
     # Use the provided series_type or fall back to the required one
     if required_series_type:
         series_type = required_series_type
 
     try:
-        # Get indicator data for the period
-        if indicator == "close_50_sma":
-            data = _make_api_request("SMA", {
-                "symbol": symbol,
-                "interval": interval,
-                "time_period": "50",
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "close_200_sma":
-            data = _make_api_request("SMA", {
-                "symbol": symbol,
-                "interval": interval,
-                "time_period": "200",
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "close_10_ema":
-            data = _make_api_request("EMA", {
-                "symbol": symbol,
-                "interval": interval,
-                "time_period": "10",
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "macd":
-            data = _make_api_request("MACD", {
-                "symbol": symbol,
-                "interval": interval,
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "macds":
-            data = _make_api_request("MACD", {
-                "symbol": symbol,
-                "interval": interval,
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "macdh":
-            data = _make_api_request("MACD", {
-                "symbol": symbol,
-                "interval": interval,
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "rsi":
-            data = _make_api_request("RSI", {
-                "symbol": symbol,
-                "interval": interval,
-                "time_period": str(time_period),
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator in ["boll", "boll_ub", "boll_lb"]:
-            data = _make_api_request("BBANDS", {
-                "symbol": symbol,
-                "interval": interval,
-                "time_period": "20",
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "atr":
-            data = _make_api_request("ATR", {
-                "symbol": symbol,
-                "interval": interval,
-                "time_period": str(time_period),
-                "datatype": "csv"
-            })
-        elif indicator == "vwma":
+        if indicator == "vwma":
             # Alpha Vantage doesn't have direct VWMA, so we'll return an informative message
             # In a real implementation, this would need to be calculated from OHLCV data
-            return f"## VWMA (Volume Weighted Moving Average) for {symbol}:\n\nVWMA calculation requires OHLCV data and is not directly available from Alpha Vantage API.\nThis indicator would need to be calculated from the raw stock data using volume-weighted price averaging.\n\n{indicator_descriptions.get('vwma', 'No description available.')}"
-        else:
-            return f"Error: Indicator {indicator} not implemented yet."
+            return f"## VWMA (Volume Weighted Moving Average) for {symbol}:\n\nVWMA calculation requires OHLCV data and is not directly available from Alpha Vantage API.\nThis indicator would need to be calculated from the raw stock data using volume-weighted price averaging.\n\n{INDICATOR_DESCRIPTIONS.get('vwma', 'No description available.')}"
+
+        # Get indicator data for the period
+        function_name, params = _indicator_request(indicator, symbol, interval, time_period, series_type)
+        data = _make_api_request(function_name, params)
 
         # Parse CSV data and extract values for the date range
         lines = data.strip().split('\n')
@@ -161,15 +123,7 @@ def get_indicator(
         except ValueError:
             return f"Error: 'time' column not found in data for {indicator}. Available columns: {header}"
 
-        # Map internal indicator names to expected CSV column names from Alpha Vantage
-        col_name_map = {
-            "macd": "MACD", "macds": "MACD_Signal", "macdh": "MACD_Hist",
-            "boll": "Real Middle Band", "boll_ub": "Real Upper Band", "boll_lb": "Real Lower Band",
-            "rsi": "RSI", "atr": "ATR", "close_10_ema": "EMA",
-            "close_50_sma": "SMA", "close_200_sma": "SMA"
-        }
-
-        target_col_name = col_name_map.get(indicator)
+        target_col_name = COLUMN_NAMES.get(indicator)
 
         if not target_col_name:
             # Default to the second column if no specific mapping exists
@@ -202,8 +156,12 @@ def get_indicator(
         result_data.sort(key=lambda x: x[0])
 
         ind_string = ""
-        for date_dt, value in result_data:
-            ind_string += f"{date_dt.strftime('%Y-%m-%d')}: {value}\n"
+        if result_data:
+            ind_string = encode_series(
+                [(date_dt.strftime('%Y-%m-%d'), value) for date_dt, value in result_data],
+                indicator,
+                name="get_indicator",
+            )
 
         if not ind_string:
             ind_string = "No data available for the specified date range.\n"
@@ -212,7 +170,7 @@ def get_indicator(
             f"## {indicator.upper()} values from {before.strftime('%Y-%m-%d')} to {curr_date}:\n\n"
             + ind_string
             + "\n\n"
-            + indicator_descriptions.get(indicator, "No description available.")
+            + INDICATOR_DESCRIPTIONS.get(indicator, "No description available.")
         )
 
         return result_str
@@ -220,3 +178,98 @@ def get_indicator(
     except Exception as e:
         print(f"Error getting Alpha Vantage indicator data for {indicator}: {e}")
         return f"Error retrieving {indicator} data: {str(e)}"
+
+
+def get_indicators_batch(
+    symbol: str,
+    indicators: list,
+    curr_date: str,
+    look_back_days: int,
+    interval: str = "daily",
+    time_period: int = 14,
+) -> str:
+    """
+    Returns several Alpha Vantage technical indicators as one table.
+
+    Indicators served by the same API call (e.g. macd/macds/macdh from MACD,
+    boll/boll_ub/boll_lb from BBANDS) share a single request.
+
+    Args:
+        symbol: ticker symbol of the company
+        indicators: technical indicators to get the values of
+        curr_date: The current trading date you are trading on, YYYY-mm-dd
+        look_back_days: how many days to look back
+        interval: Time interval (daily, weekly, monthly)
+        time_period: Number of data points for calculation
+
+    Returns:
+        CSV table with one row per date and one column per indicator
+    """
+    from datetime import datetime
+    from dateutil.relativedelta import relativedelta
+    import pandas as pd
+
+    unsupported = [ind for ind in indicators if ind not in SUPPORTED_INDICATORS]
+    if unsupported:
+        raise ValueError(
+            f"Indicators {unsupported} are not supported. Please choose from: {list(SUPPORTED_INDICATORS.keys())}"
+        )
+    # Keep the requested order but fetch each indicator once
+    indicators = list(dict.fromkeys(indicators))
+
+    curr_date_str = datetime.strptime(curr_date, "%Y-%m-%d").strftime("%Y-%m-%d")
+    before = (datetime.strptime(curr_date, "%Y-%m-%d") - relativedelta(days=look_back_days)).strftime("%Y-%m-%d")
+
+    # Group indicators by the request that returns them
+    requests = {}
+    notes = []
+    for indicator in indicators:
+        if indicator == "vwma":
+            notes.append("- vwma: not available from the Alpha Vantage API")
+            continue
+        series_type = SUPPORTED_INDICATORS[indicator][1] or "close"
+        function_name, params = _indicator_request(indicator, symbol, interval, time_period, series_type)
+        key = (function_name, tuple(sorted(params.items())))
+        requests.setdefault(key, []).append(indicator)
+
+    values = {}  # indicator -> {date: value}
+    for (function_name, params), group in requests.items():
+        lines = _make_api_request(function_name, dict(params)).strip().split("\n")
+        header = [col.strip() for col in lines[0].split(",")]
+        if "time" not in header:
+            raise ValueError(f"'time' column not found in {function_name} data. Available columns: {header}")
+        date_col_idx = header.index("time")
+
+        for indicator in group:
+            col_name = COLUMN_NAMES.get(indicator)
+            value_col_idx = header.index(col_name) if col_name in header else 1
+            series = values.setdefault(indicator, {})
+            for line in lines[1:]:
+                row = line.split(",")
+                if len(row) <= max(date_col_idx, value_col_idx):
+                    continue
+                date_str = row[date_col_idx].strip()[:10]
+                if before <= date_str <= curr_date_str:
+                    series[date_str] = row[value_col_idx].strip()
+
+    columns = [ind for ind in indicators if ind in values]
+    frame = pd.DataFrame(
+        {ind: pd.to_numeric(pd.Series(values[ind], dtype=object), errors="coerce") for ind in columns},
+        columns=columns,
+    ).sort_index()
+    frame.index.name = "Date"
+    table = encode_frame(
+        frame.reset_index(),
+        name="get_indicators_batch",
+        indicators=True,
+    )
+
+    legend = "\n".join(
+        f"- {ind}: {INDICATOR_DESCRIPTIONS[ind].split('. ')[0]}" for ind in columns
+    )
+    return (
+        f"## {symbol.upper()} indicators from {before} to {curr_date_str}:\n\n"
+        + table
+        + "\n"
+        + "\n".join(filter(None, [legend] + notes))
+    )
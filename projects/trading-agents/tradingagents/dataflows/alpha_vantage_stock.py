@@ -1,5 +1,6 @@
 from datetime import datetime
-from .alpha_vantage_common import _make_api_request, _filter_csv_by_date_range
+from .alpha_vantage_common import _make_api_request, _make_api_request_async, _filter_csv_by_date_range
+from .output_encoding import encode_csv_text
 
 def get_stock(
     symbol: str,
@@ -18,6 +19,25 @@ def get_stock(
     Returns:
         CSV string containing the daily adjusted time series data filtered to the date range.
     """
+    response = _make_api_request("TIME_SERIES_DAILY_ADJUSTED", _stock_params(symbol, start_date))
+
+    return encode_csv_text(
+        _filter_csv_by_date_range(response, start_date, end_date), name="get_stock"
+    )
+
+
+async def get_stock_async(symbol: str, start_date: str, end_date: str) -> str:
+    """Async variant of get_stock."""
+    response = await _make_api_request_async(
+        "TIME_SERIES_DAILY_ADJUSTED", _stock_params(symbol, start_date)
+    )
+
+    return encode_csv_text(
+        _filter_csv_by_date_range(response, start_date, end_date), name="get_stock"
+    )
+
+
+def _stock_params(symbol: str, start_date: str) -> dict:
     # Parse dates to determine the range
     start_dt = datetime.strptime(start_date, "%Y-%m-%d")
     today = datetime.now()
@@ -27,12 +47,34 @@ def get_stock(
     days_from_today_to_start = (today - start_dt).days
     outputsize = "compact" if days_from_today_to_start < 100 else "full"
 
-    params = {
+    return {
         "symbol": symbol,
         "outputsize": outputsize,
         "datatype": "csv",
     }
 
-    response = _make_api_request("TIME_SERIES_DAILY_ADJUSTED", params)
 
-    return _filter_csv_by_date_range(response, start_date, end_date)
\ No newline at end of file
+def get_price_history(symbol: str) -> str:
+    """
+    Returns the full daily history of a symbol as CSV text with Date, Open,
+    High, Low, Close and Volume columns, oldest first. Prices are adjusted
+    for splits and dividends, like the yfinance vendor's.
+    """
+    import pandas as pd
+    from io import StringIO
+
+    response = _make_api_request(
+        "TIME_SERIES_DAILY_ADJUSTED",
+        {"symbol": symbol, "outputsize": "full", "datatype": "csv"},
+    )
+    data = pd.read_csv(StringIO(response))
+    factor = data["adjusted_close"] / data["close"]
+    prices = pd.DataFrame({
+        "Date": data["timestamp"].astype(str).str[:10],
+        "Open": data["open"] * factor,
+        "High": data["high"] * factor,
+        "Low": data["low"] * factor,
+        "Close": data["adjusted_close"],
+        "Volume": data["volume"],
+    })
+    return prices.sort_values("Date").to_csv(index=False)
@@ -0,0 +1,183 @@
+"""Per-(vendor, method) circuit breakers used by route_to_vendor.
+
+A breaker watches the outcome of the last `window` calls of one vendor
+implementation. When at least `min_calls` have been made and the share of
+failures reaches `failure_rate`, the breaker opens and route_to_vendor skips
+that vendor without calling it. After `cooldown` seconds a single probe call
+is let through (half-open): success closes the breaker, failure re-opens it
+with the cooldown doubled up to `max_cooldown`.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+from tradingagents.default_config import DEFAULT_CONFIG
+
+from .config import get_config
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def _settings() -> dict:
+    settings = DEFAULT_CONFIG["circuit_breaker"].copy()
+    settings.update(get_config().get("circuit_breaker") or {})
+    return settings
+
+
+class CircuitBreaker:
+    """Thread-safe circuit breaker for one vendor implementation."""
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        min_calls: int = 3,
+        window: int = 10,
+        cooldown: float = 60,
+        max_cooldown: float = 900,
+    ):
+        """Initialize the breaker.
+
+        Args:
+            failure_rate: Share of failed calls in the window that opens the breaker
+            min_calls: Calls needed in the window before the rate is considered
+            window: Number of most recent calls the rate is computed over
+            cooldown: Seconds the breaker stays open before a probe is allowed
+            max_cooldown: Upper bound of the cooldown after repeated failed probes
+        """
+        self.failure_rate = failure_rate
+        self.min_calls = max(1, min_calls)
+        self.base_cooldown = cooldown
+        self.max_cooldown = max(cooldown, max_cooldown)
+
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=max(1, window))
+        self._state = CLOSED
+        self._cooldown = cooldown
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._last_error: Optional[str] = None
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        """Return whether a call may be made now, claiming the probe when half-open."""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self._cooldown:
+                self._state = HALF_OPEN
+                self._probe_in_flight = False
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self._state != CLOSED:
+                self._state = CLOSED
+                self._outcomes.clear()
+                self._cooldown = self.base_cooldown
+            self._probe_in_flight = False
+            self._outcomes.append(True)
+
+    def release(self):
+        """Give back a probe claimed by allow() when the call ended without an outcome."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self, error: Optional[str] = None):
+        with self._lock:
+            self._last_error = error
+            self._probe_in_flight = False
+            if self._state == HALF_OPEN:
+                self._cooldown = min(self._cooldown * 2, self.max_cooldown)
+                self._open()
+                return
+            self._outcomes.append(False)
+            failures = self._outcomes.count(False)
+            if (
+                self._state == CLOSED
+                and len(self._outcomes) >= self.min_calls
+                and failures / len(self._outcomes) >= self.failure_rate
+            ):
+                self._open()
+
+    def _open(self):
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+
+    def retry_in(self) -> float:
+        """Seconds until an open breaker allows a probe (0 when not open)."""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self._cooldown - (time.monotonic() - self._opened_at))
+
+    def status(self) -> dict:
+        """Snapshot of the breaker for reporting."""
+        retry_in = self.retry_in()
+        with self._lock:
+            calls = len(self._outcomes)
+            failures = self._outcomes.count(False)
+            return {
+                "state": self._state,
+                "calls": calls,
+                "failures": failures,
+                "failure_rate": failures / calls if calls else 0.0,
+                "retry_in": round(retry_in, 1),
+                "last_error": self._last_error,
+            }
+
+
+_breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def circuit_breaker_enabled() -> bool:
+    return bool(_settings()["enabled"])
+
+
+def get_breaker(vendor: str, method: str) -> CircuitBreaker:
+    """Get the process-wide breaker of a (vendor, method) pair, creating it on first use."""
+    key = (vendor, method)
+    breaker = _breakers.get(key)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(key)
+            if breaker is None:
+                settings = _settings()
+                breaker = CircuitBreaker(
+                    failure_rate=settings["failure_rate"],
+                    min_calls=settings["min_calls"],
+                    window=settings["window"],
+                    cooldown=settings["cooldown"],
+                    max_cooldown=settings["max_cooldown"],
+                )
+                _breakers[key] = breaker
+    return breaker
+
+
+def get_vendor_health() -> Dict[str, Dict[str, dict]]:
+    """Status of every breaker that has seen a call, as {vendor: {method: status}}."""
+    with _breakers_lock:
+        items = list(_breakers.items())
+    health: Dict[str, Dict[str, dict]] = {}
+    for (vendor, method), breaker in sorted(items):
+        health.setdefault(vendor, {})[method] = breaker.status()
+    return health
+
+
+def reset_vendor_health(vendor: Optional[str] = None):
+    """Forget breaker state, for one vendor or for all of them."""
+    with _breakers_lock:
+        for key in list(_breakers):
+            if vendor is None or key[0] == vendor:
+                del _breakers[key]
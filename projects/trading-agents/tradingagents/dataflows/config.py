@@ -1,3 +1,5 @@
+import contextlib
+import contextvars
 import tradingagents.default_config as default_config
 from typing import Dict, Optional
 
@@ -5,6 +7,11 @@ from typing import Dict, Optional
 _config: Optional[Dict] = None
 DATA_DIR: Optional[str] = None
 
+# Config of the run executing in the current context, see use_config
+_run_config: contextvars.ContextVar[Optional[Dict]] = contextvars.ContextVar(
+    "run_config", default=None
+)
+
 
 def initialize_config():
     """Initialize the configuration with default values."""
@@ -24,11 +31,34 @@ def set_config(config: Dict):
 
 
 def get_config() -> Dict:
-    """Get the current configuration."""
+    """Get the current configuration.
+
+    Inside use_config this is the config of the run in progress, otherwise
+    the process-wide config set by set_config.
+    """
+    run_config = _run_config.get()
+    if run_config is not None:
+        return run_config.copy()
     if _config is None:
         initialize_config()
     return _config.copy()
 
 
+@contextlib.contextmanager
+def use_config(config: Dict):
+    """Make config the configuration seen by get_config in this context.
+
+    Unlike set_config this does not touch the process-wide config, so
+    graphs with different providers, models or vendors can run concurrently
+    in separate threads or tasks. Threads the run starts only see it when
+    they run in a copy of the context (contextvars.copy_context).
+    """
+    token = _run_config.set({**default_config.DEFAULT_CONFIG, **config})
+    try:
+        yield
+    finally:
+        _run_config.reset(token)
+
+
 # Initialize with default config
 initialize_config()
@@ -0,0 +1,191 @@
+"""Deterministic market-regime features per (ticker, date) from daily prices.
+
+The whole price history of a ticker, as served by the core_stock_apis vendor
+(route_to_vendor "get_price_history", so snapshots record and replay it), is
+turned into a feature frame in one vectorized pass: returns over several
+horizons, annualized realized volatility, drawdowns and every stockstats
+indicator the analysts can request. All features only look backwards, so the
+row of a date is a point-in-time snapshot and one frame serves every date of
+a backtest.
+
+Frames are cached as CSV under data_cache_dir/features, keyed by the feature
+settings and a digest of the price history they were computed from.
+"""
+
+import glob
+import hashlib
+import json
+import math
+import os
+import threading
+from io import StringIO
+from typing import Any, Dict, Optional
+
+from tradingagents.default_config import DEFAULT_CONFIG
+
+from .config import get_config
+
+_lock = threading.Lock()
+_frames: Dict[tuple, Any] = {}
+
+
+def _settings() -> dict:
+    settings = DEFAULT_CONFIG["market_features"].copy()
+    settings.update(get_config().get("market_features") or {})
+    if settings["indicators"] is None:
+        from .y_finance import INDICATOR_DESCRIPTIONS
+
+        settings["indicators"] = list(INDICATOR_DESCRIPTIONS)
+    return settings
+
+
+def _settings_digest(settings: dict) -> str:
+    keys = ("return_horizons", "volatility_windows", "drawdown_window", "indicators")
+    payload = json.dumps({key: settings[key] for key in keys}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def compute_feature_frame(prices, settings: Optional[dict] = None):
+    """Feature frame of a daily OHLCV history sorted by date, one row per trading day."""
+    import numpy as np
+    import pandas as pd
+    from stockstats import wrap
+
+    settings = settings or _settings()
+    close = prices["Close"].astype(float)
+    log_returns = np.log(close).diff()
+
+    columns = {"Date": prices["Date"].astype(str).str[:10], "close": close}
+    for horizon in settings["return_horizons"]:
+        columns[f"return_{horizon}d"] = close / close.shift(horizon) - 1
+    for window in settings["volatility_windows"]:
+        columns[f"volatility_{window}d"] = log_returns.rolling(window).std() * math.sqrt(252)
+    columns["drawdown"] = close / close.cummax() - 1
+    window = settings["drawdown_window"]
+    columns[f"drawdown_{window}d"] = close / close.rolling(window, min_periods=1).max() - 1
+
+    stats = wrap(prices.copy())
+    for indicator in settings["indicators"]:
+        # stockstats keeps the row order, so values align with the price rows
+        columns[indicator] = np.asarray(stats[indicator], dtype=float)
+
+    return pd.DataFrame(columns)
+
+
+def get_feature_frame(symbol: str):
+    """The feature frame of a symbol, from the in-process or on-disk cache when current."""
+    import pandas as pd
+
+    from .interface import route_to_vendor
+
+    settings = _settings()
+    prices_csv = route_to_vendor("get_price_history", symbol)
+    price_digest = hashlib.sha256(prices_csv.encode("utf-8")).hexdigest()[:12]
+    digest = _settings_digest(settings)
+    key = (symbol.upper(), digest)
+
+    with _lock:
+        cached = _frames.get(key)
+    if cached is not None and cached[0] == price_digest:
+        return cached[1]
+
+    cache_dir = os.path.join(get_config()["data_cache_dir"], "features")
+    cache_path = os.path.join(cache_dir, f"{symbol.upper()}-{digest}-{price_digest}.csv")
+    if os.path.exists(cache_path):
+        frame = pd.read_csv(cache_path, dtype={"Date": str})
+    else:
+        prices = pd.read_csv(StringIO(prices_csv))
+        prices["Date"] = prices["Date"].astype(str).str[:10]
+        prices = prices.sort_values("Date").reset_index(drop=True)
+        frame = compute_feature_frame(prices, settings)
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        frame.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, cache_path)
+        # Frames of older price histories of the symbol are superseded
+        for stale in glob.glob(os.path.join(cache_dir, f"{symbol.upper()}-{digest}-*.csv")):
+            if stale != cache_path:
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+
+    with _lock:
+        _frames[key] = (price_digest, frame)
+    return frame
+
+
+def classify_volatility(volatility: Optional[float], thresholds=None) -> Optional[str]:
+    """"low", "normal" or "high" for an annualized volatility, None when unknown."""
+    low, high = thresholds or DEFAULT_CONFIG["market_features"]["regime_thresholds"]
+    if volatility is None:
+        return None
+    if volatility < low:
+        return "low"
+    return "normal" if volatility < high else "high"
+
+
+def get_market_features(symbol: str, curr_date: str) -> Dict[str, Any]:
+    """Feature vector of a symbol on the last trading day on or before curr_date.
+
+    Returns a dict with "as_of" (the trading day used), "volatility_regime"
+    and "features" (name -> float, None where the history is too short).
+    Raises ValueError when there are no prices on or before curr_date, or
+    when the latest of them is more than max_staleness trading days older
+    than curr_date (the history ends before the trade date). Errors of the
+    price vendors propagate from route_to_vendor.
+    """
+    import numpy as np
+
+    settings = _settings()
+    frame = get_feature_frame(symbol)
+    dates = frame["Date"].to_numpy()
+    trade_date = str(curr_date)[:10]
+    position = dates.searchsorted(trade_date, side="right") - 1
+    if position < 0:
+        raise ValueError(f"No prices for {symbol} on or before {curr_date}")
+
+    row = frame.iloc[position]
+    lag = int(np.busday_count(row["Date"], trade_date))
+    if lag > settings["max_staleness"]:
+        raise ValueError(
+            f"Latest prices for {symbol} are from {row['Date']}, "
+            f"{lag} trading days before {curr_date}"
+        )
+
+    features = {}
+    for name in frame.columns:
+        if name == "Date":
+            continue
+        value = float(row[name])
+        features[name] = None if math.isnan(value) else round(value, 6)
+
+    return {
+        "as_of": row["Date"],
+        "volatility_regime": classify_volatility(
+            features.get(f"volatility_{settings['regime_window']}d"),
+            settings["regime_thresholds"],
+        ),
+        "features": features,
+    }
+
+
+def format_market_features(market_features: Dict[str, Any]) -> str:
+    """Markdown rendering of get_market_features output for agent prompts."""
+    if not market_features or not market_features.get("features"):
+        return ""
+    lines = [
+        f"Volatility regime: {market_features.get('volatility_regime') or 'unknown'}",
+        "",
+        "| feature | value |",
+        "|---|---|",
+    ]
+    for name, value in market_features["features"].items():
+        lines.append(f"| {name} | {'N/A' if value is None else f'{value:.6g}'} |")
+    return "\n".join(lines)
+
+
+def clear_feature_cache():
+    """Forget the in-process feature frames; the on-disk cache is kept."""
+    with _lock:
+        _frames.clear()
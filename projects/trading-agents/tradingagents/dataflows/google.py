@@ -1,14 +1,15 @@
-from typing import Annotated
+from typing import Annotated, Iterator
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 from .googlenews_utils import getNewsData
 
 
-def get_google_news(
+def iter_google_news(
     query: Annotated[str, "Query to search with"],
     curr_date: Annotated[str, "Curr date in yyyy-mm-dd format"],
     look_back_days: Annotated[int, "how many days to look back"],
-) -> str:
+) -> Iterator[str]:
+    """Yield the Google News report of get_google_news chunk by chunk."""
     query = query.replace(" ", "+")
 
     start_date = datetime.strptime(curr_date, "%Y-%m-%d")
@@ -17,14 +18,17 @@ def get_google_news(
 
     news_results = getNewsData(query, before, curr_date)
 
-    news_str = ""
+    if len(news_results) == 0:
+        return
 
+    yield f"## {query} Google News, from {before} to {curr_date}:\n\n"
     for news in news_results:
-        news_str += (
-            f"### {news['title']} (source: {news['source']}) \n\n{news['snippet']}\n\n"
-        )
+        yield f"### {news['title']} (source: {news['source']}) \n\n{news['snippet']}\n\n"
 
-    if len(news_results) == 0:
-        return ""
 
-    return f"## {query} Google News, from {before} to {curr_date}:\n\n{news_str}"
\ No newline at end of file
+def get_google_news(
+    query: Annotated[str, "Query to search with"],
+    curr_date: Annotated[str, "Curr date in yyyy-mm-dd format"],
+    look_back_days: Annotated[int, "how many days to look back"],
+) -> str:
+    return "".join(iter_google_news(query, curr_date, look_back_days))
@@ -1,16 +1,114 @@
 import json
 import requests
 from bs4 import BeautifulSoup
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from urllib.parse import urlparse
+import threading
 import time
 import random
-from tenacity import (
-    retry,
-    stop_after_attempt,
-    wait_exponential,
-    retry_if_exception_type,
-    retry_if_result,
+
+from tradingagents.default_config import DEFAULT_CONFIG
+
+from .config import get_config
+
+RESULTS_PER_PAGE = 10
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/101.0.4951.54 Safari/537.36"
+    )
+}
+
+
+def _settings() -> dict:
+    settings = DEFAULT_CONFIG["google_news"].copy()
+    settings.update(get_config().get("google_news") or {})
+    return settings
+
+
+class HostPacer:
+    """Token bucket per host, shared by every thread in the process.
+
+    Requests spend a token each; tokens refill at `rate` per second up to
+    `burst`. Backoff only happens after a 429, doubling per consecutive 429
+    (honouring Retry-After) and resetting on the next successful response.
+    """
+
+    def __init__(self, rate: float, burst: int, jitter: float):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.jitter = jitter
+        self._lock = threading.Lock()
+        self._buckets = {}  # host -> [tokens, last_refill, blocked_until, backoff]
+
+    def acquire(self, host: str):
+        """Block until a request to `host` may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                bucket = self._buckets.setdefault(host, [float(self.burst), now, 0.0, 0.0])
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+                if now >= bucket[2] and bucket[0] >= 1:
+                    bucket[0] -= 1
+                    wait = 0.0
+                else:
+                    wait = max(bucket[2] - now, (1 - bucket[0]) / self.rate)
+            if wait <= 0:
+                break
+            time.sleep(wait)
+        if self.jitter:
+            time.sleep(random.uniform(0, self.jitter))
+
+    def throttled(self, host: str, retry_after=None) -> float:
+        """Record a 429 from `host` and return the backoff that now applies."""
+        with self._lock:
+            bucket = self._buckets.setdefault(host, [0.0, time.monotonic(), 0.0, 0.0])
+            bucket[3] = min(60.0, max(4.0, bucket[3] * 2))
+            delay = bucket[3]
+            if retry_after:
+                try:
+                    delay = max(delay, float(retry_after))
+                except ValueError:
+                    pass
+            bucket[0] = 0.0
+            bucket[2] = time.monotonic() + delay
+            return delay
+
+    def succeeded(self, host: str):
+        """Reset the backoff of `host` after a successful response."""
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is not None:
+                bucket[3] = 0.0
+
+
+_session = requests.Session()
+_session.mount(
+    "https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8)
 )
+_pacer = None
+_pacer_lock = threading.Lock()
+
+# url -> (fetched_at, results, has_next), least recently used first
+_page_cache = OrderedDict()
+_page_cache_lock = threading.Lock()
+
+
+def _get_pacer() -> HostPacer:
+    global _pacer
+    if _pacer is None:
+        with _pacer_lock:
+            if _pacer is None:
+                settings = _settings()
+                _pacer = HostPacer(
+                    settings["requests_per_second"], settings["burst"], settings["jitter"]
+                )
+    return _pacer
 
 
 def is_rate_limited(response):
@@ -18,19 +116,87 @@ def is_rate_limited(response):
     return response.status_code == 429
 
 
-@retry(
-    retry=(retry_if_result(is_rate_limited)),
-    wait=wait_exponential(multiplier=1, min=4, max=60),
-    stop=stop_after_attempt(5),
-)
 def make_request(url, headers):
-    """Make a request with retry logic for rate limiting"""
-    # Random delay before each request to avoid detection
-    time.sleep(random.uniform(2, 6))
-    response = requests.get(url, headers=headers)
+    """Make a paced request, backing off and retrying only on rate limiting"""
+    pacer = _get_pacer()
+    host = urlparse(url).netloc
+    max_retries = _settings()["max_retries"]
+
+    for attempt in range(max_retries + 1):
+        pacer.acquire(host)
+        response = _session.get(url, headers=headers, timeout=30)
+        if not is_rate_limited(response):
+            pacer.succeeded(host)
+            return response
+        delay = pacer.throttled(host, response.headers.get("Retry-After"))
+        print(f"RATE_LIMIT: {host} returned 429, backing off {delay:.0f}s (attempt {attempt + 1})")
     return response
 
 
+def _parse_page(content):
+    """Extract news results and whether a next page exists from a results page."""
+    try:
+        soup = BeautifulSoup(content, "lxml")
+    except Exception:
+        soup = BeautifulSoup(content, "html.parser")
+
+    news_results = []
+    for el in soup.select("div.SoaBEf"):
+        try:
+            link = el.find("a")["href"]
+            title = el.select_one("div.MBeuO").get_text()
+            snippet = el.select_one(".GI74Re").get_text()
+            date = el.select_one(".LfVVr").get_text()
+            source = el.select_one(".NUnG9d span").get_text()
+            news_results.append(
+                {
+                    "link": link,
+                    "title": title,
+                    "snippet": snippet,
+                    "date": date,
+                    "source": source,
+                }
+            )
+        except Exception as e:
+            print(f"Error processing result: {e}")
+            # If one of the fields is not found, skip this result
+            continue
+
+    # Check for the "Next" link (pagination)
+    has_next = soup.find("a", id="pnnext") is not None
+    return news_results, has_next
+
+
+def _fetch_page(url, headers):
+    """Fetch and parse one results page, using the page cache when fresh.
+
+    The cache keeps at most `cache_size` pages for `cache_ttl` seconds,
+    evicting the least recently used page first.
+    """
+    settings = _settings()
+    ttl = settings["cache_ttl"]
+    with _page_cache_lock:
+        cached = _page_cache.get(url)
+        if cached is not None:
+            if time.time() - cached[0] < ttl:
+                _page_cache.move_to_end(url)
+                return cached[1], cached[2]
+            del _page_cache[url]
+
+    response = make_request(url, headers)
+    if is_rate_limited(response):
+        raise RuntimeError(f"Still rate limited after retries: {url}")
+    results, has_next = _parse_page(response.content)
+
+    if ttl > 0 and settings["cache_size"] > 0:
+        with _page_cache_lock:
+            _page_cache[url] = (time.time(), results, has_next)
+            _page_cache.move_to_end(url)
+            while len(_page_cache) > settings["cache_size"]:
+                _page_cache.popitem(last=False)
+    return results, has_next
+
+
 def getNewsData(query, start_date, end_date):
     """
     Scrape Google News search results for a given query and date range.
@@ -45,64 +211,44 @@ def getNewsData(query, start_date, end_date):
         end_date = datetime.strptime(end_date, "%Y-%m-%d")
         end_date = end_date.strftime("%m/%d/%Y")
 
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/101.0.4951.54 Safari/537.36"
-        )
-    }
+    settings = _settings()
 
-    news_results = []
-    page = 0
-    while True:
-        offset = page * 10
-        url = (
+    def page_url(page):
+        offset = page * RESULTS_PER_PAGE
+        return (
             f"https://www.google.com/search?q={query}"
             f"&tbs=cdr:1,cd_min:{start_date},cd_max:{end_date}"
             f"&tbm=nws&start={offset}"
         )
 
-        try:
-            response = make_request(url, headers)
-            soup = BeautifulSoup(response.content, "html.parser")
-            results_on_page = soup.select("div.SoaBEf")
-
-            if not results_on_page:
-                break  # No more results found
-
-            for el in results_on_page:
-                try:
-                    link = el.find("a")["href"]
-                    title = el.select_one("div.MBeuO").get_text()
-                    snippet = el.select_one(".GI74Re").get_text()
-                    date = el.select_one(".LfVVr").get_text()
-                    source = el.select_one(".NUnG9d span").get_text()
-                    news_results.append(
-                        {
-                            "link": link,
-                            "title": title,
-                            "snippet": snippet,
-                            "date": date,
-                            "source": source,
-                        }
-                    )
-                except Exception as e:
-                    print(f"Error processing result: {e}")
-                    # If one of the fields is not found, skip this result
-                    continue
-
-            # Update the progress bar with the current count of results scraped
-
-            # Check for the "Next" link (pagination)
-            next_link = soup.find("a", id="pnnext")
-            if not next_link:
+    news_results = []
+    max_pages = settings["max_pages"]
+    parallel = max(1, settings["parallel_pages"])
+    with ThreadPoolExecutor(max_workers=parallel) as executor:
+        # The first page tells us whether paging is needed at all. After a full
+        # page, up to `parallel` further pages are kept in flight; they are
+        # consumed in order and no new page is scheduled once one comes back
+        # short, empty or without a next link
+        in_flight = deque()
+        if max_pages > 0:
+            in_flight.append(executor.submit(_fetch_page, page_url(0), HEADERS))
+        next_page = 1
+        while in_flight:
+            future = in_flight.popleft()
+            try:
+                results, has_next = future.result()
+            except Exception as e:
+                print(f"Failed to fetch Google News page: {e}")
                 break
-
-            page += 1
-
-        except Exception as e:
-            print(f"Failed after multiple retries: {e}")
-            break
+            news_results.extend(results)
+            if len(results) < RESULTS_PER_PAGE or not has_next:
+                break  # Last page reached
+            while next_page < max_pages and len(in_flight) < parallel:
+                in_flight.append(executor.submit(_fetch_page, page_url(next_page), HEADERS))
+                next_page += 1
+
+        # Pages scheduled past the last one are dropped if they have not started
+        for future in in_flight:
+            future.cancel()
 
     return news_results
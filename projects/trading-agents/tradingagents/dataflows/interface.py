@@ -1,37 +1,31 @@
-from typing import Annotated
-
-# Import from vendor-specific modules
-from .local import get_YFin_data, get_finnhub_news, get_finnhub_company_insider_sentiment, get_finnhub_company_insider_transactions, get_simfin_balance_sheet, get_simfin_cashflow, get_simfin_income_statements, get_reddit_global_news, get_reddit_company_news
-from .y_finance import get_YFin_data_online, get_stock_stats_indicators_window, get_balance_sheet as get_yfinance_balance_sheet, get_cashflow as get_yfinance_cashflow, get_income_statement as get_yfinance_income_statement, get_insider_transactions as get_yfinance_insider_transactions
-from .google import get_google_news
-from .openai import get_stock_news_openai, get_global_news_openai, get_fundamentals_openai
-from .alpha_vantage import (
-    get_stock as get_alpha_vantage_stock,
-    get_indicator as get_alpha_vantage_indicator,
-    get_fundamentals as get_alpha_vantage_fundamentals,
-    get_balance_sheet as get_alpha_vantage_balance_sheet,
-    get_cashflow as get_alpha_vantage_cashflow,
-    get_income_statement as get_alpha_vantage_income_statement,
-    get_insider_transactions as get_alpha_vantage_insider_transactions,
-    get_news as get_alpha_vantage_news
-)
-from .alpha_vantage_common import AlphaVantageRateLimitError
+import asyncio
+import contextvars
+import functools
+import importlib
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, Iterator
 
 # Configuration and routing logic
 from .config import get_config
+from .circuit_breaker import circuit_breaker_enabled, get_breaker
+from .snapshot import get_recorder, get_snapshot_bundle
 
 # Tools organized by category
 TOOLS_CATEGORIES = {
     "core_stock_apis": {
         "description": "OHLCV stock price data",
         "tools": [
-            "get_stock_data"
+            "get_stock_data",
+            "get_price_history"
         ]
     },
     "technical_indicators": {
         "description": "Technical analysis indicators",
         "tools": [
-            "get_indicators"
+            "get_indicators",
+            "get_indicators_batch"
         ]
     },
     "fundamental_data": {
@@ -58,64 +52,166 @@ VENDOR_LIST = [
     "local",
     "yfinance",
     "openai",
-    "google"
+    "google",
+    "snapshot"
 ]
 
-# Mapping of methods to their vendor-specific implementations
+# Mapping of methods to their vendor-specific implementations.
+# Implementations are "module:function" references inside this package and are
+# only imported the first time they are routed to, so a run configured for one
+# vendor never pays the import cost of the others.
 VENDOR_METHODS = {
     # core_stock_apis
     "get_stock_data": {
-        "alpha_vantage": get_alpha_vantage_stock,
-        "yfinance": get_YFin_data_online,
-        "local": get_YFin_data,
+        "alpha_vantage": "alpha_vantage_stock:get_stock",
+        "yfinance": "y_finance:get_YFin_data_online",
+        "local": "local:get_YFin_data",
+    },
+    # Full daily history as CSV, for the precomputed market features
+    "get_price_history": {
+        "alpha_vantage": "alpha_vantage_stock:get_price_history",
+        "yfinance": "y_finance:get_YFin_price_history",
+        "local": "local:get_local_price_csv",
     },
     # technical_indicators
     "get_indicators": {
-        "alpha_vantage": get_alpha_vantage_indicator,
-        "yfinance": get_stock_stats_indicators_window,
-        "local": get_stock_stats_indicators_window
+        "alpha_vantage": "alpha_vantage_indicator:get_indicator",
+        "yfinance": "y_finance:get_stock_stats_indicators_window",
+        "local": "y_finance:get_stock_stats_indicators_window"
+    },
+    "get_indicators_batch": {
+        "alpha_vantage": "alpha_vantage_indicator:get_indicators_batch",
+        "yfinance": "y_finance:get_stock_stats_indicators_batch",
+        "local": "y_finance:get_stock_stats_indicators_batch"
     },
     # fundamental_data
     "get_fundamentals": {
-        "alpha_vantage": get_alpha_vantage_fundamentals,
-        "openai": get_fundamentals_openai,
+        "alpha_vantage": "alpha_vantage_fundamentals:get_fundamentals",
+        "openai": "openai:get_fundamentals_openai",
     },
     "get_balance_sheet": {
-        "alpha_vantage": get_alpha_vantage_balance_sheet,
-        "yfinance": get_yfinance_balance_sheet,
-        "local": get_simfin_balance_sheet,
+        "alpha_vantage": "alpha_vantage_fundamentals:get_balance_sheet",
+        "yfinance": "y_finance:get_balance_sheet",
+        "local": "local:get_simfin_balance_sheet",
     },
     "get_cashflow": {
-        "alpha_vantage": get_alpha_vantage_cashflow,
-        "yfinance": get_yfinance_cashflow,
-        "local": get_simfin_cashflow,
+        "alpha_vantage": "alpha_vantage_fundamentals:get_cashflow",
+        "yfinance": "y_finance:get_cashflow",
+        "local": "local:get_simfin_cashflow",
     },
     "get_income_statement": {
-        "alpha_vantage": get_alpha_vantage_income_statement,
-        "yfinance": get_yfinance_income_statement,
-        "local": get_simfin_income_statements,
+        "alpha_vantage": "alpha_vantage_fundamentals:get_income_statement",
+        "yfinance": "y_finance:get_income_statement",
+        "local": "local:get_simfin_income_statements",
     },
     # news_data
     "get_news": {
-        "alpha_vantage": get_alpha_vantage_news,
-        "openai": get_stock_news_openai,
-        "google": get_google_news,
-        "local": [get_finnhub_news, get_reddit_company_news, get_google_news],
+        "alpha_vantage": "alpha_vantage_news:get_news",
+        "openai": "openai:get_stock_news_openai",
+        "google": "google:get_google_news",
+        "local": ["local:get_finnhub_news", "local:get_reddit_company_news"],
     },
     "get_global_news": {
-        "openai": get_global_news_openai,
-        "local": get_reddit_global_news
+        "openai": "openai:get_global_news_openai",
+        "local": "local:get_reddit_global_news"
     },
     "get_insider_sentiment": {
-        "local": get_finnhub_company_insider_sentiment
+        "local": "local:get_finnhub_company_insider_sentiment"
     },
     "get_insider_transactions": {
-        "alpha_vantage": get_alpha_vantage_insider_transactions,
-        "yfinance": get_yfinance_insider_transactions,
-        "local": get_finnhub_company_insider_transactions,
+        "alpha_vantage": "alpha_vantage_news:get_insider_transactions",
+        "yfinance": "y_finance:get_insider_transactions",
+        "local": "local:get_finnhub_company_insider_transactions",
     },
 }
 
+# Implementations that can also produce their output incrementally.
+# route_to_vendor_stream yields their chunks as the data is read; every other
+# caller keeps using the joined implementation.
+STREAMING_IMPLS = {
+    "local:get_finnhub_news": "local:iter_finnhub_news",
+    "local:get_reddit_company_news": "local:iter_reddit_company_news",
+    "local:get_reddit_global_news": "local:iter_reddit_global_news",
+    "google:get_google_news": "google:iter_google_news",
+}
+
+# Native coroutine variants of implementations. route_to_vendor_async awaits
+# these and runs every other implementation on the dataflow executor.
+ASYNC_IMPLS = {
+    "alpha_vantage_stock:get_stock": "alpha_vantage_stock:get_stock_async",
+    "alpha_vantage_fundamentals:get_fundamentals": "alpha_vantage_fundamentals:get_fundamentals_async",
+    "alpha_vantage_fundamentals:get_balance_sheet": "alpha_vantage_fundamentals:get_balance_sheet_async",
+    "alpha_vantage_fundamentals:get_cashflow": "alpha_vantage_fundamentals:get_cashflow_async",
+    "alpha_vantage_fundamentals:get_income_statement": "alpha_vantage_fundamentals:get_income_statement_async",
+    "alpha_vantage_news:get_news": "alpha_vantage_news:get_news_async",
+    "alpha_vantage_news:get_insider_transactions": "alpha_vantage_news:get_insider_transactions_async",
+    "openai:get_stock_news_openai": "openai:get_stock_news_openai_async",
+    "openai:get_global_news_openai": "openai:get_global_news_openai_async",
+    "openai:get_fundamentals_openai": "openai:get_fundamentals_openai_async",
+}
+
+_resolved_impls = {}
+
+
+def resolve_vendor_impl(ref):
+    """Import and return the implementation(s) behind a VENDOR_METHODS entry."""
+    if isinstance(ref, list):
+        return [resolve_vendor_impl(r) for r in ref]
+    if callable(ref):
+        return ref
+
+    impl = _resolved_impls.get(ref)
+    if impl is None:
+        module_name, func_name = ref.split(":")
+        module = importlib.import_module(f".{module_name}", __package__)
+        impl = getattr(module, func_name)
+        _resolved_impls[ref] = impl
+    return impl
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _dataflow_executor() -> ThreadPoolExecutor:
+    """Bounded pool for blocking implementations called from route_to_vendor_async.
+
+    It is separate from the event loop's default executor, so slow vendors
+    cannot starve other work that uses asyncio.to_thread.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=get_config().get("dataflow_executor_workers", 16),
+                thread_name_prefix="dataflow",
+            )
+        return _executor
+
+
+async def call_vendor_impl_async(ref, impl, args, kwargs):
+    """Await an implementation's coroutine variant, or run it on the dataflow executor."""
+    async_ref = ASYNC_IMPLS.get(ref) if isinstance(ref, str) else None
+    if async_ref is not None:
+        return await resolve_vendor_impl(async_ref)(*args, **kwargs)
+
+    context = contextvars.copy_context()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _dataflow_executor(), functools.partial(context.run, impl, *args, **kwargs)
+    )
+
+
+def _is_rate_limit_error(error: Exception) -> bool:
+    """Check for an Alpha Vantage rate limit without importing the vendor eagerly."""
+    module = sys.modules.get(f"{__package__}.alpha_vantage_common")
+    return module is not None and isinstance(error, module.AlphaVantageRateLimitError)
+
+def _is_error_result(result) -> bool:
+    """Check for the "Error ..." strings some implementations return instead of raising."""
+    return isinstance(result, str) and result.lstrip().startswith("Error")
+
+
 def get_category_for_method(method: str) -> str:
     """Get the category that contains the specified method."""
     for category, info in TOOLS_CATEGORIES.items():
@@ -138,8 +234,29 @@ def get_vendor(category: str, method: str = None) -> str:
     # Fall back to category-level configuration
     return config.get("data_vendors", {}).get(category, "default")
 
-def route_to_vendor(method: str, *args, **kwargs):
-    """Route method calls to appropriate vendor implementation with fallback support."""
+def method_available(method: str, config=None) -> bool:
+    """Whether routing can reach an implementation of method under a vendor config.
+
+    Always true with vendor_fallback on; otherwise one of the method's
+    configured vendors must implement it. Defaults to the current config.
+    """
+    config = get_config() if config is None else config
+    if config.get("vendor_fallback", True):
+        return True
+    category = get_category_for_method(method)
+    vendor_config = config.get("tool_vendors", {}).get(method)
+    if vendor_config is None:
+        vendor_config = config.get("data_vendors", {}).get(category, "default")
+    vendors = [v.strip() for v in vendor_config.split(',')]
+    return "snapshot" in vendors or any(v in VENDOR_METHODS[method] for v in vendors)
+
+def _route(method: str, args, kwargs):
+    """Routing and fallback logic shared by route_to_vendor and route_to_vendor_async.
+
+    A generator that yields (ref, implementation) for every implementation to
+    try and receives back (result, error) from the caller, which decides how
+    to call it; the routed output is the generator's return value.
+    """
     category = get_category_for_method(method)
     vendor_config = get_vendor(category, method)
 
@@ -149,14 +266,22 @@ def route_to_vendor(method: str, *args, **kwargs):
     if method not in VENDOR_METHODS:
         raise ValueError(f"Method '{method}' not supported")
 
+    # The snapshot vendor replays a recorded bundle and never falls back, so a
+    # replayed run cannot silently reach the network
+    if "snapshot" in primary_vendors:
+        print(f"DEBUG: {method} - Serving from snapshot bundle")
+        return get_snapshot_bundle().get(method, args, kwargs)
+
     # Get all available vendors for this method for fallback
     all_available_vendors = list(VENDOR_METHODS[method].keys())
     
     # Create fallback vendor list: primary vendors first, then remaining vendors as fallbacks
+    # (unless vendor_fallback is off, which keeps the run on its configured vendors)
     fallback_vendors = primary_vendors.copy()
-    for vendor in all_available_vendors:
-        if vendor not in fallback_vendors:
-            fallback_vendors.append(vendor)
+    if get_config().get("vendor_fallback", True):
+        for vendor in all_available_vendors:
+            if vendor not in fallback_vendors:
+                fallback_vendors.append(vendor)
 
     # Debug: Print fallback ordering
     primary_str = " → ".join(primary_vendors)
@@ -168,6 +293,9 @@ def route_to_vendor(method: str, *args, **kwargs):
     vendor_attempt_count = 0
     any_primary_vendor_attempted = False
     successful_vendor = None
+    skipped_vendors = []
+    error_result = None
+    use_breakers = circuit_breaker_enabled()
 
     for vendor in fallback_vendors:
         if vendor not in VENDOR_METHODS[method]:
@@ -175,7 +303,14 @@ def route_to_vendor(method: str, *args, **kwargs):
                 print(f"INFO: Vendor '{vendor}' not supported for method '{method}', falling back to next vendor")
             continue
 
-        vendor_impl = VENDOR_METHODS[method][vendor]
+        # Vendors whose circuit is open are skipped without being called
+        breaker = get_breaker(vendor, method) if use_breakers else None
+        if breaker is not None and not breaker.allow():
+            print(f"DEBUG: Skipping vendor '{vendor}' for {method} (circuit open, probe in {breaker.retry_in():.0f}s)")
+            skipped_vendors.append(vendor)
+            continue
+
+        vendor_ref = VENDOR_METHODS[method][vendor]
         is_primary_vendor = vendor in primary_vendors
         vendor_attempt_count += 1
 
@@ -188,31 +323,58 @@ def route_to_vendor(method: str, *args, **kwargs):
         print(f"DEBUG: Attempting {vendor_type} vendor '{vendor}' for {method} (attempt #{vendor_attempt_count})")
 
         # Handle list of methods for a vendor
-        if isinstance(vendor_impl, list):
-            vendor_methods = [(impl, vendor) for impl in vendor_impl]
+        if isinstance(vendor_ref, list):
+            vendor_methods = [(ref, vendor) for ref in vendor_ref]
             print(f"DEBUG: Vendor '{vendor}' has multiple implementations: {len(vendor_methods)} functions")
         else:
-            vendor_methods = [(vendor_impl, vendor)]
+            vendor_methods = [(vendor_ref, vendor)]
 
         # Run methods for this vendor
         vendor_results = []
-        for impl_func, vendor_name in vendor_methods:
-            try:
-                print(f"DEBUG: Calling {impl_func.__name__} from vendor '{vendor_name}'...")
-                result = impl_func(*args, **kwargs)
-                vendor_results.append(result)
-                print(f"SUCCESS: {impl_func.__name__} from vendor '{vendor_name}' completed successfully")
-                    
-            except AlphaVantageRateLimitError as e:
-                if vendor == "alpha_vantage":
-                    print(f"RATE_LIMIT: Alpha Vantage rate limit exceeded, falling back to next available vendor")
-                    print(f"DEBUG: Rate limit details: {e}")
-                # Continue to next vendor for fallback
-                continue
-            except Exception as e:
-                # Log error but continue with other implementations
-                print(f"FAILED: {impl_func.__name__} from vendor '{vendor_name}' failed: {e}")
-                continue
+        last_error = None
+        settled = False
+        try:
+            for impl_ref, vendor_name in vendor_methods:
+                impl_name = impl_ref
+                try:
+                    impl_func = resolve_vendor_impl(impl_ref)
+                    impl_name = impl_func.__name__
+                    print(f"DEBUG: Calling {impl_name} from vendor '{vendor_name}'...")
+                    result, error = yield impl_ref, impl_func
+                    if error is not None:
+                        raise error
+                    if _is_error_result(result):
+                        # Counted as a failure, but kept as the answer of last resort
+                        last_error = result
+                        error_result = result
+                        print(f"FAILED: {impl_name} from vendor '{vendor_name}' returned an error: {result}")
+                        continue
+                    vendor_results.append(result)
+                    print(f"SUCCESS: {impl_name} from vendor '{vendor_name}' completed successfully")
+
+                except Exception as e:
+                    last_error = f"{type(e).__name__}: {e}"
+                    if _is_rate_limit_error(e):
+                        if vendor == "alpha_vantage":
+                            print(f"RATE_LIMIT: Alpha Vantage rate limit exceeded, falling back to next available vendor")
+                            print(f"DEBUG: Rate limit details: {e}")
+                        # Continue to next vendor for fallback
+                        continue
+                    # Log error but continue with other implementations
+                    print(f"FAILED: {impl_name} from vendor '{vendor_name}' failed: {e}")
+                    continue
+
+            if breaker is not None:
+                if vendor_results:
+                    breaker.record_success()
+                else:
+                    breaker.record_failure(last_error)
+                settled = True
+        finally:
+            # The caller abandoned the call (closed or cancelled), so hand back a
+            # half-open probe rather than leaving the breaker waiting on it
+            if breaker is not None and not settled:
+                breaker.release()
 
         # Add this vendor's results
         if vendor_results:
@@ -232,13 +394,126 @@ def route_to_vendor(method: str, *args, **kwargs):
     # Final result summary
     if not results:
         print(f"FAILURE: All {vendor_attempt_count} vendor attempts failed for method '{method}'")
+        if error_result is not None:
+            return error_result
+        if skipped_vendors:
+            raise RuntimeError(
+                f"All vendor implementations failed for method '{method}' "
+                f"(circuit open for: {', '.join(skipped_vendors)})"
+            )
         raise RuntimeError(f"All vendor implementations failed for method '{method}'")
     else:
         print(f"FINAL: Method '{method}' completed with {len(results)} result(s) from {vendor_attempt_count} vendor attempt(s)")
 
     # Return single result if only one, otherwise concatenate as string
     if len(results) == 1:
-        return results[0]
+        output = results[0]
     else:
         # Convert all results to strings and concatenate
-        return '\n'.join(str(result) for result in results)
\ No newline at end of file
+        output = '\n'.join(str(result) for result in results)
+
+    recorder = get_recorder()
+    if recorder is not None:
+        recorder.record(method, args, kwargs, output, vendor=successful_vendor)
+    return output
+
+
+def route_to_vendor(method: str, *args, **kwargs):
+    """Route method calls to appropriate vendor implementation with fallback support."""
+    routing = _route(method, args, kwargs)
+    outcome = None
+    try:
+        while True:
+            try:
+                _, impl = routing.send(outcome)
+            except StopIteration as done:
+                return done.value
+            try:
+                outcome = (impl(*args, **kwargs), None)
+            except Exception as e:
+                outcome = (None, e)
+    finally:
+        routing.close()
+
+
+async def route_to_vendor_async(method: str, *args, **kwargs):
+    """Async variant of route_to_vendor, with the same vendor order, fallbacks and breakers.
+
+    Implementations listed in ASYNC_IMPLS are awaited on the caller's event
+    loop; the others are blocking (pandas, yfinance, scraping) and run on the
+    shared dataflow executor, so the event loop is never blocked.
+    """
+    routing = _route(method, args, kwargs)
+    outcome = None
+    try:
+        while True:
+            try:
+                ref, impl = routing.send(outcome)
+            except StopIteration as done:
+                return done.value
+            try:
+                outcome = (await call_vendor_impl_async(ref, impl, args, kwargs), None)
+            except Exception as e:
+                outcome = (None, e)
+    finally:
+        # On cancellation this releases any circuit breaker probe the call holds
+        routing.close()
+
+
+def route_to_vendor_stream(method: str, *args, **kwargs) -> Iterator[str]:
+    """Streaming variant of route_to_vendor, yielding the routed output in chunks.
+
+    Vendor order, fallbacks, breakers and snapshot recording are those of
+    route_to_vendor, and the chunks join to its output. Implementations listed
+    in STREAMING_IMPLS yield as their data is read, the others yield their
+    result once. An implementation that fails after some of its output was
+    yielded cannot fall back, so its error is raised to the caller.
+    """
+    routing = _route(method, args, kwargs)
+    outcome = None
+    # Whether a result is part of the output yet; later results are preceded by
+    # the separator route_to_vendor puts between results
+    accepted = False
+    try:
+        while True:
+            try:
+                ref, impl = routing.send(outcome)
+            except StopIteration as done:
+                # Snapshot replays and errors of last resort are never streamed
+                if not accepted:
+                    yield done.value
+                return
+
+            stream_ref = STREAMING_IMPLS.get(ref) if isinstance(ref, str) else None
+            if stream_ref is None:
+                try:
+                    result = impl(*args, **kwargs)
+                except Exception as e:
+                    outcome = (None, e)
+                    continue
+                if not _is_error_result(result):
+                    if accepted:
+                        yield "\n"
+                    yield str(result)
+                    accepted = True
+                outcome = (result, None)
+                continue
+
+            chunks = []
+            try:
+                for chunk in resolve_vendor_impl(stream_ref)(*args, **kwargs):
+                    if not chunks and accepted:
+                        yield "\n"
+                    chunks.append(chunk)
+                    yield chunk
+            except Exception as e:
+                if chunks:
+                    raise
+                outcome = (None, e)
+                continue
+            if not chunks and accepted:
+                yield "\n"
+            accepted = True
+            outcome = ("".join(chunks), None)
+    finally:
+        routing.close()
@@ -0,0 +1,453 @@
+"""Process-wide LLM clients and per-provider adaptive concurrency limits.
+
+Chat models and SDK clients are created once per (provider, base_url, model)
+and shared by every graph and dataflow in the process, so they reuse one
+connection pool per provider endpoint instead of opening one per graph or
+per call.
+
+All HTTP requests to an endpoint go through a shared httpx client whose
+transport holds a slot of that endpoint's AdaptiveLimiter until the response
+is closed, so streamed and large bodies count against the limit while they
+are read. Async connections belong to one event loop, so the async transport
+keeps a connection pool per running loop and the shared async clients work
+across successive asyncio.run calls. The limiter follows AIMD: each successful request raises the
+concurrency limit by 1/limit (about +1 per round of requests), and a 429
+response multiplies it by `backoff` (at most once per `decrease_interval`) and
+holds new requests back for the response's Retry-After. Because the SDKs'
+own retries go through the same transport, every 429 is seen.
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, Tuple
+
+from tradingagents.default_config import DEFAULT_CONFIG
+
+from .config import get_config
+
+
+def _settings() -> dict:
+    settings = DEFAULT_CONFIG["llm_pool"].copy()
+    settings.update(get_config().get("llm_pool") or {})
+    return settings
+
+
+class AdaptiveLimiter:
+    """Thread-safe AIMD concurrency limiter for one provider endpoint."""
+
+    def __init__(
+        self,
+        initial: float = 8,
+        minimum: float = 1,
+        maximum: float = 32,
+        backoff: float = 0.5,
+        decrease_interval: float = 1.0,
+    ):
+        """Initialize the limiter.
+
+        Args:
+            initial: Concurrent requests allowed at first
+            minimum: Lower bound of the limit after repeated 429s
+            maximum: Upper bound the limit grows to while requests succeed
+            backoff: Factor the limit is multiplied by on a 429
+            decrease_interval: Seconds within which further 429s, typically
+                from requests already in flight, do not shrink the limit again
+        """
+        self.minimum = max(1.0, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.backoff = backoff
+        self.decrease_interval = decrease_interval
+        self.limit = min(max(float(initial), self.minimum), self.maximum)
+
+        self._cond = threading.Condition()
+        # (loop, future) of coroutines waiting in aacquire, woken on release
+        self._waiters = []
+        self._in_flight = 0
+        self._blocked_until = 0.0
+        self._last_decrease = 0.0
+        self._requests = 0
+        self._throttled = 0
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        with self._cond:
+            while True:
+                wait = self._blocked_until - time.monotonic()
+                if wait <= 0 and self._in_flight < int(self.limit):
+                    break
+                self._cond.wait(timeout=wait if wait > 0 else None)
+            self._in_flight += 1
+
+    async def aacquire(self):
+        """Wait on the running event loop until a request may be sent.
+
+        No thread is held while waiting, and a wait that is cancelled (e.g.
+        by asyncio.wait_for) never takes a slot, so it cannot leak one.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                wait = self._blocked_until - time.monotonic()
+                if wait <= 0 and self._in_flight < int(self.limit):
+                    self._in_flight += 1
+                    return
+                waiter = loop.create_future()
+                self._waiters.append((loop, waiter))
+            try:
+                await asyncio.wait([waiter], timeout=wait if wait > 0 else None)
+            finally:
+                with self._cond:
+                    if (loop, waiter) in self._waiters:
+                        self._waiters.remove((loop, waiter))
+
+    def _wake_waiters(self):
+        """Wake the coroutines waiting in aacquire; called with the condition held."""
+        for loop, waiter in self._waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve, waiter)
+            except RuntimeError:
+                pass  # The waiter's loop is closed
+        self._waiters.clear()
+
+    def release(self, throttled: bool = False, retry_after: Optional[float] = None):
+        """Return a slot and adapt the limit to the request's outcome."""
+        with self._cond:
+            self._in_flight -= 1
+            self._requests += 1
+            now = time.monotonic()
+            if throttled:
+                self._throttled += 1
+                if now - self._last_decrease >= self.decrease_interval:
+                    self.limit = max(self.minimum, self.limit * self.backoff)
+                    self._last_decrease = now
+                if retry_after:
+                    self._blocked_until = max(self._blocked_until, now + retry_after)
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+            self._wake_waiters()
+
+    @contextmanager
+    def slot(self):
+        """Hold a slot for a request that is not rate limited by the provider."""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def status(self) -> dict:
+        """Snapshot of the limiter for reporting."""
+        with self._cond:
+            return {
+                "limit": round(self.limit, 2),
+                "in_flight": self._in_flight,
+                "requests": self._requests,
+                "throttled": self._throttled,
+                "blocked_for": round(max(0.0, self._blocked_until - time.monotonic()), 1),
+            }
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+def _retry_after(response) -> Optional[float]:
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class _SlotRelease:
+    """Returns a limiter slot once, with the outcome of the response that held it."""
+
+    def __init__(self, limiter: AdaptiveLimiter):
+        self.limiter = limiter
+        self.throttled = False
+        self.retry_after: Optional[float] = None
+        self._released = False
+
+    def observe(self, response):
+        if response.status_code == 429:
+            self.throttled, self.retry_after = True, _retry_after(response)
+
+    def __call__(self):
+        if not self._released:
+            self._released = True
+            self.limiter.release(self.throttled, self.retry_after)
+
+
+_stream_types = None
+
+
+def _releasing_streams():
+    """httpx byte stream wrappers that release a slot when the response is closed."""
+    global _stream_types
+    if _stream_types is None:
+        import httpx
+
+        class ReleasingStream(httpx.SyncByteStream):
+            def __init__(self, stream, release: _SlotRelease):
+                self.stream = stream
+                self.release = release
+
+            def __iter__(self):
+                for chunk in self.stream:
+                    yield chunk
+
+            def close(self):
+                try:
+                    self.stream.close()
+                finally:
+                    self.release()
+
+        class AsyncReleasingStream(httpx.AsyncByteStream):
+            def __init__(self, stream, release: _SlotRelease):
+                self.stream = stream
+                self.release = release
+
+            async def __aiter__(self):
+                async for chunk in self.stream:
+                    yield chunk
+
+            async def aclose(self):
+                try:
+                    await self.stream.aclose()
+                finally:
+                    self.release()
+
+        _stream_types = (ReleasingStream, AsyncReleasingStream)
+    return _stream_types
+
+
+class _LimitedTransport:
+    """httpx transport wrapper that holds a limiter slot from each request until its response is closed."""
+
+    def __init__(self, transport, limiter: AdaptiveLimiter):
+        self.transport = transport
+        self.limiter = limiter
+
+    def handle_request(self, request):
+        self.limiter.acquire()
+        release = _SlotRelease(self.limiter)
+        try:
+            response = self.transport.handle_request(request)
+            release.observe(response)
+            response.stream = _releasing_streams()[0](response.stream, release)
+            return response
+        except BaseException:
+            release()
+            raise
+
+    def close(self):
+        self.transport.close()
+
+    def __enter__(self):
+        self.transport.__enter__()
+        return self
+
+    def __exit__(self, *args):
+        self.transport.__exit__(*args)
+
+
+class _AsyncLimitedTransport:
+    """Async counterpart of _LimitedTransport, with one inner transport per event loop.
+
+    Connections cannot be shared between event loops, so each running loop
+    gets its own connection pool from `transport_factory`; pools of closed
+    loops are dropped. Slots are awaited on the event loop (aacquire), so a
+    cancelled request never holds one.
+    """
+
+    def __init__(self, transport_factory: Callable[[], object], limiter: AdaptiveLimiter):
+        self.transport_factory = transport_factory
+        self.limiter = limiter
+        self._transports: Dict[asyncio.AbstractEventLoop, object] = {}
+        self._transports_lock = threading.Lock()
+
+    def _transport(self):
+        loop = asyncio.get_running_loop()
+        with self._transports_lock:
+            transport = self._transports.get(loop)
+            if transport is None:
+                for other in [other for other in self._transports if other.is_closed()]:
+                    del self._transports[other]
+                transport = self.transport_factory()
+                self._transports[loop] = transport
+            return transport
+
+    async def handle_async_request(self, request):
+        transport = self._transport()
+        await self.limiter.aacquire()
+        release = _SlotRelease(self.limiter)
+        try:
+            response = await transport.handle_async_request(request)
+            release.observe(response)
+            response.stream = _releasing_streams()[1](response.stream, release)
+            return response
+        except BaseException:
+            release()
+            raise
+
+    async def aclose(self):
+        loop = asyncio.get_running_loop()
+        with self._transports_lock:
+            transport = self._transports.pop(loop, None)
+        if transport is not None:
+            await transport.aclose()
+
+    async def __aenter__(self):
+        await self._transport().__aenter__()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+
+_lock = threading.RLock()
+_limiters: Dict[Tuple[str, str], AdaptiveLimiter] = {}
+_http_clients: Dict[Tuple[str, str], tuple] = {}
+_clients: Dict[tuple, object] = {}
+
+
+def _endpoint(provider: str, base_url: Optional[str]) -> Tuple[str, str]:
+    return provider.lower(), (base_url or "").rstrip("/")
+
+
+def get_limiter(provider: str, base_url: Optional[str] = None) -> AdaptiveLimiter:
+    """Get the process-wide limiter of a provider endpoint, creating it on first use."""
+    key = _endpoint(provider, base_url)
+    with _lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            settings = _settings()
+            limiter = AdaptiveLimiter(
+                initial=settings["initial_concurrency"],
+                minimum=settings["min_concurrency"],
+                maximum=settings["max_concurrency"],
+                backoff=settings["backoff"],
+                decrease_interval=settings["decrease_interval"],
+            )
+            _limiters[key] = limiter
+        return limiter
+
+
+def get_http_clients(provider: str, base_url: Optional[str] = None):
+    """Shared (sync, async) httpx clients of a provider endpoint, rate limited by its limiter.
+
+    The async client can be used from any event loop: its transport opens a
+    separate connection pool per running loop.
+    """
+    key = _endpoint(provider, base_url)
+    with _lock:
+        clients = _http_clients.get(key)
+        if clients is None:
+            import httpx
+
+            settings = _settings()
+            limiter = get_limiter(provider, base_url)
+            limits = httpx.Limits(
+                max_connections=settings["max_connections"],
+                max_keepalive_connections=settings["max_connections"],
+            )
+            timeout = httpx.Timeout(settings["timeout"], connect=10.0)
+            clients = (
+                httpx.Client(
+                    transport=_LimitedTransport(httpx.HTTPTransport(limits=limits), limiter),
+                    timeout=timeout,
+                    follow_redirects=True,
+                ),
+                httpx.AsyncClient(
+                    transport=_AsyncLimitedTransport(
+                        lambda: httpx.AsyncHTTPTransport(limits=limits), limiter
+                    ),
+                    timeout=timeout,
+                    follow_redirects=True,
+                ),
+            )
+            _http_clients[key] = clients
+        return clients
+
+
+def _cached(key: tuple, factory: Callable[[], object]):
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = factory()
+            _clients[key] = client
+        return client
+
+
+def get_chat_model(
+    provider: str,
+    model: str,
+    base_url: Optional[str],
+    factory: Callable[[], object],
+    timeout: Optional[float] = None,
+):
+    """Return the shared chat model for (provider, base_url, model, timeout), built by `factory` on first use."""
+    return _cached(("chat",) + _endpoint(provider, base_url) + (model, timeout), factory)
+
+
+def get_openai_client(base_url: Optional[str] = None, api_key: Optional[str] = None, provider: str = "openai"):
+    """Shared OpenAI SDK client for an endpoint."""
+
+    def factory():
+        from openai import OpenAI
+
+        http_client, _ = get_http_clients(provider, base_url)
+        kwargs = {"api_key": api_key} if api_key else {}
+        return OpenAI(base_url=base_url, http_client=http_client, **kwargs)
+
+    return _cached(("openai",) + _endpoint(provider, base_url) + (api_key,), factory)
+
+
+def get_async_openai_client(base_url: Optional[str] = None, api_key: Optional[str] = None, provider: str = "openai"):
+    """Shared AsyncOpenAI SDK client for an endpoint, on the endpoint's async HTTP client.
+
+    Safe to reuse across event loops, since connections are pooled per loop
+    by the async client's transport.
+    """
+
+    def factory():
+        from openai import AsyncOpenAI
+
+        _, http_async_client = get_http_clients(provider, base_url)
+        kwargs = {"api_key": api_key} if api_key else {}
+        return AsyncOpenAI(base_url=base_url, http_client=http_async_client, **kwargs)
+
+    return _cached(("async_openai",) + _endpoint(provider, base_url) + (api_key,), factory)
+
+
+def get_anthropic_client(base_url: Optional[str] = None, api_key: Optional[str] = None, provider: str = "anthropic"):
+    """Shared Anthropic SDK client for an endpoint."""
+
+    def factory():
+        from anthropic import Anthropic
+
+        http_client, _ = get_http_clients(provider, base_url)
+        kwargs = {"api_key": api_key} if api_key else {}
+        return Anthropic(base_url=base_url, http_client=http_client, **kwargs)
+
+    return _cached(("anthropic",) + _endpoint(provider, base_url) + (api_key,), factory)
+
+
+def get_llm_pool_status() -> Dict[str, dict]:
+    """Limiter status of every provider endpoint that has been used, keyed "provider base_url"."""
+    with _lock:
+        items = sorted(_limiters.items())
+    return {f"{provider} {base_url}".strip(): limiter.status() for (provider, base_url), limiter in items}
+
+
+def reset_llm_pool():
+    """Close the shared HTTP clients and forget all clients and limiters."""
+    with _lock:
+        for http_client, _ in _http_clients.values():
+            http_client.close()
+        _http_clients.clear()
+        _clients.clear()
+        _limiters.clear()
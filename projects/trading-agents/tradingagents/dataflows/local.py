@@ -1,12 +1,45 @@
-from typing import Annotated
+from typing import Annotated, Iterator
 import pandas as pd
 import os
-from .config import DATA_DIR
+from .config import get_config
+from .output_encoding import encode_frame
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 import json
 from .reddit_utils import fetch_top_from_category
-from tqdm import tqdm
+from .utils import progress_bar
+
+
+def _data_dir() -> str:
+    """Resolve the local data directory from the active config at call time."""
+    return get_config()["data_dir"]
+
+
+def _price_data_path(symbol: str) -> str:
+    return os.path.join(
+        _data_dir(),
+        f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
+    )
+
+
+def get_local_price_history(
+    symbol: Annotated[str, "ticker symbol of the company"],
+) -> pd.DataFrame:
+    """
+    Load the full daily OHLCV history of a symbol from the local price store.
+    The Date column is normalized to yyyy-mm-dd strings and rows are sorted by date.
+    """
+    data = pd.read_csv(_price_data_path(symbol))
+    data["Date"] = data["Date"].astype(str).str[:10]
+    return data.sort_values("Date").reset_index(drop=True)
+
+
+def get_local_price_csv(
+    symbol: Annotated[str, "ticker symbol of the company"],
+) -> str:
+    """The full history of get_local_price_history as CSV text, oldest first."""
+    return get_local_price_history(symbol).to_csv(index=False)
+
 
 def get_YFin_data_window(
     symbol: Annotated[str, "ticker symbol of the company"],
@@ -19,12 +52,7 @@ def get_YFin_data_window(
     start_date = before.strftime("%Y-%m-%d")
 
     # read in data
-    data = pd.read_csv(
-        os.path.join(
-            DATA_DIR,
-            f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-        )
-    )
+    data = pd.read_csv(_price_data_path(symbol))
 
     # Extract just the date part for comparison
     data["DateOnly"] = data["Date"].str[:10]
@@ -37,15 +65,18 @@ def get_YFin_data_window(
     # Drop the temporary column we created
     filtered_data = filtered_data.drop("DateOnly", axis=1)
 
-    # Set pandas display options to show the full DataFrame
-    with pd.option_context(
-        "display.max_rows", None, "display.max_columns", None, "display.width", None
-    ):
-        df_string = filtered_data.to_string()
-
-    return (
-        f"## Raw Market Data for {symbol} from {start_date} to {curr_date}:\n\n"
-        + df_string
+    def full_table():
+        # Set pandas display options to show the full DataFrame
+        with pd.option_context(
+            "display.max_rows", None, "display.max_columns", None, "display.width", None
+        ):
+            return filtered_data.to_string()
+
+    return encode_frame(
+        filtered_data,
+        title=f"## Raw Market Data for {symbol} from {start_date} to {curr_date}:",
+        name="get_YFin_data_window",
+        raw=full_table,
     )
 
 def get_YFin_data(
@@ -54,12 +85,7 @@ def get_YFin_data(
     end_date: Annotated[str, "End date in yyyy-mm-dd format"],
 ) -> str:
     # read in data
-    data = pd.read_csv(
-        os.path.join(
-            DATA_DIR,
-            f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-        )
-    )
+    data = pd.read_csv(_price_data_path(symbol))
 
     if end_date > "2025-03-25":
         raise Exception(
@@ -80,7 +106,29 @@ def get_YFin_data(
     # remove the index from the dataframe
     filtered_data = filtered_data.reset_index(drop=True)
 
-    return filtered_data
+    return encode_frame(
+        filtered_data,
+        title=f"## Raw Market Data for {symbol} from {start_date} to {end_date}:",
+        name="get_YFin_data",
+        raw=filtered_data.to_string,
+    )
+
+def iter_finnhub_news(
+    query: Annotated[str, "Search query or ticker symbol"],
+    start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
+    end_date: Annotated[str, "End date in yyyy-mm-dd format"],
+) -> Iterator[str]:
+    """Yield the news report of get_finnhub_news chunk by chunk."""
+    result = get_data_in_range(query, start_date, end_date, "news_data", _data_dir())
+
+    if len(result) == 0:
+        return
+
+    yield f"## {query} News, from {start_date} to {end_date}:\n"
+    for day, data in result.items():
+        for entry in data:
+            yield f"### {entry['headline']} ({day})\n{entry['summary']}\n\n"
+
 
 def get_finnhub_news(
     query: Annotated[str, "Search query or ticker symbol"],
@@ -98,23 +146,7 @@ def get_finnhub_news(
         str: dataframe containing the news of the company in the time frame
 
     """
-
-    result = get_data_in_range(query, start_date, end_date, "news_data", DATA_DIR)
-
-    if len(result) == 0:
-        return ""
-
-    combined_result = ""
-    for day, data in result.items():
-        if len(data) == 0:
-            continue
-        for entry in data:
-            current_news = (
-                "### " + entry["headline"] + f" ({day})" + "\n" + entry["summary"]
-            )
-            combined_result += current_news + "\n\n"
-
-    return f"## {query} News, from {start_date} to {end_date}:\n" + str(combined_result)
+    return "".join(iter_finnhub_news(query, start_date, end_date))
 
 
 def get_finnhub_company_insider_sentiment(
@@ -134,18 +166,20 @@ def get_finnhub_company_insider_sentiment(
     before = date_obj - relativedelta(days=15)  # Default 15 days lookback
     before = before.strftime("%Y-%m-%d")
 
-    data = get_data_in_range(ticker, before, curr_date, "insider_senti", DATA_DIR)
+    data = get_data_in_range(ticker, before, curr_date, "insider_senti", _data_dir())
 
     if len(data) == 0:
         return ""
 
-    result_str = ""
     seen_dicts = []
     for date, senti_list in data.items():
         for entry in senti_list:
             if entry not in seen_dicts:
-                result_str += f"### {entry['year']}-{entry['month']}:\nChange: {entry['change']}\nMonthly Share Purchase Ratio: {entry['mspr']}\n\n"
                 seen_dicts.append(entry)
+    result_str = "".join(
+        f"### {entry['year']}-{entry['month']}:\nChange: {entry['change']}\nMonthly Share Purchase Ratio: {entry['mspr']}\n\n"
+        for entry in seen_dicts
+    )
 
     return (
         f"## {ticker} Insider Sentiment Data for {before} to {curr_date}:\n"
@@ -171,19 +205,20 @@ def get_finnhub_company_insider_transactions(
     before = date_obj - relativedelta(days=15)  # Default 15 days lookback
     before = before.strftime("%Y-%m-%d")
 
-    data = get_data_in_range(ticker, before, curr_date, "insider_trans", DATA_DIR)
+    data = get_data_in_range(ticker, before, curr_date, "insider_trans", _data_dir())
 
     if len(data) == 0:
         return ""
 
-    result_str = ""
-
     seen_dicts = []
     for date, senti_list in data.items():
         for entry in senti_list:
             if entry not in seen_dicts:
-                result_str += f"### Filing Date: {entry['filingDate']}, {entry['name']}:\nChange:{entry['change']}\nShares: {entry['share']}\nTransaction Price: {entry['transactionPrice']}\nTransaction Code: {entry['transactionCode']}\n\n"
                 seen_dicts.append(entry)
+    result_str = "".join(
+        f"### Filing Date: {entry['filingDate']}, {entry['name']}:\nChange:{entry['change']}\nShares: {entry['share']}\nTransaction Price: {entry['transactionPrice']}\nTransaction Code: {entry['transactionCode']}\n\n"
+        for entry in seen_dicts
+    )
 
     return (
         f"## {ticker} insider transactions from {before} to {curr_date}:\n"
@@ -233,7 +268,7 @@ def get_simfin_balance_sheet(
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
     data_path = os.path.join(
-        DATA_DIR,
+        _data_dir(),
         "fundamental_data",
         "simfin_data_all",
         "balance_sheet",
@@ -280,7 +315,7 @@ def get_simfin_cashflow(
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
     data_path = os.path.join(
-        DATA_DIR,
+        _data_dir(),
         "fundamental_data",
         "simfin_data_all",
         "cash_flow",
@@ -327,7 +362,7 @@ def get_simfin_income_statements(
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
     data_path = os.path.join(
-        DATA_DIR,
+        _data_dir(),
         "fundamental_data",
         "simfin_data_all",
         "income_statements",
@@ -365,6 +400,43 @@ def get_simfin_income_statements(
     )
 
 
+def _format_reddit_post(post: dict) -> str:
+    if post["content"] == "":
+        return f"### {post['title']}\n\n"
+    return f"### {post['title']}\n\n{post['content']}\n\n"
+
+
+def _date_range(start: datetime, end: datetime):
+    """List the days from start to end, inclusive."""
+    return [start + relativedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def iter_reddit_global_news(
+    curr_date: Annotated[str, "Current date in yyyy-mm-dd format"],
+    look_back_days: Annotated[int, "Number of days to look back"] = 7,
+    limit: Annotated[int, "Maximum number of articles to return"] = 5,
+) -> Iterator[str]:
+    """Yield the report of get_reddit_global_news chunk by chunk, one day of posts at a time."""
+    curr_date_dt = datetime.strptime(curr_date, "%Y-%m-%d")
+    before = curr_date_dt - relativedelta(days=look_back_days)
+    before = before.strftime("%Y-%m-%d")
+
+    header = f"## Global News Reddit, from {before} to {curr_date}:\n"
+    days = _date_range(datetime.strptime(before, "%Y-%m-%d"), curr_date_dt)
+    for day in progress_bar(days, desc=f"Getting Global News on {curr_date}"):
+        posts = fetch_top_from_category(
+            "global_news",
+            day.strftime("%Y-%m-%d"),
+            limit,
+            data_path=os.path.join(_data_dir(), "reddit_data"),
+        )
+        for post in posts:
+            if header:
+                yield header
+                header = None
+            yield _format_reddit_post(post)
+
+
 def get_reddit_global_news(
     curr_date: Annotated[str, "Current date in yyyy-mm-dd format"],
     look_back_days: Annotated[int, "Number of days to look back"] = 7,
@@ -379,43 +451,35 @@ def get_reddit_global_news(
     Returns:
         str: A formatted string containing the latest news articles posts on reddit
     """
+    return "".join(iter_reddit_global_news(curr_date, look_back_days, limit))
 
-    curr_date_dt = datetime.strptime(curr_date, "%Y-%m-%d")
-    before = curr_date_dt - relativedelta(days=look_back_days)
-    before = before.strftime("%Y-%m-%d")
-
-    posts = []
-    # iterate from before to curr_date
-    curr_iter_date = datetime.strptime(before, "%Y-%m-%d")
 
-    total_iterations = (curr_date_dt - curr_iter_date).days + 1
-    pbar = tqdm(desc=f"Getting Global News on {curr_date}", total=total_iterations)
+def iter_reddit_company_news(
+    query: Annotated[str, "Search query or ticker symbol"],
+    start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
+    end_date: Annotated[str, "End date in yyyy-mm-dd format"],
+) -> Iterator[str]:
+    """Yield the report of get_reddit_company_news chunk by chunk, one day of posts at a time."""
+    start_date_dt = datetime.strptime(start_date, "%Y-%m-%d")
+    end_date_dt = datetime.strptime(end_date, "%Y-%m-%d")
 
-    while curr_iter_date <= curr_date_dt:
-        curr_date_str = curr_iter_date.strftime("%Y-%m-%d")
-        fetch_result = fetch_top_from_category(
-            "global_news",
-            curr_date_str,
-            limit,
-            data_path=os.path.join(DATA_DIR, "reddit_data"),
+    header = f"##{query} News Reddit, from {start_date} to {end_date}:\n\n"
+    days = _date_range(start_date_dt, end_date_dt)
+    for day in progress_bar(
+        days, desc=f"Getting Company News for {query} from {start_date} to {end_date}"
+    ):
+        posts = fetch_top_from_category(
+            "company_news",
+            day.strftime("%Y-%m-%d"),
+            10,  # max limit per day
+            query,
+            data_path=os.path.join(_data_dir(), "reddit_data"),
         )
-        posts.extend(fetch_result)
-        curr_iter_date += relativedelta(days=1)
-        pbar.update(1)
-
-    pbar.close()
-
-    if len(posts) == 0:
-        return ""
-
-    news_str = ""
-    for post in posts:
-        if post["content"] == "":
-            news_str += f"### {post['title']}\n\n"
-        else:
-            news_str += f"### {post['title']}\n\n{post['content']}\n\n"
-
-    return f"## Global News Reddit, from {before} to {curr_date}:\n{news_str}"
+        for post in posts:
+            if header:
+                yield header
+                header = None
+            yield _format_reddit_post(post)
 
 
 def get_reddit_company_news(
@@ -432,44 +496,4 @@ def get_reddit_company_news(
     Returns:
         str: A formatted string containing news articles posts on reddit
     """
-
-    start_date_dt = datetime.strptime(start_date, "%Y-%m-%d")
-    end_date_dt = datetime.strptime(end_date, "%Y-%m-%d")
-
-    posts = []
-    # iterate from start_date to end_date
-    curr_date = start_date_dt
-
-    total_iterations = (end_date_dt - curr_date).days + 1
-    pbar = tqdm(
-        desc=f"Getting Company News for {query} from {start_date} to {end_date}",
-        total=total_iterations,
-    )
-
-    while curr_date <= end_date_dt:
-        curr_date_str = curr_date.strftime("%Y-%m-%d")
-        fetch_result = fetch_top_from_category(
-            "company_news",
-            curr_date_str,
-            10,  # max limit per day
-            query,
-            data_path=os.path.join(DATA_DIR, "reddit_data"),
-        )
-        posts.extend(fetch_result)
-        curr_date += relativedelta(days=1)
-
-        pbar.update(1)
-
-    pbar.close()
-
-    if len(posts) == 0:
-        return ""
-
-    news_str = ""
-    for post in posts:
-        if post["content"] == "":
-            news_str += f"### {post['title']}\n\n"
-        else:
-            news_str += f"### {post['title']}\n\n{post['content']}\n\n"
-
-    return f"##{query} News Reddit, from {start_date} to {end_date}:\n\n{news_str}"
\ No newline at end of file
+    return "".join(iter_reddit_company_news(query, start_date, end_date))
@@ -1,25 +1,10 @@
-import os
-from openai import OpenAI
-from anthropic import Anthropic
 from .config import get_config
+from .llm_pool import get_async_openai_client, get_openai_client
 
 
-def get_stock_news_openai(query, start_date, end_date):
-    config = get_config()
-    
-    # Handle MiniMax separately (uses Anthropic API)
-    if config.get("llm_provider", "").lower() == "minimax":
-        api_key = os.environ.get("MINIMAX_API_KEY", "")
-        client = Anthropic(base_url=config.get("backend_url"), api_key=api_key)
-        
-        # MiniMax may not support web_search_preview - return placeholder
-        # In production, you'd want to implement alternative search
-        return f"[MiniMax] Web search for {query} from {start_date} to {end_date} - feature pending implementation"
-    
-    # Standard OpenAI path
-    client = OpenAI(base_url=config["backend_url"])
-
-    response = client.responses.create(
+def _web_search_request(config, prompt):
+    """responses.create arguments of a web search with the quick thinking model."""
+    return dict(
         model=config["quick_think_llm"],
         input=[
             {
@@ -27,7 +12,7 @@ def get_stock_news_openai(query, start_date, end_date):
                 "content": [
                     {
                         "type": "input_text",
-                        "text": f"Can you search Social Media for {query} from {start_date} to {end_date}? Make sure you only get the data posted during that period.",
+                        "text": prompt,
                     }
                 ],
             }
@@ -47,92 +32,72 @@ def get_stock_news_openai(query, start_date, end_date):
         store=True,
     )
 
-    return response.output[1].content[0].text
-
 
-def get_global_news_openai(curr_date, look_back_days=7, limit=5):
+def _web_search(prompt, minimax_placeholder):
     config = get_config()
-    
+
     # Handle MiniMax separately (uses Anthropic API)
     if config.get("llm_provider", "").lower() == "minimax":
-        api_key = os.environ.get("MINIMAX_API_KEY", "")
-        client = Anthropic(base_url=config.get("backend_url"), api_key=api_key)
-        
-        return f"[MiniMax] Web search for global news from {look_back_days} days before {curr_date} - feature pending implementation"
-    
-    # Standard OpenAI path
-    client = OpenAI(base_url=config["backend_url"])
-
-    response = client.responses.create(
-        model=config["quick_think_llm"],
-        input=[
-            {
-                "role": "system",
-                "content": [
-                    {
-                        "type": "input_text",
-                        "text": f"Can you search global or macroeconomics news from {look_back_days} days before {curr_date} to {curr_date} that would be informative for trading purposes? Make sure you only get the data posted during that period. Limit the results to {limit} articles.",
-                    }
-                ],
-            }
-        ],
-        text={"format": {"type": "text"}},
-        reasoning={},
-        tools=[
-            {
-                "type": "web_search_preview",
-                "user_location": {"type": "approximate"},
-                "search_context_size": "low",
-            }
-        ],
-        temperature=1,
-        max_output_tokens=4096,
-        top_p=1,
-        store=True,
-    )
+        # MiniMax may not support web_search_preview - return placeholder
+        # In production, you'd want to implement alternative search
+        return minimax_placeholder
 
+    # Standard OpenAI path
+    client = get_openai_client(config["backend_url"], provider=config["llm_provider"])
+    response = client.responses.create(**_web_search_request(config, prompt))
     return response.output[1].content[0].text
 
 
-def get_fundamentals_openai(ticker, curr_date):
+async def _web_search_async(prompt, minimax_placeholder):
     config = get_config()
-    
-    # Handle MiniMax separately (uses Anthropic API)
     if config.get("llm_provider", "").lower() == "minimax":
-        api_key = os.environ.get("MINIMAX_API_KEY", "")
-        client = Anthropic(base_url=config.get("backend_url"), api_key=api_key)
-        
-        return f"[MiniMax] Web search for fundamentals on {ticker} - feature pending implementation"
-    
-    # Standard OpenAI path
-    client = OpenAI(base_url=config["backend_url"])
+        return minimax_placeholder
 
-    response = client.responses.create(
-        model=config["quick_think_llm"],
-        input=[
-            {
-                "role": "system",
-                "content": [
-                    {
-                        "type": "input_text",
-                        "text": f"Can you search Fundamental for discussions on {ticker} during of the month before {curr_date} to the month of {curr_date}. Make sure you only get the data posted during that period. List as a table, with PE/PS/Cash flow/ etc",
-                    }
-                ],
-            }
-        ],
-        text={"format": {"type": "text"}},
-        reasoning={},
-        tools=[
-            {
-                "type": "web_search_preview",
-                "user_location": {"type": "approximate"},
-                "search_context_size": "low",
-            }
-        ],
-        temperature=1,
-        max_output_tokens=4096,
-        top_p=1,
-        store=True,
+    client = get_async_openai_client(config["backend_url"], provider=config["llm_provider"])
+    response = await client.responses.create(**_web_search_request(config, prompt))
+    return response.output[1].content[0].text
+
+
+def _stock_news_search(query, start_date, end_date):
+    return (
+        f"Can you search Social Media for {query} from {start_date} to {end_date}? Make sure you only get the data posted during that period.",
+        f"[MiniMax] Web search for {query} from {start_date} to {end_date} - feature pending implementation",
     )
 
-    return response.output[1].content[0].text
+
+def _global_news_search(curr_date, look_back_days, limit):
+    return (
+        f"Can you search global or macroeconomics news from {look_back_days} days before {curr_date} to {curr_date} that would be informative for trading purposes? Make sure you only get the data posted during that period. Limit the results to {limit} articles.",
+        f"[MiniMax] Web search for global news from {look_back_days} days before {curr_date} - feature pending implementation",
+    )
+
+
+def _fundamentals_search(ticker, curr_date):
+    return (
+        f"Can you search Fundamental for discussions on {ticker} during of the month before {curr_date} to the month of {curr_date}. Make sure you only get the data posted during that period. List as a table, with PE/PS/Cash flow/ etc",
+        f"[MiniMax] Web search for fundamentals on {ticker} - feature pending implementation",
+    )
+
+
+def get_stock_news_openai(query, start_date, end_date):
+    return _web_search(*_stock_news_search(query, start_date, end_date))
+
+
+async def get_stock_news_openai_async(query, start_date, end_date):
+    return await _web_search_async(*_stock_news_search(query, start_date, end_date))
+
+
+def get_global_news_openai(curr_date, look_back_days=7, limit=5):
+    return _web_search(*_global_news_search(curr_date, look_back_days, limit))
+
+
+async def get_global_news_openai_async(curr_date, look_back_days=7, limit=5):
+    return await _web_search_async(*_global_news_search(curr_date, look_back_days, limit))
+
+
+def get_fundamentals_openai(ticker, curr_date):
+    return _web_search(*_fundamentals_search(ticker, curr_date))
+
+
+async def get_fundamentals_openai_async(ticker, curr_date):
+    return await _web_search_async(*_fundamentals_search(ticker, curr_date))
@@ -0,0 +1,179 @@
+"""Compact encodings for tabular tool outputs.
+
+Everything a dataflow function returns ends up in an LLM prompt, so tables are
+emitted as CSV with rounded floats, without non-trading-day filler rows, and
+optionally downsampled for long windows. Behaviour is controlled by the
+``output_encoding`` section of the config.
+"""
+
+from typing import Iterable, List, Optional, Tuple
+
+from tradingagents.default_config import DEFAULT_CONFIG
+
+from .config import get_config
+
+_tokenizer = None
+
+
+def _settings() -> dict:
+    settings = DEFAULT_CONFIG["output_encoding"].copy()
+    settings.update(get_config().get("output_encoding") or {})
+    return settings
+
+
+def _count_tokens(text: str) -> int:
+    """Count tokens with tiktoken when available, otherwise estimate ~4 chars per token."""
+    global _tokenizer
+    if _tokenizer is None:
+        try:
+            import tiktoken
+
+            _tokenizer = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _tokenizer = False
+    if _tokenizer:
+        return len(_tokenizer.encode(text, disallowed_special=()))
+    return len(text) // 4
+
+
+def report_savings(name: str, raw: str, encoded: str):
+    """Print how many bytes and tokens the encoding saved for one call."""
+    if not _settings()["report_savings"]:
+        return
+    raw_bytes = len(raw.encode("utf-8"))
+    encoded_bytes = len(encoded.encode("utf-8"))
+    tokens_saved = _count_tokens(raw) - _count_tokens(encoded)
+    print(
+        f"DEBUG: {name} output encoded {raw_bytes} -> {encoded_bytes} bytes "
+        f"({raw_bytes - encoded_bytes} saved, ~{tokens_saved} tokens saved)"
+    )
+
+
+def format_number(value, precision: int) -> str:
+    """Round a numeric value to `precision` decimals without trailing zeros."""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return str(value)
+    if number != number:  # NaN
+        return "N/A"
+    text = f"{number:.{precision}f}"
+    return text.rstrip("0").rstrip(".") if "." in text else text
+
+
+def _downsample(rows, max_rows: int):
+    """Keep every k-th row, anchored on the most recent one, so at most max_rows remain."""
+    count = len(rows)
+    if not max_rows or count <= max_rows:
+        return rows, 1
+    step = -(-count // max_rows)
+    keep = list(range(count - 1, -1, -step))[::-1]
+    if hasattr(rows, "iloc"):
+        return rows.iloc[keep], step
+    return [rows[i] for i in keep], step
+
+
+def encode_frame(
+    df,
+    title: Optional[str] = None,
+    name: Optional[str] = None,
+    index: bool = False,
+    precision: Optional[int] = None,
+    indicators: bool = False,
+    raw=None,
+) -> str:
+    """Encode a DataFrame as compact CSV.
+
+    With `trading_days_only`, rows without any numeric value (filler rows of
+    weekends and holidays) are dropped.
+
+    Args:
+        df: Frame to encode
+        title: Optional header line(s) placed above the table
+        name: Label used when reporting savings (usually the dataflow function)
+        index: Whether to include the index (e.g. line items of a financial statement)
+        precision: Decimal places for floats. Defaults to `float_precision`, or
+            `indicator_precision` when `indicators` is set
+        indicators: Whether the table holds technical indicator values
+        raw: The unencoded output (or a callable producing it) that savings
+            are measured against, and that is returned when encoding is
+            disabled. Defaults to the full-precision CSV of `df`
+    """
+    settings = _settings()
+    header = f"{title}\n\n" if title else ""
+
+    def unencoded() -> str:
+        if raw is None:
+            return df.to_csv(index=index)
+        return raw() if callable(raw) else raw
+
+    if not settings["enabled"]:
+        return header + unencoded()
+
+    if precision is None:
+        precision = settings["indicator_precision" if indicators else "float_precision"]
+    encoded_df = df
+    if settings["trading_days_only"]:
+        numeric = encoded_df.select_dtypes("number").columns
+        if len(numeric):
+            encoded_df = encoded_df.dropna(how="all", subset=numeric)
+    total = len(encoded_df)
+    encoded_df, step = _downsample(encoded_df, settings["max_rows"])
+    if step > 1:
+        header += f"# Downsampled to every {step} rows ({len(encoded_df)} of {total})\n"
+    encoded = header + encoded_df.round(precision).to_csv(index=index)
+
+    if settings["report_savings"] and name:
+        report_savings(name, header + unencoded(), encoded)
+    return encoded
+
+
+def encode_csv_text(csv_text: str, title: Optional[str] = None, name: Optional[str] = None) -> str:
+    """Re-encode CSV text returned by an API (e.g. Alpha Vantage) compactly."""
+    if not csv_text or not csv_text.strip() or not _settings()["enabled"]:
+        return csv_text
+    import pandas as pd
+    from io import StringIO
+
+    try:
+        df = pd.read_csv(StringIO(csv_text))
+    except Exception:
+        return csv_text
+    return encode_frame(df, title=title, name=name, raw=csv_text)
+
+
+def encode_series(
+    values: Iterable[Tuple[str, str]],
+    column: str,
+    title: Optional[str] = None,
+    name: Optional[str] = None,
+    missing: str = "N/A: Not a trading day (weekend or holiday)",
+) -> str:
+    """Encode (date, value) pairs, e.g. an indicator window, as a two-column CSV.
+
+    Dates whose value is `missing` are dropped when `trading_days_only` is set.
+    Numeric values are rounded to `indicator_precision` and rows are sorted by date.
+    """
+    values = list(values)
+    header = f"{title}\n\n" if title else ""
+    raw = header + "".join(f"{date}: {value}\n" for date, value in values)
+
+    settings = _settings()
+    if not settings["enabled"]:
+        return raw
+
+    precision = settings["indicator_precision"]
+    rows: List[Tuple[str, str]] = []
+    for date, value in sorted(values):
+        if settings["trading_days_only"] and value == missing:
+            continue
+        rows.append((date, format_number(value, precision)))
+
+    rows, step = _downsample(rows, settings["max_rows"])
+    if step > 1:
+        header += f"# Downsampled to every {step} rows\n"
+    encoded = header + f"Date,{column}\n" + "".join(f"{date},{value}\n" for date, value in rows)
+
+    if name:
+        report_savings(name, raw, encoded)
+    return encoded
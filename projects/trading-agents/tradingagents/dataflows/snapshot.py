@@ -0,0 +1,249 @@
+"""Point-in-time snapshot bundles of dataflow results.
+
+A bundle is a single zip archive. Every distinct result is stored once under
+``blobs/<sha256>`` and ``index.json`` maps each routed call (method plus
+arguments) to the blob it returned. While recording is active,
+route_to_vendor adds every successful result to the bundle. The ``snapshot``
+vendor serves calls exclusively from a bundle, so runs can be replayed with
+no network access and no DATA_DIR.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import zipfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import get_config
+
+INDEX_NAME = "index.json"
+BUNDLE_VERSION = 1
+
+
+class SnapshotMissError(Exception):
+    """Exception raised when a call is not present in the snapshot bundle."""
+    pass
+
+
+def call_key(method: str, args, kwargs) -> str:
+    """Canonical key of a routed call."""
+    return json.dumps([method, list(args), kwargs or {}], sort_keys=True, default=str)
+
+
+def _blob_name(digest: str) -> str:
+    return f"blobs/{digest}"
+
+
+class SnapshotBundle:
+    """Read-only view of a snapshot bundle."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._zip = zipfile.ZipFile(path, "r")
+        self.index = json.loads(self._zip.read(INDEX_NAME))
+        self._lock = threading.Lock()
+
+    @property
+    def calls(self) -> Dict[str, dict]:
+        return self.index["calls"]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.calls
+
+    def read_blob(self, digest: str) -> str:
+        with self._lock:
+            return self._zip.read(_blob_name(digest)).decode("utf-8")
+
+    def get(self, method: str, args=(), kwargs=None) -> str:
+        """Return the recorded result of a call, or raise SnapshotMissError."""
+        entry = self.calls.get(call_key(method, args, kwargs))
+        if entry is None:
+            raise SnapshotMissError(
+                f"{method}{tuple(args)} is not in snapshot {self.path}; "
+                f"record it with the `snapshot` CLI command"
+            )
+        return self.read_blob(entry["blob"])
+
+    def close(self):
+        self._zip.close()
+
+
+class SnapshotRecorder:
+    """Collects routed call results and writes them into a bundle.
+
+    Results are held in memory (deduplicated by content hash) and written on
+    save(). An existing bundle at `path` is extended, not replaced.
+    """
+
+    def __init__(self, path: str, meta: Optional[Dict[str, Any]] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._blobs: Dict[str, bytes] = {}
+        self._calls: Dict[str, dict] = {}
+        self._meta = dict(meta or {})
+        self._created = datetime.now().isoformat(timespec="seconds")
+        self._base: Optional[SnapshotBundle] = None
+
+        if os.path.exists(path):
+            self._base = SnapshotBundle(path)
+            self._calls.update(self._base.calls)
+            self._created = self._base.index.get("created", self._created)
+            self._meta = {**self._base.index.get("meta", {}), **self._meta}
+
+    def record(self, method: str, args, kwargs, result, vendor: Optional[str] = None):
+        data = str(result).encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        entry = {
+            "method": method,
+            "args": json.loads(json.dumps(list(args), default=str)),
+            "kwargs": json.loads(json.dumps(kwargs or {}, default=str)),
+            "blob": digest,
+            "vendor": vendor,
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        with self._lock:
+            self._blobs.setdefault(digest, data)
+            self._calls[call_key(method, args, kwargs)] = entry
+
+    def save(self) -> Dict[str, Any]:
+        """Write the bundle atomically and return a summary of its contents."""
+        with self._lock:
+            calls = dict(self._calls)
+            blobs = dict(self._blobs)
+
+        index = {
+            "version": BUNDLE_VERSION,
+            "created": self._created,
+            "updated": datetime.now().isoformat(timespec="seconds"),
+            "meta": self._meta,
+            "calls": calls,
+        }
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        written = set()
+        with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED) as out:
+            for entry in calls.values():
+                digest = entry["blob"]
+                if digest in written:
+                    continue
+                data = blobs.get(digest)
+                if data is None:
+                    data = self._base.read_blob(digest).encode("utf-8")
+                out.writestr(_blob_name(digest), data)
+                written.add(digest)
+            out.writestr(INDEX_NAME, json.dumps(index, indent=1, sort_keys=True))
+
+        if self._base is not None:
+            self._base.close()
+            self._base = None
+        # A bundle opened for replay holds the old file open (os.replace fails
+        # on Windows while it does), and would serve stale contents afterwards
+        with _bundles_lock:
+            cached = _bundles.pop(os.path.abspath(self.path), None)
+        if cached is not None:
+            cached.close()
+        os.replace(tmp_path, self.path)
+
+        return {
+            "path": self.path,
+            "calls": len(calls),
+            "blobs": len(written),
+            "bytes": os.path.getsize(self.path),
+        }
+
+
+_recorder: Optional[SnapshotRecorder] = None
+_recorder_lock = threading.Lock()
+_bundles: Dict[str, SnapshotBundle] = {}
+_bundles_lock = threading.Lock()
+
+
+def get_recorder() -> Optional[SnapshotRecorder]:
+    """The active recorder, if recording is in progress."""
+    return _recorder
+
+
+def start_recording(path: str, meta: Optional[Dict[str, Any]] = None) -> SnapshotRecorder:
+    """Start recording every routed dataflow result into the bundle at `path`."""
+    global _recorder
+    with _recorder_lock:
+        if _recorder is not None:
+            raise RuntimeError(f"Already recording a snapshot to {_recorder.path}")
+        _recorder = SnapshotRecorder(path, meta)
+        return _recorder
+
+
+def stop_recording() -> Optional[Dict[str, Any]]:
+    """Stop recording and write the bundle. Returns its summary."""
+    global _recorder
+    with _recorder_lock:
+        recorder, _recorder = _recorder, None
+    return recorder.save() if recorder is not None else None
+
+
+@contextmanager
+def recording(path: str, meta: Optional[Dict[str, Any]] = None):
+    """Record routed dataflow results into `path` for the duration of the block."""
+    recorder = start_recording(path, meta)
+    try:
+        yield recorder
+    finally:
+        stop_recording()
+
+
+def standard_calls(
+    ticker: str, trade_date: str, look_back_days: int = 30, news_days: int = 7
+) -> List[Tuple[str, tuple]]:
+    """The routed calls an analyst makes for (ticker, trade_date) with the tools' default arguments.
+
+    One (method, args) pair per method of VENDOR_METHODS, one get_indicators call
+    per indicator, so a bundle covers the common calls whatever a live
+    recording run happened to request. Arguments are positional, as the
+    tools pass them to route_to_vendor.
+    """
+    from .interface import VENDOR_METHODS
+    from .y_finance import INDICATOR_DESCRIPTIONS
+
+    day = datetime.strptime(trade_date, "%Y-%m-%d")
+    price_start = (day - timedelta(days=look_back_days)).strftime("%Y-%m-%d")
+    news_start = (day - timedelta(days=news_days)).strftime("%Y-%m-%d")
+    indicators = list(INDICATOR_DESCRIPTIONS)
+
+    calls = {
+        "get_stock_data": [(ticker, price_start, trade_date)],
+        "get_price_history": [(ticker,)],
+        "get_indicators": [
+            (ticker, indicator, trade_date, look_back_days) for indicator in indicators
+        ],
+        "get_indicators_batch": [(ticker, indicators, trade_date, look_back_days)],
+        "get_fundamentals": [(ticker, trade_date)],
+        "get_balance_sheet": [(ticker, "quarterly", trade_date)],
+        "get_cashflow": [(ticker, "quarterly", trade_date)],
+        "get_income_statement": [(ticker, "quarterly", trade_date)],
+        "get_news": [(ticker, news_start, trade_date)],
+        "get_global_news": [(trade_date, news_days, 5)],
+        "get_insider_sentiment": [(ticker, trade_date)],
+        "get_insider_transactions": [(ticker, trade_date)],
+    }
+    return [(method, args) for method in VENDOR_METHODS for args in calls.get(method, [])]
+
+
+def get_snapshot_bundle(path: Optional[str] = None) -> SnapshotBundle:
+    """Open (once per process) the bundle at `path`, or at the configured snapshot_path."""
+    path = path or get_config().get("snapshot_path")
+    if not path:
+        raise ValueError("The snapshot vendor requires `snapshot_path` to be set in the config")
+
+    key = os.path.abspath(path)
+    bundle = _bundles.get(key)
+    if bundle is None:
+        with _bundles_lock:
+            bundle = _bundles.get(key)
+            if bundle is None:
+                bundle = SnapshotBundle(path)
+                _bundles[key] = bundle
+    return bundle
@@ -1,9 +1,8 @@
 import pandas as pd
-import yfinance as yf
 from stockstats import wrap
 from typing import Annotated
 import os
-from .config import get_config, DATA_DIR
+from .config import get_config
 
 
 class StockstatsUtils:
@@ -28,7 +27,7 @@ class StockstatsUtils:
             try:
                 data = pd.read_csv(
                     os.path.join(
-                        DATA_DIR,
+                        config["data_dir"],
                         f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
                     )
                 )
@@ -57,6 +56,8 @@ class StockstatsUtils:
                 data = pd.read_csv(data_file)
                 data["Date"] = pd.to_datetime(data["Date"])
             else:
+                import yfinance as yf
+
                 data = yf.download(
                     symbol,
                     start=start_date,
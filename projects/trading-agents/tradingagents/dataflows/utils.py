@@ -1,4 +1,5 @@
 import os
+import sys
 import json
 import pandas as pd
 from datetime import date, timedelta, datetime
@@ -12,6 +13,19 @@ def save_output(data: pd.DataFrame, tag: str, save_path: SavePathType = None) ->
         print(f"{tag} saved to {save_path}")
 
 
+def progress_bar(iterable=None, **kwargs):
+    """Wrap `iterable` in a tqdm progress bar, disabled unless stderr is a TTY.
+
+    Non-interactive runs (batch jobs, logs redirected to a file) would otherwise
+    fill their output with progress bar redraws.
+    """
+    from tqdm import tqdm
+
+    if kwargs.get("disable") is None:
+        kwargs["disable"] = not sys.stderr.isatty()
+    return tqdm(iterable, **kwargs)
+
+
 def get_current_date():
     return date.today().strftime("%Y-%m-%d")
 
@@ -1,9 +1,9 @@
 from typing import Annotated
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
-import yfinance as yf
 import os
 from .stockstats_utils import StockstatsUtils
+from .output_encoding import encode_frame, encode_series
 
 def get_YFin_data_online(
     symbol: Annotated[str, "ticker symbol of the company"],
@@ -14,6 +14,8 @@ def get_YFin_data_online(
     datetime.strptime(start_date, "%Y-%m-%d")
     datetime.strptime(end_date, "%Y-%m-%d")
 
+    import yfinance as yf
+
     # Create ticker object
     ticker = yf.Ticker(symbol.upper())
 
@@ -36,15 +38,88 @@ def get_YFin_data_online(
         if col in data.columns:
             data[col] = data[col].round(2)
 
-    # Convert DataFrame to CSV string
-    csv_string = data.to_csv()
-
     # Add header information
     header = f"# Stock data for {symbol.upper()} from {start_date} to {end_date}\n"
     header += f"# Total records: {len(data)}\n"
-    header += f"# Data retrieved on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+    header += f"# Data retrieved on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+
+    return encode_frame(data, title=header, name="get_YFin_data_online", index=True)
+
+
+# Descriptions of the stockstats indicators the analysts may request
+INDICATOR_DESCRIPTIONS = {
+    # Moving Averages
+    "close_50_sma": (
+        "50 SMA: A medium-term trend indicator. "
+        "Usage: Identify trend direction and serve as dynamic support/resistance. "
+        "Tips: It lags price; combine with faster indicators for timely signals."
+    ),
+    "close_200_sma": (
+        "200 SMA: A long-term trend benchmark. "
+        "Usage: Confirm overall market trend and identify golden/death cross setups. "
+        "Tips: It reacts slowly; best for strategic trend confirmation rather than frequent trading entries."
+    ),
+    "close_10_ema": (
+        "10 EMA: A responsive short-term average. "
+        "Usage: Capture quick shifts in momentum and potential entry points. "
+        "Tips: Prone to noise in choppy markets; use alongside longer averages for filtering false signals."
+    ),
+    # MACD Related
+    "macd": (
+        "MACD: Computes momentum via differences of EMAs. "
+        "Usage: Look for crossovers and divergence as signals of trend changes. "
+        "Tips: Confirm with other indicators in low-volatility or sideways markets."
+    ),
+    "macds": (
+        "MACD Signal: An EMA smoothing of the MACD line. "
+        "Usage: Use crossovers with the MACD line to trigger trades. "
+        "Tips: Should be part of a broader strategy to avoid false positives."
+    ),
+    "macdh": (
+        "MACD Histogram: Shows the gap between the MACD line and its signal. "
+        "Usage: Visualize momentum strength and spot divergence early. "
+        "Tips: Can be volatile; complement with additional filters in fast-moving markets."
+    ),
+    # Momentum Indicators
+    "rsi": (
+        "RSI: Measures momentum to flag overbought/oversold conditions. "
+        "Usage: Apply 70/30 thresholds and watch for divergence to signal reversals. "
+        "Tips: In strong trends, RSI may remain extreme; always cross-check with trend analysis."
+    ),
+    # Volatility Indicators
+    "boll": (
+        "Bollinger Middle: A 20 SMA serving as the basis for Bollinger Bands. "
+        "Usage: Acts as a dynamic benchmark for price movement. "
+        "Tips: Combine with the upper and lower bands to effectively spot breakouts or reversals."
+    ),
+    "boll_ub": (
+        "Bollinger Upper Band: Typically 2 standard deviations above the middle line. "
+        "Usage: Signals potential overbought conditions and breakout zones. "
+        "Tips: Confirm signals with other tools; prices may ride the band in strong trends."
+    ),
+    "boll_lb": (
+        "Bollinger Lower Band: Typically 2 standard deviations below the middle line. "
+        "Usage: Indicates potential oversold conditions. "
+        "Tips: Use additional analysis to avoid false reversal signals."
+    ),
+    "atr": (
+        "ATR: Averages true range to measure volatility. "
+        "Usage: Set stop-loss levels and adjust position sizes based on current market volatility. "
+        "Tips: It's a reactive measure, so use it as part of a broader risk management strategy."
+    ),
+    # Volume-Based Indicators
+    "vwma": (
+        "VWMA: A moving average weighted by volume. "
+        "Usage: Confirm trends by integrating price action with volume data. "
+        "Tips: Watch for skewed results from volume spikes; use in combination with other volume analyses."
+    ),
+    "mfi": (
+        "MFI: The Money Flow Index is a momentum indicator that uses both price and volume to measure buying and selling pressure. "
+        "Usage: Identify overbought (>80) or oversold (<20) conditions and confirm the strength of trends or reversals. "
+        "Tips: Use alongside RSI or MACD to confirm signals; divergence between price and MFI can indicate potential reversals."
+    ),
+}
 
-    return header + csv_string
 
 def get_stock_stats_indicators_window(
     symbol: Annotated[str, "ticker symbol of the company"],
@@ -55,78 +130,7 @@ def get_stock_stats_indicators_window(
     look_back_days: Annotated[int, "how many days to look back"],
 ) -> str:
 
-    best_ind_params = {
-        # Moving Averages
-        "close_50_sma": (
-            "50 SMA: A medium-term trend indicator. "
-            "Usage: Identify trend direction and serve as dynamic support/resistance. "
-            "Tips: It lags price; combine with faster indicators for timely signals."
-        ),
-        "close_200_sma": (
-            "200 SMA: A long-term trend benchmark. "
-            "Usage: Confirm overall market trend and identify golden/death cross setups. "
-            "Tips: It reacts slowly; best for strategic trend confirmation rather than frequent trading entries."
-        ),
-        "close_10_ema": (
-            "10 EMA: A responsive short-term average. "
-            "Usage: Capture quick shifts in momentum and potential entry points. "
-            "Tips: Prone to noise in choppy markets; use alongside longer averages for filtering false signals."
-        ),
-        # MACD Related
-        "macd": (
-            "MACD: Computes momentum via differences of EMAs. "
-            "Usage: Look for crossovers and divergence as signals of trend changes. "
-            "Tips: Confirm with other indicators in low-volatility or sideways markets."
-        ),
-        "macds": (
-            "MACD Signal: An EMA smoothing of the MACD line. "
-            "Usage: Use crossovers with the MACD line to trigger trades. "
-            "Tips: Should be part of a broader strategy to avoid false positives."
-        ),
-        "macdh": (
-            "MACD Histogram: Shows the gap between the MACD line and its signal. "
-            "Usage: Visualize momentum strength and spot divergence early. "
-            "Tips: Can be volatile; complement with additional filters in fast-moving markets."
-        ),
-        # Momentum Indicators
-        "rsi": (
-            "RSI: Measures momentum to flag overbought/oversold conditions. "
-            "Usage: Apply 70/30 thresholds and watch for divergence to signal reversals. "
-            "Tips: In strong trends, RSI may remain extreme; always cross-check with trend analysis."
-        ),
-        # Volatility Indicators
-        "boll": (
-            "Bollinger Middle: A 20 SMA serving as the basis for Bollinger Bands. "
-            "Usage: Acts as a dynamic benchmark for price movement. "
-            "Tips: Combine with the upper and lower bands to effectively spot breakouts or reversals."
-        ),
-        "boll_ub": (
-            "Bollinger Upper Band: Typically 2 standard deviations above the middle line. "
-            "Usage: Signals potential overbought conditions and breakout zones. "
-            "Tips: Confirm signals with other tools; prices may ride the band in strong trends."
-        ),
-        "boll_lb": (
-            "Bollinger Lower Band: Typically 2 standard deviations below the middle line. "
-            "Usage: Indicates potential oversold conditions. "
-            "Tips: Use additional analysis to avoid false reversal signals."
-        ),
-        "atr": (
-            "ATR: Averages true range to measure volatility. "
-            "Usage: Set stop-loss levels and adjust position sizes based on current market volatility. "
-            "Tips: It's a reactive measure, so use it as part of a broader risk management strategy."
-        ),
-        # Volume-Based Indicators
-        "vwma": (
-            "VWMA: A moving average weighted by volume. "
-            "Usage: Confirm trends by integrating price action with volume data. "
-            "Tips: Watch for skewed results from volume spikes; use in combination with other volume analyses."
-        ),
-        "mfi": (
-            "MFI: The Money Flow Index is a momentum indicator that uses both price and volume to measure buying and selling pressure. "
-            "Usage: Identify overbought (>80) or oversold (<20) conditions and confirm the strength of trends or reversals. "
-            "Tips: Use alongside RSI or MACD to confirm signals; divergence between price and MFI can indicate potential reversals."
-        ),
-    }
+    best_ind_params = INDICATOR_DESCRIPTIONS
 
     if indicator not in best_ind_params:
         raise ValueError(
@@ -157,23 +161,21 @@ def get_stock_stats_indicators_window(
             date_values.append((date_str, indicator_value))
             current_dt = current_dt - relativedelta(days=1)
         
-        # Build the result string
-        ind_string = ""
-        for date_str, value in date_values:
-            ind_string += f"{date_str}: {value}\n"
-        
     except Exception as e:
         print(f"Error getting bulk stockstats data: {e}")
         # Fallback to original implementation if bulk method fails
-        ind_string = ""
+        date_values = []
         curr_date_dt = datetime.strptime(curr_date, "%Y-%m-%d")
         while curr_date_dt >= before:
             indicator_value = get_stockstats_indicator(
                 symbol, indicator, curr_date_dt.strftime("%Y-%m-%d")
             )
-            ind_string += f"{curr_date_dt.strftime('%Y-%m-%d')}: {indicator_value}\n"
+            date_values.append((curr_date_dt.strftime("%Y-%m-%d"), indicator_value))
             curr_date_dt = curr_date_dt - relativedelta(days=1)
 
+    # Build the result string
+    ind_string = encode_series(date_values, indicator, name="get_stock_stats_indicators_window")
+
     result_str = (
         f"## {indicator} values from {before.strftime('%Y-%m-%d')} to {end_date}:\n\n"
         + ind_string
@@ -184,15 +186,67 @@ def get_stock_stats_indicators_window(
     return result_str
 
 
-def _get_stock_stats_bulk(
+def _download_price_history(symbol: str):
+    """
+    Download the last 15 years of daily prices of a symbol from Yahoo Finance.
+    Downloads are cached under data_cache_dir, one file per symbol and day.
+    """
+    from .config import get_config
+    import pandas as pd
+    import yfinance as yf
+
+    config = get_config()
+    today_date = pd.Timestamp.today()
+
+    end_date = today_date
+    start_date = today_date - pd.DateOffset(years=15)
+    start_date_str = start_date.strftime("%Y-%m-%d")
+    end_date_str = end_date.strftime("%Y-%m-%d")
+
+    os.makedirs(config["data_cache_dir"], exist_ok=True)
+
+    data_file = os.path.join(
+        config["data_cache_dir"],
+        f"{symbol}-YFin-data-{start_date_str}-{end_date_str}.csv",
+    )
+
+    if os.path.exists(data_file):
+        data = pd.read_csv(data_file)
+        data["Date"] = pd.to_datetime(data["Date"])
+    else:
+        data = yf.download(
+            symbol,
+            start=start_date_str,
+            end=end_date_str,
+            multi_level_index=False,
+            progress=False,
+            auto_adjust=True,
+        )
+        data = data.reset_index()
+        data.to_csv(data_file, index=False)
+
+    return data
+
+
+def get_YFin_price_history(
     symbol: Annotated[str, "ticker symbol of the company"],
-    indicator: Annotated[str, "technical indicator to calculate"],
-    curr_date: Annotated[str, "current date for reference"]
-) -> dict:
+) -> str:
     """
-    Optimized bulk calculation of stock stats indicators.
-    Fetches data once and calculates indicator for all available dates.
-    Returns dict mapping date strings to indicator values.
+    The last 15 years of daily (split and dividend adjusted) prices of a
+    symbol as CSV text with yyyy-mm-dd dates, oldest first.
+    """
+    data = _download_price_history(symbol).copy()
+    data["Date"] = data["Date"].dt.strftime("%Y-%m-%d")
+    return data.sort_values("Date").to_csv(index=False)
+
+
+def _load_stock_stats_frame(
+    symbol: Annotated[str, "ticker symbol of the company"],
+):
+    """
+    Load the price history for a symbol as a stockstats frame.
+    Indicators are computed lazily on the returned frame, so one load can
+    serve any number of indicators. Dates are yyyy-mm-dd strings.
     """
     from .config import get_config
     import pandas as pd
@@ -215,39 +269,26 @@ def _get_stock_stats_bulk(
         except FileNotFoundError:
             raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
     else:
-        # Online data fetching with caching
-        today_date = pd.Timestamp.today()
-        curr_date_dt = pd.to_datetime(curr_date)
-        
-        end_date = today_date
-        start_date = today_date - pd.DateOffset(years=15)
-        start_date_str = start_date.strftime("%Y-%m-%d")
-        end_date_str = end_date.strftime("%Y-%m-%d")
-        
-        os.makedirs(config["data_cache_dir"], exist_ok=True)
-        
-        data_file = os.path.join(
-            config["data_cache_dir"],
-            f"{symbol}-YFin-data-{start_date_str}-{end_date_str}.csv",
-        )
-        
-        if os.path.exists(data_file):
-            data = pd.read_csv(data_file)
-            data["Date"] = pd.to_datetime(data["Date"])
-        else:
-            data = yf.download(
-                symbol,
-                start=start_date_str,
-                end=end_date_str,
-                multi_level_index=False,
-                progress=False,
-                auto_adjust=True,
-            )
-            data = data.reset_index()
-            data.to_csv(data_file, index=False)
-        
+        data = _download_price_history(symbol)
         df = wrap(data)
         df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
+
+    return df
+
+
+def _get_stock_stats_bulk(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    indicator: Annotated[str, "technical indicator to calculate"],
+    curr_date: Annotated[str, "current date for reference"]
+) -> dict:
+    """
+    Optimized bulk calculation of stock stats indicators.
+    Fetches data once and calculates indicator for all available dates.
+    Returns dict mapping date strings to indicator values.
+    """
+    import pandas as pd
+
+    df = _load_stock_stats_frame(symbol)
     
     # Calculate the indicator for all rows at once
     df[indicator]  # This triggers stockstats to calculate the indicator
@@ -267,6 +308,53 @@ def _get_stock_stats_bulk(
     return result_dict
 
 
+def get_stock_stats_indicators_batch(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    indicators: Annotated[list, "technical indicators to get the values of"],
+    curr_date: Annotated[
+        str, "The current trading date you are trading on, YYYY-mm-dd"
+    ],
+    look_back_days: Annotated[int, "how many days to look back"],
+) -> str:
+    """
+    Compute several stockstats indicators over one loaded price frame.
+    Returns a single CSV table with one row per trading day in the window
+    and one column per indicator.
+    """
+    unsupported = [ind for ind in indicators if ind not in INDICATOR_DESCRIPTIONS]
+    if unsupported:
+        raise ValueError(
+            f"Indicators {unsupported} are not supported. Please choose from: {list(INDICATOR_DESCRIPTIONS.keys())}"
+        )
+    # Keep the requested order but compute each indicator once
+    indicators = list(dict.fromkeys(indicators))
+
+    curr_date_dt = datetime.strptime(curr_date, "%Y-%m-%d")
+    before = (curr_date_dt - relativedelta(days=look_back_days)).strftime("%Y-%m-%d")
+
+    df = _load_stock_stats_frame(symbol)
+    for indicator in indicators:
+        df[indicator]  # This triggers stockstats to calculate the indicator
+
+    window = df[(df["Date"] >= before) & (df["Date"] <= curr_date)]
+    table = encode_frame(
+        window[["Date"] + indicators],
+        name="get_stock_stats_indicators_batch",
+        indicators=True,
+    )
+
+    legend = "\n".join(
+        f"- {indicator}: {INDICATOR_DESCRIPTIONS[indicator].split('. ')[0]}"
+        for indicator in indicators
+    )
+    return (
+        f"## {symbol.upper()} indicators from {before} to {curr_date} (trading days only):\n\n"
+        + table
+        + "\n"
+        + legend
+    )
+
+
 def get_stockstats_indicator(
     symbol: Annotated[str, "ticker symbol of the company"],
     indicator: Annotated[str, "technical indicator to get the analysis and report of"],
@@ -299,6 +387,8 @@ def get_balance_sheet(
     curr_date: Annotated[str, "current date (not used for yfinance)"] = None
 ):
     """Get balance sheet data from yfinance."""
+    import yfinance as yf
+
     try:
         ticker_obj = yf.Ticker(ticker.upper())
         
@@ -310,14 +400,12 @@ def get_balance_sheet(
         if data.empty:
             return f"No balance sheet data found for symbol '{ticker}'"
             
-        # Convert to CSV string for consistency with other functions
-        csv_string = data.to_csv()
-        
         # Add header information
         header = f"# Balance Sheet data for {ticker.upper()} ({freq})\n"
-        header += f"# Data retrieved on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        header += f"# Data retrieved on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
         
-        return header + csv_string
+        # Convert to compact CSV for consistency with other functions
+        return encode_frame(data, title=header, name="get_balance_sheet", index=True)
         
     except Exception as e:
         return f"Error retrieving balance sheet for {ticker}: {str(e)}"
@@ -329,6 +417,8 @@ def get_cashflow(
     curr_date: Annotated[str, "current date (not used for yfinance)"] = None
 ):
     """Get cash flow data from yfinance."""
+    import yfinance as yf
+
     try:
         ticker_obj = yf.Ticker(ticker.upper())
         
@@ -340,14 +430,12 @@ def get_cashflow(
         if data.empty:
             return f"No cash flow data found for symbol '{ticker}'"
             
-        # Convert to CSV string for consistency with other functions
-        csv_string = data.to_csv()
-        
         # Add header information
         header = f"# Cash Flow data for {ticker.upper()} ({freq})\n"
-        header += f"# Data retrieved on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        header += f"# Data retrieved on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
         
-        return header + csv_string
+        # Convert to compact CSV for consistency with other functions
+        return encode_frame(data, title=header, name="get_cashflow", index=True)
         
     except Exception as e:
         return f"Error retrieving cash flow for {ticker}: {str(e)}"
@@ -359,6 +447,8 @@ def get_income_statement(
     curr_date: Annotated[str, "current date (not used for yfinance)"] = None
 ):
     """Get income statement data from yfinance."""
+    import yfinance as yf
+
     try:
         ticker_obj = yf.Ticker(ticker.upper())
         
@@ -370,14 +460,12 @@ def get_income_statement(
         if data.empty:
             return f"No income statement data found for symbol '{ticker}'"
             
-        # Convert to CSV string for consistency with other functions
-        csv_string = data.to_csv()
-        
         # Add header information
         header = f"# Income Statement data for {ticker.upper()} ({freq})\n"
-        header += f"# Data retrieved on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        header += f"# Data retrieved on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
         
-        return header + csv_string
+        # Convert to compact CSV for consistency with other functions
+        return encode_frame(data, title=header, name="get_income_statement", index=True)
         
     except Exception as e:
         return f"Error retrieving income statement for {ticker}: {str(e)}"
@@ -387,6 +475,8 @@ def get_insider_transactions(
     ticker: Annotated[str, "ticker symbol of the company"]
 ):
     """Get insider transactions data from yfinance."""
+    import yfinance as yf
+
     try:
         ticker_obj = yf.Ticker(ticker.upper())
         data = ticker_obj.insider_transactions
@@ -394,14 +484,12 @@ def get_insider_transactions(
         if data is None or data.empty:
             return f"No insider transactions data found for symbol '{ticker}'"
             
-        # Convert to CSV string for consistency with other functions
-        csv_string = data.to_csv()
-        
         # Add header information
         header = f"# Insider Transactions data for {ticker.upper()}\n"
-        header += f"# Data retrieved on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        header += f"# Data retrieved on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
         
-        return header + csv_string
+        # Convert to compact CSV for consistency with other functions
+        return encode_frame(data, title=header, name="get_insider_transactions", raw=data.to_csv)
         
     except Exception as e:
         return f"Error retrieving insider transactions for {ticker}: {str(e)}"
\ No newline at end of file
@@ -13,10 +13,168 @@ DEFAULT_CONFIG = {
     "deep_think_llm": os.getenv("DEEP_THINK_LLM", "o4-mini"),
     "quick_think_llm": os.getenv("QUICK_THINK_LLM", "gpt-4o-mini"),
     "backend_url": os.getenv("BACKEND_URL", "https://api.openai.com/v1"),
+    # Settings of the "fake" llm_provider, a deterministic offline model used
+    # for profiling (see graph/profiling.py and benchmarks/profile_graph.py)
+    "fake_llm": {
+        "latency": 0.0,            # Seconds per call
+        "seconds_per_token": 0.0,  # Additional seconds per generated token
+        "response_chars": 800,     # Length of each text response
+        "decision": "HOLD",        # Decision every final proposal ends with
+    },
+    # Model of each LLM-calling node. "quick" and "deep" are quick_think_llm and
+    # deep_think_llm on llm_provider; other names refer to entries of "models".
+    # A route can also be {"model": ..., "timeout": seconds, "fallback": name}:
+    # calls slower than the timeout are answered by the fallback model instead,
+    # e.g. "Bull Researcher": {"model": "local", "timeout": 60}
+    "model_routing": {
+        "models": {
+            # Local Ollama model through its OpenAI-compatible endpoint
+            "local": {
+                "provider": "ollama",
+                "model": "llama3.1",
+                "backend_url": "http://localhost:11434/v1",
+            },
+        },
+        "nodes": {
+            "Market Analyst": "quick",
+            "Social Analyst": "quick",
+            "News Analyst": "quick",
+            "Fundamentals Analyst": "quick",
+            "Bull Researcher": "quick",
+            "Bear Researcher": "quick",
+            "Research Manager": "deep",
+            "Trader": "quick",
+            "Risky Analyst": "quick",
+            "Neutral Analyst": "quick",
+            "Safe Analyst": "quick",
+            "Risk Judge": "deep",
+            "Signal Processing": "quick",
+            "Reflection": "quick",
+        },
+        "timeout": None,     # Default per-call timeout of every route (None disables)
+        "fallback": "quick", # Model used when a routed call times out
+    },
+    # USD per million (input, output) tokens, merged over accounting.DEFAULT_MODEL_PRICING
+    "model_pricing": {},
+    # Per-run LLM budget. "abort" raises BudgetExceededError before the next LLM
+    # call; "downgrade" routes remaining calls to downgrade_model (default: quick_think_llm)
+    "run_budget": {
+        "max_tokens": None,
+        "max_cost": None,
+        "action": "abort",
+        "downgrade_model": None,
+    },
+    # Agent memory embeddings. "auto" uses the provider's embedding API when one is
+    # available and offline hashed n-gram embeddings otherwise; "hashing" is always offline
+    "memory_embedding": {
+        "backend": "auto",
+        "dim": 2048,   # Hash buckets of the offline embedder
+    },
+    # Deterministic features computed from the core_stock_apis vendor's daily prices
+    # before the analysts run (see dataflows/features.py), cached under data_cache_dir/features
+    "market_features": {
+        "enabled": True,
+        "return_horizons": [1, 5, 21, 63, 252],  # Trading days
+        "volatility_windows": [21, 63],          # Trading days
+        "drawdown_window": 252,                  # Trading days of the rolling high
+        "indicators": None,                      # None = every indicator the analysts can request
+        "regime_window": 21,                     # Volatility window that decides volatility_regime
+        "regime_thresholds": [0.15, 0.35],       # Annualized volatility cut-offs low/normal/high
+        "max_staleness": 3,                      # Trading days the latest price may lag the trade date
+    },
+    # Research Manager, Trader and Risk Judge answer with a TradeDecision (decision,
+    # conviction, sizing, exits, key reasons) via the provider's JSON/tool mode instead
+    # of prose; downstream prompts get its compact rendering and the final signal needs
+    # no extra LLM call. "method" is passed to with_structured_output (None = provider
+    # default, e.g. "json_schema", "function_calling" or "json_mode"). Falls back to
+    # prose when the provider cannot produce it
+    "structured_decisions": {
+        "enabled": True,
+        "method": None,
+    },
+    # Which past memories the agents may recall. point_in_time only recalls reflections
+    # whose outcome was known by the run's trade date; the same_* flags restrict recall
+    # to the run's ticker, sector (looked up in "sectors", ticker -> sector) or volatility regime
+    "memory_retrieval": {
+        "point_in_time": True,
+        "same_ticker": False,
+        "same_sector": False,
+        "same_regime": False,
+        "sectors": {},
+    },
     # Debate and discussion settings
     "max_debate_rounds": 1,
     "max_risk_discuss_rounds": 1,
     "max_recur_limit": 100,
+    # Maximum tool calls per analyst over its whole tool loop in a run; further
+    # calls are refused and the analyst is asked to write its report
+    "tool_call_budgets": {
+        "market": 12,
+        "social": 4,
+        "news": 8,
+        "fundamentals": 8,
+    },
+    # Identical tool calls within a run are served from this many cached results
+    "tool_cache_size": 256,
+    # Tool calls requested in the same step run concurrently on up to this many threads
+    "max_parallel_tool_calls": 4,
+    # Write data tool output to the graph's custom stream chunk by chunk as it is read
+    # (graph.stream(..., stream_mode="custom")); the analysts still get whole results
+    "stream_tool_output": False,
+    # Threads shared by blocking vendor implementations (local files, yfinance, scraping)
+    # when tools run async (apropagate); Alpha Vantage and OpenAI calls are awaited directly
+    "dataflow_executor_workers": 16,
+    # Checkpointing (SQLite under results_dir) so interrupted runs can be resumed
+    "checkpoint_enabled": True,
+    # Append-only per-ticker state log; zstd compression requires `zstandard`
+    "state_log_compress": False,
+    # Encoding of tabular tool outputs before they reach the LLM
+    "output_encoding": {
+        "enabled": True,
+        "float_precision": 2,        # Decimal places for prices and statements
+        "indicator_precision": 4,    # Decimal places for technical indicators
+        "trading_days_only": True,   # Drop weekend/holiday filler rows from tables and indicator windows
+        "max_rows": 0,               # Downsample tables longer than this (0 disables)
+        "report_savings": False,     # Print bytes/tokens saved per call (re-encodes every output)
+    },
+    # Alpha Vantage responses are shared by concurrent identical requests and
+    # reused for this many seconds
+    "alpha_vantage_cache_ttl": 300,
+    "alpha_vantage_max_concurrency": 4,
+    # Google News scraping: per-host token bucket, concurrent pagination, LRU page cache
+    "google_news": {
+        "requests_per_second": 0.5,  # Sustained request rate per host
+        "burst": 3,                  # Requests allowed back to back
+        "jitter": 0.5,               # Max random delay (seconds) added per request
+        "max_retries": 4,            # Retries after a 429 response
+        "max_pages": 10,             # Result pages fetched per query
+        "parallel_pages": 3,         # Pages fetched concurrently
+        "cache_ttl": 3600,           # Seconds a fetched page is reused
+        "cache_size": 512,           # Pages kept in the process-wide page cache
+    },
+    # Circuit breakers per (vendor, method): vendors failing too often are skipped
+    # until a probe call succeeds (see dataflows.circuit_breaker.get_vendor_health)
+    "circuit_breaker": {
+        "enabled": True,
+        "failure_rate": 0.5,   # Failure share over the window that opens the circuit
+        "min_calls": 3,        # Calls needed before the failure share is considered
+        "window": 10,          # Most recent calls considered
+        "cooldown": 60,        # Seconds before a probe call is let through
+        "max_cooldown": 900,   # Cooldown cap after repeated failed probes
+    },
+    # Shared LLM clients: one connection pool and adaptive (AIMD) concurrency
+    # limit per provider endpoint (see dataflows.llm_pool.get_llm_pool_status)
+    "llm_pool": {
+        "initial_concurrency": 8,   # Concurrent requests allowed at first
+        "min_concurrency": 1,       # Floor after repeated 429s
+        "max_concurrency": 32,      # Ceiling while requests succeed
+        "backoff": 0.5,             # Limit multiplier on a 429
+        "decrease_interval": 1.0,   # Seconds in which further 429s do not shrink it again
+        "max_connections": 64,      # HTTP connections kept per endpoint
+        "timeout": 600,             # Request timeout in seconds
+    },
+    # Snapshot bundle served by the `snapshot` vendor (record one with `cli.main snapshot`)
+    "snapshot_path": os.getenv("TRADINGAGENTS_SNAPSHOT_PATH"),
     # Data vendor configuration
     # Category-level configuration (default for all tools in category)
     "data_vendors": {
@@ -24,10 +182,14 @@ DEFAULT_CONFIG = {
         "technical_indicators": "yfinance",  # Options: yfinance, alpha_vantage, local
         "fundamental_data": "alpha_vantage", # Options: openai, alpha_vantage, local
         "news_data": "alpha_vantage",        # Options: openai, alpha_vantage, google, local
+        # Any category can also be set to "snapshot" to replay snapshot_path offline
     },
     # Tool-level configuration (takes precedence over category-level)
     "tool_vendors": {
         # Example: "get_stock_data": "alpha_vantage",  # Override category default
         # Example: "get_news": "openai",               # Override category default
     },
+    # Try a method's other vendors when the configured ones fail. With False a run
+    # only uses its configured vendors, and tools none of them implement are dropped
+    "vendor_fallback": True,
 }
@@ -0,0 +1,365 @@
+# TradingAgents/graph/accounting.py
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.runnables import Runnable
+from langchain_core.runnables.config import ensure_config
+
+# USD per million (input, output) tokens. Models are matched by exact name
+# first, then by the longest matching prefix (e.g. dated snapshots).
+DEFAULT_MODEL_PRICING = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+    "o4-mini": (1.10, 4.40),
+    "o3-mini": (1.10, 4.40),
+    "o3": (2.00, 8.00),
+    "o1": (15.00, 60.00),
+    "claude-3-5-haiku": (0.80, 4.00),
+    "claude-3-5-sonnet": (3.00, 15.00),
+    "claude-3-7-sonnet": (3.00, 15.00),
+    "claude-sonnet-4": (3.00, 15.00),
+    "claude-opus-4": (15.00, 75.00),
+    "gemini-2.0-flash": (0.10, 0.40),
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.5-pro": (1.25, 10.00),
+    "fake": (0.0, 0.0),
+}
+
+USAGE_LOG_NAME = "usage_log.jsonl"
+
+# Graph nodes grouped by the agent team they belong to
+_AGENT_GROUPS = {
+    "Bull Researcher": "research",
+    "Bear Researcher": "research",
+    "Research Manager": "research",
+    "Trader": "trader",
+    "Risky Analyst": "risk",
+    "Neutral Analyst": "risk",
+    "Safe Analyst": "risk",
+    "Risk Judge": "risk",
+}
+
+
+class BudgetExceededError(Exception):
+    """Exception raised when a run exceeds its token or cost budget."""
+    pass
+
+
+def agent_group(node: str) -> str:
+    """Map a graph node to its analyst (market, social, ...) or agent team."""
+    if node in _AGENT_GROUPS:
+        return _AGENT_GROUPS[node]
+    for prefix in ("tools_", "Msg Clear "):
+        if node.startswith(prefix):
+            return node[len(prefix):].lower()
+    if node.endswith(" Analyst"):
+        return node[: -len(" Analyst")].lower()
+    return node
+
+
+def model_price(model: Optional[str], pricing: Dict[str, Iterable[float]]):
+    """(input, output) USD per million tokens for a model, or None if unpriced."""
+    if not model:
+        return None
+    if model in pricing:
+        return tuple(pricing[model])
+    matches = [name for name in pricing if model.startswith(name)]
+    if not matches:
+        return None
+    return tuple(pricing[max(matches, key=len)])
+
+
+def _empty_usage() -> Dict[str, float]:
+    return {
+        "calls": 0,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "total_tokens": 0,
+        "seconds": 0.0,
+        "cost": 0.0,
+    }
+
+
+class TokenAccountant(BaseCallbackHandler):
+    """Aggregates LLM token usage, latency and estimated cost for one run.
+
+    Pass an instance in the ``callbacks`` of a graph invocation. Usage is read
+    from each response's usage metadata and attributed to the graph node the
+    call was made from. When a budget is set, the accountant either raises
+    BudgetExceededError before the next LLM call (``action="abort"``) or
+    reports itself over budget so BudgetedChatModel switches to its cheaper
+    model (``action="downgrade"``).
+    """
+
+    raise_error = True
+
+    def __init__(
+        self,
+        pricing: Optional[Dict[str, Iterable[float]]] = None,
+        max_tokens: Optional[int] = None,
+        max_cost: Optional[float] = None,
+        action: str = "abort",
+    ):
+        """Initialize the accountant.
+
+        Args:
+            pricing: USD per million (input, output) tokens by model name.
+                Defaults to DEFAULT_MODEL_PRICING
+            max_tokens: Token budget of the run. None means unlimited
+            max_cost: Estimated USD budget of the run. None means unlimited
+            action: What happens once the budget is exceeded: "abort" or "downgrade"
+        """
+        if action not in ("abort", "downgrade"):
+            raise ValueError(f"Unknown budget action: {action}")
+        self.pricing = DEFAULT_MODEL_PRICING if pricing is None else pricing
+        self.max_tokens = max_tokens
+        self.max_cost = max_cost
+        self.action = action
+
+        self._lock = threading.Lock()
+        self._calls: Dict[Any, tuple] = {}
+        self.nodes: Dict[str, Dict[str, float]] = defaultdict(_empty_usage)
+        self.models: Dict[str, Dict[str, float]] = defaultdict(_empty_usage)
+        self.unpriced_models = set()
+        self.started = time.time()
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        self._begin(run_id, metadata, kwargs)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        self._begin(run_id, metadata, kwargs)
+
+    def _begin(self, run_id, metadata, kwargs):
+        if self.action == "abort" and self.over_budget():
+            totals = self.totals()
+            raise BudgetExceededError(
+                f"Run budget exceeded: {totals['total_tokens']} tokens, "
+                f"${totals['cost']:.4f} (limits: {self.max_tokens} tokens, ${self.max_cost})"
+            )
+        metadata = metadata or {}
+        params = kwargs.get("invocation_params") or {}
+        node = metadata.get("langgraph_node") or kwargs.get("name") or "(outside graph)"
+        model = metadata.get("ls_model_name") or params.get("model") or params.get("model_name")
+        with self._lock:
+            self._calls[run_id] = (node, model, time.perf_counter())
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        with self._lock:
+            started = self._calls.pop(run_id, None)
+        if started is None:
+            return
+        node, model, start = started
+        seconds = time.perf_counter() - start
+
+        input_tokens = output_tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None) or {}
+                input_tokens += usage.get("input_tokens", 0)
+                output_tokens += usage.get("output_tokens", 0)
+                if message is not None:
+                    model = model or (message.response_metadata or {}).get("model_name")
+        if not input_tokens and not output_tokens:
+            token_usage = (response.llm_output or {}).get("token_usage") or {}
+            input_tokens = token_usage.get("prompt_tokens", 0)
+            output_tokens = token_usage.get("completion_tokens", 0)
+        model = model or (response.llm_output or {}).get("model_name") or "unknown"
+
+        price = model_price(model, self.pricing)
+        cost = 0.0
+        if price is not None:
+            cost = (input_tokens * price[0] + output_tokens * price[1]) / 1_000_000
+
+        with self._lock:
+            if price is None:
+                self.unpriced_models.add(model)
+            for usage in (self.nodes[node], self.models[model]):
+                usage["calls"] += 1
+                usage["input_tokens"] += input_tokens
+                usage["output_tokens"] += output_tokens
+                usage["total_tokens"] += input_tokens + output_tokens
+                usage["seconds"] += seconds
+                usage["cost"] += cost
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        with self._lock:
+            self._calls.pop(run_id, None)
+
+    def totals(self) -> Dict[str, float]:
+        with self._lock:
+            totals = _empty_usage()
+            for usage in self.nodes.values():
+                for key in totals:
+                    totals[key] += usage[key]
+            return totals
+
+    def over_budget(self) -> bool:
+        """Whether the run has used up its token or cost budget."""
+        if self.max_tokens is None and self.max_cost is None:
+            return False
+        totals = self.totals()
+        return (self.max_tokens is not None and totals["total_tokens"] >= self.max_tokens) or (
+            self.max_cost is not None and totals["cost"] >= self.max_cost
+        )
+
+    def report(self) -> Dict[str, Any]:
+        """Usage of the run per node, per analyst/agent team and per model."""
+        totals = self.totals()
+        with self._lock:
+            nodes = {node: dict(usage) for node, usage in self.nodes.items()}
+            models = {model: dict(usage) for model, usage in self.models.items()}
+            unpriced = sorted(self.unpriced_models)
+
+        groups: Dict[str, Dict[str, float]] = defaultdict(_empty_usage)
+        for node, usage in nodes.items():
+            group = groups[agent_group(node)]
+            for key in group:
+                group[key] += usage[key]
+
+        return {
+            "totals": totals,
+            "nodes": nodes,
+            "agents": dict(groups),
+            "models": models,
+            "unpriced_models": unpriced,
+            "over_budget": self.over_budget(),
+        }
+
+
+class BudgetedChatModel(Runnable):
+    """Chat model wrapper that switches to a cheaper model once the run is over budget.
+
+    The budget is read from the TokenAccountant among the callbacks of the
+    current run, so one wrapper can serve concurrent runs with separate budgets.
+    """
+
+    def __init__(self, primary, downgrade):
+        self.primary = primary
+        self.downgrade = downgrade
+
+    def _select(self, config):
+        handlers = config.get("callbacks") or []
+        handlers = getattr(handlers, "handlers", handlers)
+        for handler in handlers:
+            if isinstance(handler, TokenAccountant) and handler.over_budget():
+                return self.downgrade
+        return self.primary
+
+    def invoke(self, input, config=None, **kwargs):
+        config = ensure_config(config)
+        return self._select(config).invoke(input, config, **kwargs)
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        config = ensure_config(config)
+        return await self._select(config).ainvoke(input, config, **kwargs)
+
+    def bind_tools(self, tools, **kwargs):
+        return BudgetedChatModel(
+            self.primary.bind_tools(tools, **kwargs),
+            self.downgrade.bind_tools(tools, **kwargs),
+        )
+
+    def with_structured_output(self, schema, **kwargs):
+        return BudgetedChatModel(
+            self.primary.with_structured_output(schema, **kwargs),
+            self.downgrade.with_structured_output(schema, **kwargs),
+        )
+
+
+class UsageLog:
+    """Per-run usage records kept next to each ticker's state log.
+
+    Each run appends one JSON line to
+    ``{base_dir}/{ticker}/TradingAgentsStrategy_logs/usage_log.jsonl``.
+    """
+
+    def __init__(self, base_dir: str = "eval_results"):
+        self.base_dir = base_dir
+        self._lock = threading.Lock()
+
+    def path(self, ticker: str) -> str:
+        return os.path.join(self.base_dir, ticker, "TradingAgentsStrategy_logs", USAGE_LOG_NAME)
+
+    def append(self, ticker: str, trade_date, report: Dict[str, Any], status: str = "completed"):
+        record = {
+            "ticker": ticker,
+            "trade_date": str(trade_date),
+            "logged_at": datetime.now().isoformat(timespec="seconds"),
+            "status": status,
+            **report,
+        }
+        path = self.path(ticker)
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+
+    def records(
+        self,
+        tickers: Optional[List[str]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Load the usage records of a batch of runs, oldest first per ticker."""
+        if tickers is None:
+            tickers = sorted(os.listdir(self.base_dir)) if os.path.isdir(self.base_dir) else []
+        records = []
+        for ticker in tickers:
+            path = self.path(ticker)
+            if not os.path.exists(path):
+                continue
+            with open(path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Partially written line
+                    if start_date and record["trade_date"] < start_date:
+                        continue
+                    if end_date and record["trade_date"] > end_date:
+                        continue
+                    records.append(record)
+        return records
+
+    @staticmethod
+    def aggregate(records: List[Dict[str, Any]], by: str = "nodes") -> Dict[str, Dict[str, float]]:
+        """Sum usage over runs per node ("nodes"), agent team ("agents") or model ("models").
+
+        Each entry also gets `runs` (how many runs used it) and per-run means of
+        tokens and cost.
+        """
+        summed: Dict[str, Dict[str, float]] = defaultdict(lambda: {**_empty_usage(), "runs": 0})
+        for record in records:
+            for name, usage in record.get(by, {}).items():
+                entry = summed[name]
+                entry["runs"] += 1
+                for key in _empty_usage():
+                    entry[key] += usage.get(key, 0)
+        for entry in summed.values():
+            entry["mean_tokens_per_run"] = entry["total_tokens"] / entry["runs"]
+            entry["mean_cost_per_run"] = entry["cost"] / entry["runs"]
+        return dict(sorted(summed.items(), key=lambda item: -item[1]["total_tokens"]))
+
+
+def create_token_accountant(config: dict) -> TokenAccountant:
+    """Build a run's accountant from the model_pricing and run_budget config."""
+    pricing = dict(DEFAULT_MODEL_PRICING)
+    pricing.update(config.get("model_pricing") or {})
+    budget = config.get("run_budget") or {}
+    return TokenAccountant(
+        pricing=pricing,
+        max_tokens=budget.get("max_tokens"),
+        max_cost=budget.get("max_cost"),
+        action=budget.get("action", "abort"),
+    )
@@ -0,0 +1,255 @@
+# TradingAgents/graph/backtest.py
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.dataflows.local import get_local_price_history
+
+from .latency import NodeLatencyCallback
+from .trading_graph import TradingAgentsGraph
+
+
+DECISION_POSITIONS = {"BUY": 1, "HOLD": 0, "SELL": -1}
+
+
+def parse_position(decision: str) -> int:
+    """Map a processed signal (BUY/HOLD/SELL) to a position of +1/0/-1."""
+    text = str(decision).upper()
+    for label in ("SELL", "BUY", "HOLD"):
+        if label in text:
+            return DECISION_POSITIONS[label]
+    return 0
+
+
+class Backtester:
+    """Runs TradingAgentsGraph over a ticker x date grid and scores each decision.
+
+    Realized forward returns come from the local price store and are fed back
+    through ``reflect_and_remember``, tagged with the date the holding period
+    ended. Memory recall is always point-in-time (memory_retrieval
+    "point_in_time" is forced on), so a date only sees reflections
+    whose holding period ended on or before it, including those of tickers
+    backtested earlier, and dates that fall within one holding period of each
+    other are independent and can run in parallel.
+    """
+
+    def __init__(
+        self,
+        selected_analysts=["market", "social", "news", "fundamentals"],
+        config: Dict[str, Any] = None,
+        holding_days: int = 1,
+        max_workers: int = 1,
+        local_only: bool = True,
+        reflect: bool = True,
+        debug: bool = False,
+    ):
+        """Initialize the backtester.
+
+        Args:
+            selected_analysts: Analyst types to include in the graph
+            config: Configuration dictionary. If None, uses default config
+            holding_days: Trading days each decision is held for when scoring it
+            max_workers: Maximum number of dates to run concurrently
+            local_only: Force every data category onto the local vendor with vendor
+                fallback off, so no data comes from the network; tools with no local
+                implementation (e.g. get_fundamentals) are not offered to the analysts
+            reflect: Feed realized returns back into the agents' memories
+            debug: Whether to run the graph in debug mode
+        """
+        if holding_days < 1:
+            raise ValueError("holding_days must be at least 1")
+
+        self.config = (config or DEFAULT_CONFIG).copy()
+        if local_only:
+            self.config["data_vendors"] = {
+                category: "local" for category in self.config["data_vendors"]
+            }
+            self.config["tool_vendors"] = {}
+            self.config["vendor_fallback"] = False
+        # Reflections must only be recalled once their holding period has ended,
+        # otherwise later dates would learn from returns they could not know
+        self.config["memory_retrieval"] = {
+            **(self.config.get("memory_retrieval") or {}),
+            "point_in_time": True,
+        }
+
+        self.holding_days = holding_days
+        self.max_workers = max(1, max_workers)
+        self.reflect = reflect
+        self.graph = TradingAgentsGraph(selected_analysts, debug=debug, config=self.config)
+
+    def run(
+        self,
+        tickers: List[str],
+        start_date: str,
+        end_date: str,
+        step: int = 1,
+        output_dir: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Run the backtest and return one row per (ticker, date).
+
+        Dates whose run fails get a row with status "failed" and the error, and
+        are not scored. Results are saved even if the backtest is interrupted.
+
+        Args:
+            tickers: Ticker symbols to backtest
+            start_date: First trade date, yyyy-mm-dd
+            end_date: Last trade date, yyyy-mm-dd
+            step: Run every `step` trading days
+            output_dir: Where to write decisions.csv and summary.json. Defaults to
+                results_dir/backtests/<timestamp>
+        """
+        records = []
+        try:
+            for ticker in tickers:
+                try:
+                    prices = get_local_price_history(ticker)
+                except Exception as e:
+                    print(f"WARNING: Skipping {ticker}, no local price history ({type(e).__name__}: {e})")
+                    continue
+                dates = prices["Date"].tolist()
+                trade_dates = [d for d in dates if start_date <= d <= end_date][::step]
+                print(f"Backtesting {ticker} on {len(trade_dates)} trading days")
+
+                position_of = {d: i for i, d in enumerate(dates)}
+                for batch in self._batches(trade_dates, position_of):
+                    for record in self._run_batch(ticker, batch, prices, position_of):
+                        records.append(record)
+        finally:
+            # Saved even when the backtest is interrupted, so finished dates are kept
+            results = pd.DataFrame(records)
+            self._save(results, output_dir)
+        return results
+
+    def _batches(self, trade_dates: List[str], position_of: Dict[str, int]):
+        """Group dates whose memories cannot depend on each other."""
+        batch = []
+        for trade_date in trade_dates:
+            if batch and (
+                len(batch) >= self.max_workers
+                or (
+                    self.reflect
+                    and position_of[trade_date] - position_of[batch[0]] >= self.holding_days
+                )
+            ):
+                yield batch
+                batch = []
+            batch.append(trade_date)
+        if batch:
+            yield batch
+
+    def _run_batch(self, ticker, batch, prices, position_of):
+        """Run a batch of dates concurrently, then score and reflect in date order."""
+        if len(batch) == 1:
+            outcomes = [self._run_date(ticker, batch[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=len(batch)) as executor:
+                outcomes = list(
+                    executor.map(lambda trade_date: self._run_date(ticker, trade_date), batch)
+                )
+
+        for trade_date, (final_state, decision, latency, elapsed, error) in zip(batch, outcomes):
+            if error is not None:
+                print(f"WARNING: {ticker} {trade_date} failed: {error}")
+                yield {
+                    "ticker": ticker,
+                    "trade_date": trade_date,
+                    "status": "failed",
+                    "decision": None,
+                    "position": None,
+                    "forward_return": None,
+                    "pnl": None,
+                    "run_seconds": elapsed,
+                    "error": error,
+                }
+                continue
+
+            entry_idx = position_of[trade_date]
+            exit_idx = entry_idx + self.holding_days
+            position = parse_position(decision)
+
+            forward_return = None
+            pnl = None
+            if exit_idx < len(prices):
+                entry_close = prices["Close"].iloc[entry_idx]
+                exit_close = prices["Close"].iloc[exit_idx]
+                forward_return = float(exit_close / entry_close - 1)
+                pnl = position * forward_return
+                if self.reflect:
+                    self.graph.reflect_and_remember(
+                        pnl, state=final_state, available_date=prices["Date"].iloc[exit_idx]
+                    )
+
+            record = {
+                "ticker": ticker,
+                "trade_date": trade_date,
+                "status": "completed",
+                "decision": decision,
+                "position": position,
+                "forward_return": forward_return,
+                "pnl": pnl,
+                "run_seconds": elapsed,
+                "error": None,
+            }
+            for node, seconds in latency.items():
+                record[f"latency_{node}"] = seconds
+            yield record
+
+    def _run_date(self, ticker, trade_date):
+        """Run one date, returning (final_state, decision, latency, seconds, error).
+
+        A failed run is returned with its error message rather than raised, so
+        one failed LLM or vendor call does not end the whole backtest.
+        """
+        latency = NodeLatencyCallback()
+        start = time.perf_counter()
+        try:
+            # Always a fresh run: a resumed checkpoint would skip nodes and their latency
+            final_state, decision = self.graph.propagate(
+                ticker, trade_date, resume=False, callbacks=[latency]
+            )
+        except Exception as e:
+            return None, None, {}, time.perf_counter() - start, f"{type(e).__name__}: {e}"
+        return final_state, decision, latency.summary(), time.perf_counter() - start, None
+
+    def _save(self, results: pd.DataFrame, output_dir: Optional[str]):
+        if output_dir is None:
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            output_dir = os.path.join(self.config["results_dir"], "backtests", stamp)
+        os.makedirs(output_dir, exist_ok=True)
+
+        results.to_csv(os.path.join(output_dir, "decisions.csv"), index=False)
+        with open(os.path.join(output_dir, "summary.json"), "w") as f:
+            json.dump(self.summarize(results), f, indent=4)
+        print(f"Backtest results saved to {output_dir}")
+
+    @staticmethod
+    def summarize(results: pd.DataFrame) -> Dict[str, Any]:
+        """Aggregate PnL, hit rate and mean per-node latency for a backtest."""
+        if results.empty:
+            return {"runs": 0}
+
+        scored = results.dropna(subset=["pnl"])
+        traded = scored[scored["position"] != 0]
+        latency_cols = [c for c in results.columns if c.startswith("latency_")]
+
+        return {
+            "runs": int(len(results)),
+            "failed_runs": int((results["status"] == "failed").sum()),
+            "scored_runs": int(len(scored)),
+            "total_pnl": float(scored["pnl"].sum()),
+            "mean_pnl": float(scored["pnl"].mean()) if len(scored) else None,
+            "hit_rate": float((traded["pnl"] > 0).mean()) if len(traded) else None,
+            "pnl_by_ticker": scored.groupby("ticker")["pnl"].sum().to_dict(),
+            "mean_run_seconds": float(results["run_seconds"].mean()),
+            "mean_node_seconds": {
+                c[len("latency_"):]: float(results[c].mean()) for c in latency_cols
+            },
+        }
@@ -0,0 +1,121 @@
+# TradingAgents/graph/checkpointer.py
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Optional, Sequence
+
+
+def _threaded_sqlite_saver(connection):
+    """SqliteSaver whose async methods run the sync ones on a worker thread.
+
+    SqliteSaver only implements the sync API, so on its own it cannot be
+    used by graphs run with ainvoke (TradingAgentsGraph.apropagate).
+    """
+    from langgraph.checkpoint.sqlite import SqliteSaver
+
+    class ThreadedSqliteSaver(SqliteSaver):
+        async def aget_tuple(self, config):
+            return await asyncio.to_thread(self.get_tuple, config)
+
+        async def alist(self, config, **kwargs):
+            items = await asyncio.to_thread(lambda: list(self.list(config, **kwargs)))
+            for item in items:
+                yield item
+
+        async def aput(self, *args, **kwargs):
+            return await asyncio.to_thread(self.put, *args, **kwargs)
+
+        async def aput_writes(self, *args, **kwargs):
+            return await asyncio.to_thread(self.put_writes, *args, **kwargs)
+
+        async def adelete_thread(self, thread_id):
+            return await asyncio.to_thread(self.delete_thread, thread_id)
+
+    return ThreadedSqliteSaver(connection)
+
+
+class CheckpointManager:
+    """Persists graph progress in SQLite so interrupted runs can be resumed.
+
+    Every (ticker, trade_date) pair maps to its own LangGraph thread, so a run
+    that fails in a late node (e.g. the risk judge) picks up from the last
+    completed node instead of re-running the analysts and debates. Graphs
+    with different analysts, depth or models pass their run_variant, so
+    their runs of the same ticker and date do not resume or clear each other.
+    """
+
+    def __init__(self, results_dir: str, db_name: str = "checkpoints.sqlite"):
+        """Open (or create) the checkpoint database under results_dir."""
+        os.makedirs(results_dir, exist_ok=True)
+        self.db_path = os.path.join(results_dir, db_name)
+        # The saver is shared by every thread that runs the compiled graph
+        self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.saver = _threaded_sqlite_saver(self.connection)
+
+    @staticmethod
+    def thread_id(ticker: str, trade_date, variant: Optional[str] = None) -> str:
+        """Build the checkpoint thread id for a (ticker, trade_date) run."""
+        thread_id = f"{ticker.upper()}:{trade_date}"
+        return f"{thread_id}:{variant}" if variant else thread_id
+
+    def run_config(self, ticker: str, trade_date, variant: Optional[str] = None) -> dict:
+        """Get the configurable section that binds a run to its checkpoint thread."""
+        return {"configurable": {"thread_id": self.thread_id(ticker, trade_date, variant)}}
+
+    def has_pending_run(self, graph, ticker: str, trade_date, variant: Optional[str] = None) -> bool:
+        """Check whether a previous run for this key stopped before reaching END."""
+        snapshot = graph.get_state(self.run_config(ticker, trade_date, variant))
+        return bool(snapshot.values) and bool(snapshot.next)
+
+    def clear(self, ticker: str, trade_date, variant: Optional[str] = None):
+        """Drop all checkpoints for a (ticker, trade_date) run."""
+        thread_id = self.thread_id(ticker, trade_date, variant)
+        if hasattr(self.saver, "delete_thread"):
+            self.saver.delete_thread(thread_id)
+        else:
+            with self.connection:
+                for table in ("checkpoints", "writes"):
+                    self.connection.execute(
+                        f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,)
+                    )
+
+    def close(self):
+        """Close the underlying SQLite connection."""
+        self.connection.close()
+
+
+def run_variant(selected_analysts: Sequence[str], config: dict) -> str:
+    """Short digest of the settings that shape a run's graph and answers.
+
+    Covers the analysts, the debate depth and the models, so a checkpoint is
+    only resumed by a graph that would have produced it.
+    """
+    payload = {
+        "analysts": list(selected_analysts),
+        "max_debate_rounds": config.get("max_debate_rounds"),
+        "max_risk_discuss_rounds": config.get("max_risk_discuss_rounds"),
+        "llm_provider": config.get("llm_provider"),
+        "backend_url": config.get("backend_url"),
+        "deep_think_llm": config.get("deep_think_llm"),
+        "quick_think_llm": config.get("quick_think_llm"),
+        "model_routing": config.get("model_routing"),
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:12]
+
+
+def create_checkpoint_manager(config: dict) -> Optional[CheckpointManager]:
+    """Create a CheckpointManager if checkpointing is enabled and available."""
+    if not config.get("checkpoint_enabled", True):
+        return None
+    try:
+        return CheckpointManager(config["results_dir"])
+    except ImportError:
+        print(
+            "WARNING: langgraph-checkpoint-sqlite is not installed, "
+            "running without checkpoints (runs cannot be resumed)"
+        )
+        return None
@@ -2,44 +2,53 @@
 
 from tradingagents.agents.utils.agent_states import AgentState
 
+from .tool_node import tool_calls_used
+
 
 class ConditionalLogic:
     """Handles conditional logic for determining graph flow."""
 
-    def __init__(self, max_debate_rounds=1, max_risk_discuss_rounds=1):
+    def __init__(self, max_debate_rounds=1, max_risk_discuss_rounds=1, tool_call_budgets=None):
         """Initialize with configuration parameters."""
         self.max_debate_rounds = max_debate_rounds
         self.max_risk_discuss_rounds = max_risk_discuss_rounds
+        self.tool_call_budgets = tool_call_budgets or {}
+
+    def _wants_tools(self, state: AgentState, analyst: str) -> bool:
+        """Check whether an analyst asked for tools and still has budget for them.
+
+        Calls beyond the budget still go to the tool node, which refuses them,
+        so the analyst gets one final turn without tools to write its report.
+        Only a final turn that requests tools anyway (its text is kept as the
+        report) ends the loop here.
+        """
+        messages = state["messages"]
+        if not messages[-1].tool_calls:
+            return False
+        budget = self.tool_call_budgets.get(analyst)
+        return budget is None or tool_calls_used(messages) < budget
 
     def should_continue_market(self, state: AgentState):
         """Determine if market analysis should continue."""
-        messages = state["messages"]
-        last_message = messages[-1]
-        if last_message.tool_calls:
+        if self._wants_tools(state, "market"):
             return "tools_market"
         return "Msg Clear Market"
 
     def should_continue_social(self, state: AgentState):
         """Determine if social media analysis should continue."""
-        messages = state["messages"]
-        last_message = messages[-1]
-        if last_message.tool_calls:
+        if self._wants_tools(state, "social"):
             return "tools_social"
         return "Msg Clear Social"
 
     def should_continue_news(self, state: AgentState):
         """Determine if news analysis should continue."""
-        messages = state["messages"]
-        last_message = messages[-1]
-        if last_message.tool_calls:
+        if self._wants_tools(state, "news"):
             return "tools_news"
         return "Msg Clear News"
 
     def should_continue_fundamentals(self, state: AgentState):
         """Determine if fundamentals analysis should continue."""
-        messages = state["messages"]
-        last_message = messages[-1]
-        if last_message.tool_calls:
+        if self._wants_tools(state, "fundamentals"):
             return "tools_fundamentals"
         return "Msg Clear Fundamentals"
 
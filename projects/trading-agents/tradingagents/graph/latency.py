@@ -0,0 +1,53 @@
+# TradingAgents/graph/latency.py
+
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+
+class NodeLatencyCallback(BaseCallbackHandler):
+    """Records wall-clock time spent in each graph node during a run.
+
+    Pass an instance in the ``callbacks`` of a graph invocation. Only the
+    top-level run of each node is timed, so LLM and tool calls made inside a
+    node are counted towards that node.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._starts: Dict[Any, tuple] = {}
+        self.node_seconds: Dict[str, float] = defaultdict(float)
+        self.node_calls: Dict[str, int] = defaultdict(int)
+
+    def on_chain_start(
+        self, serialized, inputs, *, run_id, parent_run_id=None, tags=None, metadata=None, **kwargs
+    ):
+        node = (metadata or {}).get("langgraph_node")
+        if node and kwargs.get("name") == node:
+            with self._lock:
+                self._starts[run_id] = (node, time.perf_counter())
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def _finish(self, run_id):
+        with self._lock:
+            started = self._starts.pop(run_id, None)
+            if started is None:
+                return
+            node, start = started
+            self.node_seconds[node] += time.perf_counter() - start
+            self.node_calls[node] += 1
+
+    def summary(self) -> Dict[str, float]:
+        """Get total seconds spent per node, slowest first."""
+        with self._lock:
+            return dict(
+                sorted(self.node_seconds.items(), key=lambda item: item[1], reverse=True)
+            )
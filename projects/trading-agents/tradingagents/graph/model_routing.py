@@ -0,0 +1,199 @@
+# TradingAgents/graph/model_routing.py
+
+import asyncio
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain_core.runnables import Runnable, ensure_config
+
+from tradingagents.default_config import DEFAULT_CONFIG
+
+
+def is_timeout_error(error: BaseException) -> bool:
+    """Check for a request timeout of any provider SDK without importing them."""
+    while error is not None:
+        name = type(error).__name__
+        if isinstance(error, TimeoutError) or "Timeout" in name or name == "DeadlineExceeded":
+            return True
+        error = error.__cause__
+    return False
+
+
+class TimeoutFallbackChatModel(Runnable):
+    """Chat model wrapper that answers with a fallback model when the primary is too slow.
+
+    The primary is expected to be built with a request timeout of `timeout`
+    seconds and no retries (see ModelRouter), so a slow call is aborted by the
+    provider client itself, holding no connection, limiter slot or tokens
+    after the deadline. When the primary raises a timeout error, the same
+    input is sent to `fallback`; other errors of the primary are not retried.
+    Async calls are additionally cancelled after `timeout` seconds.
+    """
+
+    def __init__(self, primary, fallback, timeout: float, name: str = ""):
+        self.primary = primary
+        self.fallback = fallback
+        self.timeout = timeout
+        self.name = name
+        self._stats = {"calls": 0, "timeouts": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def _timed_out(self):
+        self._count("timeouts")
+        print(f"WARNING: {self.name or 'LLM call'} timed out after {self.timeout}s, using the fallback model")
+
+    def invoke(self, input, config=None, **kwargs):
+        config = ensure_config(config)
+        self._count("calls")
+        try:
+            return self.primary.invoke(input, config, **kwargs)
+        except Exception as e:
+            if not is_timeout_error(e):
+                raise
+        self._timed_out()
+        return self.fallback.invoke(input, config, **kwargs)
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        config = ensure_config(config)
+        self._count("calls")
+        try:
+            return await asyncio.wait_for(self.primary.ainvoke(input, config, **kwargs), self.timeout)
+        except Exception as e:
+            if not is_timeout_error(e):
+                raise
+        self._timed_out()
+        return await self.fallback.ainvoke(input, config, **kwargs)
+
+    def _wrap(self, primary, fallback):
+        wrapped = TimeoutFallbackChatModel(primary, fallback, self.timeout, self.name)
+        # Bound variants report into the same counters
+        wrapped._stats = self._stats
+        wrapped._lock = self._lock
+        return wrapped
+
+    def bind_tools(self, tools, **kwargs):
+        return self._wrap(
+            self.primary.bind_tools(tools, **kwargs),
+            self.fallback.bind_tools(tools, **kwargs),
+        )
+
+    def with_structured_output(self, schema, **kwargs):
+        return self._wrap(
+            self.primary.with_structured_output(schema, **kwargs),
+            self.fallback.with_structured_output(schema, **kwargs),
+        )
+
+
+class ModelRouter:
+    """Resolves the chat model of each node from the model_routing config.
+
+    A node's route is a model name, or a dict with "model" and optionally
+    "timeout" and "fallback". "quick" and "deep" name the graph's
+    quick_think_llm and deep_think_llm; other names are looked up in the
+    routing config's "models" table and built once with `factory`. Routes
+    with a timeout use a variant of their model built with that request
+    timeout, so slow calls are aborted rather than left running.
+    """
+
+    def __init__(
+        self,
+        routing: Optional[Dict[str, Any]],
+        base_models: Dict[str, Any],
+        factory: Callable[..., Any],
+        base_specs: Optional[Dict[str, Dict[str, Any]]] = None,
+    ):
+        """Initialize the router.
+
+        Args:
+            routing: The model_routing config section
+            base_models: Ready chat models by name, e.g. {"quick": ..., "deep": ...}
+            factory: Builds a chat model from a model spec (an entry of the
+                "models" table) and a request timeout in seconds, None for
+                the provider default
+            base_specs: Specs of the base models, used to build their
+                variants with a request timeout
+        """
+        routing = routing or {}
+        self.models_config = routing.get("models") or {}
+        self.nodes = {**DEFAULT_CONFIG["model_routing"]["nodes"], **(routing.get("nodes") or {})}
+        self.timeout = routing.get("timeout")
+        self.fallback = routing.get("fallback", "quick")
+        self.factory = factory
+        self.base_specs = base_specs or {}
+        self._models = dict(base_models)
+        self._timed_models: Dict[tuple, Any] = {}
+        self._routed: Dict[str, Any] = {}
+
+    def route(self, node: str) -> Dict[str, Any]:
+        """The normalized route of a node: model, timeout and fallback."""
+        spec = self.nodes.get(node, "quick")
+        if isinstance(spec, str):
+            spec = {"model": spec}
+        return {
+            "model": spec.get("model", "quick"),
+            "timeout": spec.get("timeout", self.timeout),
+            "fallback": spec.get("fallback", self.fallback),
+        }
+
+    def model(self, name: str, timeout: Optional[float] = None):
+        """The chat model registered under `name`, built on first use.
+
+        With a timeout, the variant of the model whose requests time out
+        after that many seconds (with no retries).
+        """
+        if timeout:
+            key = (name, timeout)
+            if key not in self._timed_models:
+                spec = self.models_config.get(name) or self.base_specs.get(name)
+                if spec is None:
+                    if name in self._models:
+                        # No spec to rebuild it from; only async calls are cut off
+                        return self._models[name]
+                    raise ValueError(f"Unknown model '{name}' in model_routing; define it under 'models'")
+                self._timed_models[key] = self.factory(spec, timeout=timeout)
+            return self._timed_models[key]
+
+        if name not in self._models:
+            if name not in self.models_config:
+                raise ValueError(f"Unknown model '{name}' in model_routing; define it under 'models'")
+            self._models[name] = self.factory(self.models_config[name])
+        return self._models[name]
+
+    def variants(self, name: str) -> List[Any]:
+        """The built chat models registered under `name`: the model and its timeout variants."""
+        models = [self._models[name]] if name in self._models else []
+        return models + [llm for (model, _), llm in self._timed_models.items() if model == name]
+
+    def get(self, node: str):
+        """The chat model for a node, wrapped with its timeout fallback when one is set."""
+        if node not in self._routed:
+            route = self.route(node)
+            llm = self.model(route["model"])
+            if route["timeout"] and route["fallback"] and route["fallback"] != route["model"]:
+                llm = TimeoutFallbackChatModel(
+                    self.model(route["model"], timeout=route["timeout"]),
+                    self.model(route["fallback"]),
+                    route["timeout"],
+                    name=node,
+                )
+            self._routed[node] = llm
+        return self._routed[node]
+
+    def table(self) -> Dict[str, Dict[str, Any]]:
+        """Every node's route plus call and timeout counts of its fallback wrapper."""
+        table = {}
+        for node in self.nodes:
+            entry = self.route(node)
+            llm = self._routed.get(node)
+            if isinstance(llm, TimeoutFallbackChatModel):
+                entry.update(llm.stats())
+            table[node] = entry
+        return table
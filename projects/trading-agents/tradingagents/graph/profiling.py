@@ -0,0 +1,394 @@
+# TradingAgents/graph/profiling.py
+
+import itertools
+import json
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+# Tool calls the fake model makes on an analyst's first turn, for every bound
+# tool that appears here. {ticker}, {date} and {start_date} (date - 7 days)
+# are filled in from the analyst prompt, {decision} from the model's decision.
+DEFAULT_TOOL_SCRIPT = {
+    "get_stock_data": {"symbol": "{ticker}", "start_date": "{start_date}", "end_date": "{date}"},
+    "get_indicators_batch": {
+        "symbol": "{ticker}",
+        "indicators": ["close_50_sma", "rsi", "macd", "boll", "atr"],
+        "curr_date": "{date}",
+        "look_back_days": 30,
+    },
+    "get_news": {"ticker": "{ticker}", "start_date": "{start_date}", "end_date": "{date}"},
+    "get_global_news": {"curr_date": "{date}", "look_back_days": 7, "limit": 5},
+    "get_fundamentals": {"ticker": "{ticker}", "curr_date": "{date}"},
+    "get_balance_sheet": {"ticker": "{ticker}", "freq": "quarterly", "curr_date": "{date}"},
+    "get_insider_sentiment": {"ticker": "{ticker}", "curr_date": "{date}"},
+    # Structured decisions of the judges and the trader (with_structured_output)
+    "TradeDecision": {
+        "decision": "{decision}",
+        "conviction": 0.5,
+        "position_size": 0.0,
+        "time_horizon": "2-4 weeks",
+        "key_reasons": ["Signals from the analyst reports are balanced."],
+        "summary": "The fake model keeps its scripted decision.",
+    },
+}
+
+_TICKER_PATTERN = re.compile(r"company we want to look at is (\S+)")
+_DATE_PATTERN = re.compile(r"current date is (\d{4}-\d{2}-\d{2})")
+_call_ids = itertools.count()
+_FILLER = (
+    "The analysis weighs recent price action, indicator readings, news flow and "
+    "fundamentals against the risks discussed by the team. "
+)
+
+
+def _tool_name(tool) -> str:
+    if isinstance(tool, dict):
+        return tool.get("name") or tool.get("function", {}).get("name")
+    return getattr(tool, "name", None) or getattr(tool, "__name__", str(tool))
+
+
+def _serialized_name(serialized, kwargs, default: str) -> str:
+    serialized = serialized or {}
+    return kwargs.get("name") or serialized.get("name") or (serialized.get("id") or [default])[-1]
+
+
+def _content_size(content) -> int:
+    if isinstance(content, str):
+        return len(content)
+    return len(json.dumps(content, default=str))
+
+
+class FakeChatModel(BaseChatModel):
+    """Deterministic stand-in for a provider chat model, used for profiling.
+
+    Every call sleeps `latency` seconds plus `seconds_per_token` per generated
+    token. When tools are bound, tool_choice is not "none" and the
+    conversation has no tool results yet, it requests the scripted tool calls
+    for the bound tools; otherwise it answers with `response_chars` of text
+    ending in a FINAL TRANSACTION PROPOSAL of `decision`. Responses carry
+    usage metadata estimated at four characters per token. With a `timeout`,
+    calls that would take longer raise TimeoutError after `timeout` seconds,
+    like a provider client with a request timeout.
+    """
+
+    model: str = "fake"
+    latency: float = 0.0
+    seconds_per_token: float = 0.0
+    response_chars: int = 800
+    decision: str = "HOLD"
+    timeout: Optional[float] = None
+    tool_script: Dict[str, Dict[str, Any]] = DEFAULT_TOOL_SCRIPT
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model": self.model, "latency": self.latency}
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(tools=[_tool_name(tool) for tool in tools], **kwargs)
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        prompt = "\n".join(str(message.content) for message in messages)
+        tools = [] if kwargs.get("tool_choice") == "none" else kwargs.get("tools") or []
+
+        tool_calls = []
+        if tools and not any(isinstance(message, ToolMessage) for message in messages):
+            tool_calls = self._scripted_calls(tools, prompt)
+
+        if tool_calls:
+            content = ""
+        else:
+            body = (_FILLER * (self.response_chars // len(_FILLER) + 1))[: self.response_chars]
+            content = f"{body}\n\nFINAL TRANSACTION PROPOSAL: **{self.decision}**"
+
+        input_tokens = len(prompt) // 4
+        output_tokens = max(1, (len(content) + len(json.dumps(tool_calls))) // 4)
+        delay = self.latency + self.seconds_per_token * output_tokens
+        if self.timeout is not None and delay > self.timeout:
+            time.sleep(self.timeout)
+            raise TimeoutError(f"Request to {self.model} timed out after {self.timeout}s")
+        if delay > 0:
+            time.sleep(delay)
+
+        message = AIMessage(
+            content=content,
+            tool_calls=tool_calls,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+            response_metadata={"model_name": self.model},
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _scripted_calls(self, tools: List[str], prompt: str) -> List[dict]:
+        from datetime import datetime, timedelta
+
+        ticker_match = _TICKER_PATTERN.search(prompt)
+        date_match = _DATE_PATTERN.search(prompt)
+        ticker = ticker_match.group(1) if ticker_match else "SPY"
+        date = date_match.group(1) if date_match else datetime.now().strftime("%Y-%m-%d")
+        start_date = (datetime.strptime(date, "%Y-%m-%d") - timedelta(days=7)).strftime("%Y-%m-%d")
+        values = {"ticker": ticker, "date": date, "start_date": start_date, "decision": self.decision}
+
+        def fill(value):
+            if isinstance(value, str):
+                return value.format(**values)
+            if isinstance(value, list):
+                return [fill(item) for item in value]
+            return value
+
+        return [
+            {
+                "name": name,
+                "args": {key: fill(value) for key, value in self.tool_script[name].items()},
+                "id": f"call_fake_{next(_call_ids)}",
+                "type": "tool_call",
+            }
+            for name in tools
+            if name in self.tool_script
+        ]
+
+
+class Profiler(BaseCallbackHandler):
+    """Records a span for the graph run, each node, LLM call and tool call.
+
+    Pass an instance in the ``callbacks`` of ``propagate``. Spans are nested by
+    LangChain's parent run ids, so an LLM or tool call is attributed to the
+    node it ran in. The result can be exported as a Chrome trace
+    (chrome://tracing, Perfetto, speedscope) or as folded stacks for
+    flamegraph.pl, and summarized per node into LLM time, tool time and the
+    remaining orchestration overhead.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._parents: Dict[Any, Any] = {}
+        self._open: Dict[Any, dict] = {}
+        self.spans: List[dict] = []
+
+    # Span bookkeeping
+
+    def _start(self, run_id, parent_run_id, name: str, category: str, **args):
+        with self._lock:
+            self._open[run_id] = {
+                "run_id": run_id,
+                "parent": parent_run_id,
+                "name": name,
+                "cat": category,
+                "start": time.perf_counter() - self._origin,
+                "tid": threading.get_ident(),
+                "args": args,
+            }
+
+    def _end(self, run_id, **args):
+        with self._lock:
+            span = self._open.pop(run_id, None)
+            if span is None:
+                return
+            span["end"] = time.perf_counter() - self._origin
+            span["args"].update(args)
+            self.spans.append(span)
+
+    # Callbacks
+
+    def on_chain_start(
+        self, serialized, inputs, *, run_id, parent_run_id=None, tags=None, metadata=None, **kwargs
+    ):
+        with self._lock:
+            self._parents[run_id] = parent_run_id
+        node = (metadata or {}).get("langgraph_node")
+        name = kwargs.get("name")
+        if parent_run_id is None:
+            self._start(run_id, None, name or "graph", "graph")
+        elif node and name == node:
+            self._start(run_id, parent_run_id, node, "node")
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._end(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=type(error).__name__)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, **kwargs):
+        with self._lock:
+            self._parents[run_id] = parent_run_id
+        prompt_chars = sum(_content_size(m.content) for batch in messages for m in batch)
+        name = _serialized_name(serialized, kwargs, "chat_model")
+        self._start(run_id, parent_run_id, f"llm:{name}", "llm", prompt_chars=prompt_chars)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, **kwargs):
+        with self._lock:
+            self._parents[run_id] = parent_run_id
+        name = _serialized_name(serialized, kwargs, "llm")
+        self._start(run_id, parent_run_id, f"llm:{name}", "llm", prompt_chars=sum(map(len, prompts)))
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        response_chars = 0
+        tool_calls = 0
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                if message is not None:
+                    response_chars += _content_size(message.content)
+                    tool_calls += len(getattr(message, "tool_calls", None) or [])
+                else:
+                    response_chars += len(generation.text)
+        self._end(run_id, response_chars=response_chars, tool_calls=tool_calls)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=type(error).__name__)
+
+    def on_tool_start(self, serialized, input_str, *, run_id, parent_run_id=None, **kwargs):
+        with self._lock:
+            self._parents[run_id] = parent_run_id
+        name = _serialized_name(serialized, kwargs, "tool")
+        self._start(run_id, parent_run_id, f"tool:{name}", "tool", input_chars=len(str(input_str)))
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        content = getattr(output, "content", output)
+        self._end(run_id, output_chars=len(str(content)))
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=type(error).__name__)
+
+    # Exports
+
+    def _recorded_parent(self, span: dict, by_id: Dict[Any, dict]) -> Optional[dict]:
+        """Nearest ancestor of a span that was itself recorded."""
+        parent = span["parent"]
+        while parent is not None:
+            if parent in by_id:
+                return by_id[parent]
+            parent = self._parents.get(parent)
+        return None
+
+    def _stack(self, span: dict, by_id: Dict[Any, dict]) -> List[str]:
+        stack = [span["name"]]
+        parent = self._recorded_parent(span, by_id)
+        while parent is not None:
+            stack.append(parent["name"])
+            parent = self._recorded_parent(parent, by_id)
+        return stack[::-1]
+
+    def chrome_trace(self) -> dict:
+        """Spans as Chrome trace-event JSON (complete events, microseconds)."""
+        with self._lock:
+            spans = list(self.spans)
+        events = [
+            {
+                "name": span["name"],
+                "cat": span["cat"],
+                "ph": "X",
+                "ts": round(span["start"] * 1e6, 1),
+                "dur": round((span["end"] - span["start"]) * 1e6, 1),
+                "pid": os.getpid(),
+                "tid": span["tid"],
+                "args": span["args"],
+            }
+            for span in sorted(spans, key=lambda s: s["start"])
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def folded_stacks(self) -> str:
+        """Self time of every span as folded stacks (``a;b;c <microseconds>``)."""
+        with self._lock:
+            spans = list(self.spans)
+        by_id = {span["run_id"]: span for span in spans}
+        child_time = defaultdict(float)
+        for span in spans:
+            parent = self._recorded_parent(span, by_id)
+            if parent is not None:
+                child_time[parent["run_id"]] += span["end"] - span["start"]
+
+        weights = defaultdict(int)
+        for span in spans:
+            self_time = span["end"] - span["start"] - child_time[span["run_id"]]
+            # Concurrent children can exceed their parent's wall time
+            weights[";".join(self._stack(span, by_id))] += max(0, int(self_time * 1e6))
+        return "".join(f"{stack} {weight}\n" for stack, weight in sorted(weights.items()) if weight)
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-node wall, LLM and tool seconds, prompt/response sizes and overhead."""
+        with self._lock:
+            spans = list(self.spans)
+        by_id = {span["run_id"]: span for span in spans}
+
+        nodes: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        tools: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        graph_seconds = 0.0
+        for span in spans:
+            duration = span["end"] - span["start"]
+            if span["cat"] == "graph":
+                graph_seconds += duration
+                continue
+            if span["cat"] == "node":
+                nodes[span["name"]]["wall_seconds"] += duration
+                nodes[span["name"]]["calls"] += 1
+                continue
+
+            owner = self._recorded_parent(span, by_id)
+            while owner is not None and owner["cat"] != "node":
+                owner = self._recorded_parent(owner, by_id)
+            node = nodes[owner["name"] if owner else "(outside nodes)"]
+            if span["cat"] == "llm":
+                node["llm_seconds"] += duration
+                node["llm_calls"] += 1
+                node["prompt_chars"] += span["args"].get("prompt_chars", 0)
+                node["response_chars"] += span["args"].get("response_chars", 0)
+            elif span["cat"] == "tool":
+                node["tool_seconds"] += duration
+                node["tool_calls"] += 1
+                tools[span["name"]]["seconds"] += duration
+                tools[span["name"]]["calls"] += 1
+                tools[span["name"]]["output_chars"] += span["args"].get("output_chars", 0)
+
+        for stats in nodes.values():
+            stats["overhead_seconds"] = max(
+                0.0, stats["wall_seconds"] - stats["llm_seconds"] - stats["tool_seconds"]
+            )
+
+        node_seconds = sum(stats["wall_seconds"] for stats in nodes.values())
+        return {
+            "graph_seconds": graph_seconds,
+            "node_seconds": node_seconds,
+            "llm_seconds": sum(stats["llm_seconds"] for stats in nodes.values()),
+            "tool_seconds": sum(stats["tool_seconds"] for stats in nodes.values()),
+            # Time in the graph runtime itself: scheduling, state merging, checkpoints
+            "orchestration_seconds": max(0.0, graph_seconds - node_seconds),
+            "nodes": {
+                name: dict(stats)
+                for name, stats in sorted(nodes.items(), key=lambda item: -item[1]["wall_seconds"])
+            },
+            "tools": {name: dict(stats) for name, stats in sorted(tools.items())},
+        }
+
+    def save(self, output_dir: str) -> Dict[str, str]:
+        """Write trace.json, stacks.folded and summary.json into output_dir."""
+        os.makedirs(output_dir, exist_ok=True)
+        paths = {
+            "trace": os.path.join(output_dir, "trace.json"),
+            "folded": os.path.join(output_dir, "stacks.folded"),
+            "summary": os.path.join(output_dir, "summary.json"),
+        }
+        with open(paths["trace"], "w") as f:
+            json.dump(self.chrome_trace(), f, default=str)
+        with open(paths["folded"], "w") as f:
+            f.write(self.folded_stacks())
+        with open(paths["summary"], "w") as f:
+            json.dump(self.summary(), f, indent=2)
+        return paths
@@ -23,6 +23,8 @@ class Propagator:
             "messages": [("human", company_name)],
             "company_of_interest": company_name,
             "trade_date": str(trade_date),
+            "market_features": {},
+            "volatility_regime": None,
             "investment_debate_state": InvestDebateState(
                 {"history": "", "current_response": "", "count": 0}
             ),
@@ -41,9 +43,17 @@ class Propagator:
             "news_report": "",
         }
 
-    def get_graph_args(self) -> Dict[str, Any]:
-        """Get arguments for the graph invocation."""
+    def get_graph_args(self, run_config: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Get arguments for the graph invocation.
+
+        Args:
+            run_config: Extra RunnableConfig entries, e.g. the checkpoint
+                thread binding from CheckpointManager.run_config
+        """
+        config = {"recursion_limit": self.max_recur_limit}
+        if run_config:
+            config.update(run_config)
         return {
             "stream_mode": "values",
-            "config": {"recursion_limit": self.max_recur_limit},
+            "config": config,
         }
@@ -1,14 +1,15 @@
 # TradingAgents/graph/setup.py
 
-from typing import Dict, Any
-from langchain_openai import ChatOpenAI
+from typing import Dict, Any, Optional
+from langchain_core.language_models import BaseChatModel
 from langgraph.graph import END, StateGraph, START
-from langgraph.prebuilt import ToolNode
 
 from tradingagents.agents import *
 from tradingagents.agents.utils.agent_states import AgentState
 
 from .conditional_logic import ConditionalLogic
+from .model_routing import ModelRouter
+from .tool_node import AnalystToolNode
 
 
 class GraphSetup:
@@ -16,17 +17,22 @@ class GraphSetup:
 
     def __init__(
         self,
-        quick_thinking_llm: ChatOpenAI,
-        deep_thinking_llm: ChatOpenAI,
-        tool_nodes: Dict[str, ToolNode],
+        quick_thinking_llm: BaseChatModel,
+        deep_thinking_llm: BaseChatModel,
+        tool_nodes: Dict[str, AnalystToolNode],
         bull_memory,
         bear_memory,
         trader_memory,
         invest_judge_memory,
         risk_manager_memory,
         conditional_logic: ConditionalLogic,
+        model_router: Optional[ModelRouter] = None,
     ):
-        """Initialize with required components."""
+        """Initialize with required components.
+
+        When a model_router is given, each node uses the model it routes the
+        node to instead of the quick or deep thinking LLM.
+        """
         self.quick_thinking_llm = quick_thinking_llm
         self.deep_thinking_llm = deep_thinking_llm
         self.tool_nodes = tool_nodes
@@ -36,9 +42,16 @@ class GraphSetup:
         self.invest_judge_memory = invest_judge_memory
         self.risk_manager_memory = risk_manager_memory
         self.conditional_logic = conditional_logic
+        self.model_router = model_router
+
+    def _llm(self, node: str, default: BaseChatModel):
+        return self.model_router.get(node) if self.model_router else default
 
     def setup_graph(
-        self, selected_analysts=["market", "social", "news", "fundamentals"]
+        self,
+        selected_analysts=["market", "social", "news", "fundamentals"],
+        checkpointer=None,
+        precompute_features=True,
     ):
         """Set up and compile the agent workflow graph.
 
@@ -48,6 +61,11 @@ class GraphSetup:
                 - "social": Social media analyst
                 - "news": News analyst
                 - "fundamentals": Fundamentals analyst
+            checkpointer: Optional LangGraph checkpoint saver used to persist
+                progress after every node
+            precompute_features: Start with a "Feature Precompute" node that
+                puts the deterministic market features into state for the
+                analysts and memory
         """
         if len(selected_analysts) == 0:
             raise ValueError("Trading Agents Graph Setup Error: no analysts selected!")
@@ -59,50 +77,56 @@ class GraphSetup:
 
         if "market" in selected_analysts:
             analyst_nodes["market"] = create_market_analyst(
-                self.quick_thinking_llm
+                self._llm("Market Analyst", self.quick_thinking_llm),
+                tool_budget=self.tool_nodes["market"].budget,
             )
             delete_nodes["market"] = create_msg_delete()
             tool_nodes["market"] = self.tool_nodes["market"]
 
         if "social" in selected_analysts:
             analyst_nodes["social"] = create_social_media_analyst(
-                self.quick_thinking_llm
+                self._llm("Social Analyst", self.quick_thinking_llm),
+                tool_budget=self.tool_nodes["social"].budget,
             )
             delete_nodes["social"] = create_msg_delete()
             tool_nodes["social"] = self.tool_nodes["social"]
 
         if "news" in selected_analysts:
             analyst_nodes["news"] = create_news_analyst(
-                self.quick_thinking_llm
+                self._llm("News Analyst", self.quick_thinking_llm),
+                tool_budget=self.tool_nodes["news"].budget,
             )
             delete_nodes["news"] = create_msg_delete()
             tool_nodes["news"] = self.tool_nodes["news"]
 
         if "fundamentals" in selected_analysts:
             analyst_nodes["fundamentals"] = create_fundamentals_analyst(
-                self.quick_thinking_llm
+                self._llm("Fundamentals Analyst", self.quick_thinking_llm),
+                tool_budget=self.tool_nodes["fundamentals"].budget,
             )
             delete_nodes["fundamentals"] = create_msg_delete()
             tool_nodes["fundamentals"] = self.tool_nodes["fundamentals"]
 
         # Create researcher and manager nodes
         bull_researcher_node = create_bull_researcher(
-            self.quick_thinking_llm, self.bull_memory
+            self._llm("Bull Researcher", self.quick_thinking_llm), self.bull_memory
         )
         bear_researcher_node = create_bear_researcher(
-            self.quick_thinking_llm, self.bear_memory
+            self._llm("Bear Researcher", self.quick_thinking_llm), self.bear_memory
         )
         research_manager_node = create_research_manager(
-            self.deep_thinking_llm, self.invest_judge_memory
+            self._llm("Research Manager", self.deep_thinking_llm), self.invest_judge_memory
+        )
+        trader_node = create_trader(
+            self._llm("Trader", self.quick_thinking_llm), self.trader_memory
         )
-        trader_node = create_trader(self.quick_thinking_llm, self.trader_memory)
 
         # Create risk analysis nodes
-        risky_analyst = create_risky_debator(self.quick_thinking_llm)
-        neutral_analyst = create_neutral_debator(self.quick_thinking_llm)
-        safe_analyst = create_safe_debator(self.quick_thinking_llm)
+        risky_analyst = create_risky_debator(self._llm("Risky Analyst", self.quick_thinking_llm))
+        neutral_analyst = create_neutral_debator(self._llm("Neutral Analyst", self.quick_thinking_llm))
+        safe_analyst = create_safe_debator(self._llm("Safe Analyst", self.quick_thinking_llm))
         risk_manager_node = create_risk_manager(
-            self.deep_thinking_llm, self.risk_manager_memory
+            self._llm("Risk Judge", self.deep_thinking_llm), self.risk_manager_memory
         )
 
         # Create workflow
@@ -114,7 +138,7 @@ class GraphSetup:
             workflow.add_node(
                 f"Msg Clear {analyst_type.capitalize()}", delete_nodes[analyst_type]
             )
-            workflow.add_node(f"tools_{analyst_type}", tool_nodes[analyst_type])
+            workflow.add_node(f"tools_{analyst_type}", tool_nodes[analyst_type].as_runnable())
 
         # Add other nodes
         workflow.add_node("Bull Researcher", bull_researcher_node)
@@ -127,9 +151,14 @@ class GraphSetup:
         workflow.add_node("Risk Judge", risk_manager_node)
 
         # Define edges
-        # Start with the first analyst
-        first_analyst = selected_analysts[0]
-        workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
+        # Start with the feature precompute, then the first analyst
+        first_analyst = f"{selected_analysts[0].capitalize()} Analyst"
+        if precompute_features:
+            workflow.add_node("Feature Precompute", create_feature_precompute())
+            workflow.add_edge(START, "Feature Precompute")
+            workflow.add_edge("Feature Precompute", first_analyst)
+        else:
+            workflow.add_edge(START, first_analyst)
 
         # Connect analysts in sequence
         for i, analyst_type in enumerate(selected_analysts):
@@ -199,4 +228,4 @@ class GraphSetup:
         workflow.add_edge("Risk Judge", END)
 
         # Compile and return
-        return workflow.compile()
+        return workflow.compile(checkpointer=checkpointer)
@@ -1,26 +1,40 @@
 # TradingAgents/graph/signal_processing.py
 
-from langchain_openai import ChatOpenAI
+from langchain_core.language_models import BaseChatModel
 
 
 class SignalProcessor:
     """Processes trading signals to extract actionable decisions."""
 
-    def __init__(self, quick_thinking_llm: ChatOpenAI):
+    def __init__(self, quick_thinking_llm: BaseChatModel):
         """Initialize with an LLM for processing."""
         self.quick_thinking_llm = quick_thinking_llm
 
-    def process_signal(self, full_signal: str) -> str:
+    def process_signal(self, full_signal: str, callbacks=None) -> str:
         """
         Process a full trading signal to extract the core decision.
 
         Args:
             full_signal: Complete trading signal text
+            callbacks: Optional LangChain callback handlers, e.g. the run's TokenAccountant
 
         Returns:
             Extracted decision (BUY, SELL, or HOLD)
         """
-        messages = [
+        return self.quick_thinking_llm.invoke(
+            self._messages(full_signal), self._config(callbacks)
+        ).content
+
+    async def aprocess_signal(self, full_signal: str, callbacks=None) -> str:
+        """Async variant of process_signal."""
+        result = await self.quick_thinking_llm.ainvoke(
+            self._messages(full_signal), self._config(callbacks)
+        )
+        return result.content
+
+    @staticmethod
+    def _messages(full_signal: str):
+        return [
             (
                 "system",
                 "You are an efficient assistant designed to analyze paragraphs or financial reports provided by a group of analysts. Your task is to extract the investment decision: SELL, BUY, or HOLD. Provide only the extracted decision (SELL, BUY, or HOLD) as your output, without adding any additional text or information.",
@@ -28,4 +42,6 @@ class SignalProcessor:
             ("human", full_signal),
         ]
 
-        return self.quick_thinking_llm.invoke(messages).content
+    @staticmethod
+    def _config(callbacks):
+        return {"callbacks": callbacks, "run_name": "Signal Processing"} if callbacks else None
@@ -0,0 +1,212 @@
+# TradingAgents/graph/state_log.py
+
+import json
+import os
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class StateLog:
+    """Append-only log of final graph states, one file per ticker.
+
+    Each run appends a single JSON record to
+    ``{base_dir}/{ticker}/TradingAgentsStrategy_logs/full_states_log.jsonl``
+    (``.jsonl.zst`` when compressed), so logging a run costs the size of that
+    run rather than the size of the whole history. A sidecar ``.idx`` file
+    holds one ``trade_date<TAB>offset<TAB>length`` line per record, which lets
+    readers seek straight to a date. When a date is logged more than once the
+    latest record wins.
+
+    With compression every record is written as an independent zstd frame, so
+    random access only decompresses the record being read.
+    """
+
+    def __init__(self, base_dir: str = "eval_results", compress: bool = False):
+        """Initialize the log.
+
+        Args:
+            base_dir: Directory holding one subdirectory per ticker
+            compress: Write zstd-compressed records (requires `zstandard`)
+        """
+        if compress:
+            import zstandard
+
+            self._compressor = zstandard.ZstdCompressor()
+            self._decompressor = zstandard.ZstdDecompressor()
+        else:
+            self._compressor = None
+            self._decompressor = None
+
+        self.base_dir = base_dir
+        self.compress = compress
+        self._lock = threading.Lock()
+        # ticker -> (indexed data size, {trade_date: (offset, length)})
+        self._indexes: Dict[str, Tuple[int, Dict[str, Tuple[int, int]]]] = {}
+
+    def path(self, ticker: str) -> str:
+        """Get the path of the log file for a ticker."""
+        suffix = ".jsonl.zst" if self.compress else ".jsonl"
+        return os.path.join(
+            self.base_dir, ticker, "TradingAgentsStrategy_logs", f"full_states_log{suffix}"
+        )
+
+    def append(self, ticker: str, trade_date, record: Dict[str, Any]):
+        """Append the record for a (ticker, trade_date) run."""
+        trade_date = str(trade_date)
+        payload = json.dumps(record).encode("utf-8") + b"\n"
+        if self._compressor is not None:
+            payload = self._compressor.compress(payload)
+
+        path = self.path(ticker)
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            data_size, index = self._load_index(ticker)
+
+            # Drop a partially written record left behind by an interrupted run
+            valid_end = max((o + l for o, l in index.values()), default=0)
+            if valid_end < data_size:
+                with open(path, "r+b") as f:
+                    f.truncate(valid_end)
+
+            with open(path, "ab") as f:
+                offset = f.tell()
+                f.write(payload)
+            # The index is written after the data, so a crash in between only
+            # leaves a record that is picked up again by _load_index
+            with open(path + ".idx", "a") as f:
+                f.write(f"{trade_date}\t{offset}\t{len(payload)}\n")
+
+            index[trade_date] = (offset, len(payload))
+            self._indexes[ticker] = (offset + len(payload), index)
+
+    def get(self, ticker: str, trade_date) -> Optional[Dict[str, Any]]:
+        """Read the latest record for a trade date, or None if it was never logged."""
+        with self._lock:
+            _, index = self._load_index(ticker)
+            location = index.get(str(trade_date))
+            if location is None:
+                return None
+            offset, length = location
+            with open(self.path(ticker), "rb") as f:
+                f.seek(offset)
+                return self._decode(f.read(length))
+
+    def dates(self, ticker: str) -> List[str]:
+        """List the logged trade dates for a ticker, in the order first logged."""
+        with self._lock:
+            _, index = self._load_index(ticker)
+            return list(index)
+
+    def iter_records(self, ticker: str) -> Iterator[Dict[str, Any]]:
+        """Stream every record for a ticker in write order, including superseded ones."""
+        path = self.path(ticker)
+        if not os.path.exists(path):
+            return
+
+        with open(path, "rb") as f:
+            if self._decompressor is None:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+            else:
+                reader = self._decompressor.stream_reader(f, read_across_frames=True)
+                buffer = b""
+                while True:
+                    chunk = reader.read(1 << 16)
+                    if not chunk:
+                        break
+                    buffer += chunk
+                    *lines, buffer = buffer.split(b"\n")
+                    for line in lines:
+                        if line.strip():
+                            yield json.loads(line)
+                if buffer.strip():
+                    yield json.loads(buffer)
+
+    def _decode(self, payload: bytes) -> Dict[str, Any]:
+        if self._decompressor is not None:
+            payload = self._decompressor.decompress(payload)
+        return json.loads(payload)
+
+    def _load_index(self, ticker: str):
+        """Load the offset index, indexing any records written after it."""
+        path = self.path(ticker)
+        data_size = os.path.getsize(path) if os.path.exists(path) else 0
+
+        cached = self._indexes.get(ticker)
+        if cached is not None and cached[0] == data_size:
+            return cached
+
+        index: Dict[str, Tuple[int, int]] = {}
+        indexed_end = 0
+        if os.path.exists(path + ".idx"):
+            with open(path + ".idx") as f:
+                for line in f:
+                    parts = line.rstrip("\n").split("\t")
+                    if len(parts) != 3:
+                        continue
+                    trade_date, offset, length = parts[0], int(parts[1]), int(parts[2])
+                    if offset + length > data_size:
+                        continue
+                    index[trade_date] = (offset, length)
+                    indexed_end = max(indexed_end, offset + length)
+
+        if indexed_end < data_size:
+            missing = list(self._scan(path, indexed_end))
+            with open(path + ".idx", "a") as f:
+                for trade_date, offset, length in missing:
+                    f.write(f"{trade_date}\t{offset}\t{length}\n")
+                    index[trade_date] = (offset, length)
+
+        self._indexes[ticker] = (data_size, index)
+        return self._indexes[ticker]
+
+    def _scan(self, path: str, start: int) -> Iterator[Tuple[str, int, int]]:
+        """Recover (trade_date, offset, length) for records from `start` onwards."""
+        with open(path, "rb") as f:
+            f.seek(start)
+            data = f.read()
+
+        offset = 0
+        while offset < len(data):
+            try:
+                if self._decompressor is None:
+                    end = data.find(b"\n", offset)
+                    end = len(data) if end == -1 else end + 1
+                else:
+                    decompressor = self._decompressor.decompressobj()
+                    decompressor.decompress(data[offset:])
+                    end = len(data) - len(decompressor.unused_data)
+                trade_date = str(self._decode(data[offset:end])["trade_date"])
+            except Exception:
+                # Partially written record at the end of the file
+                return
+            yield trade_date, start + offset, end - offset
+            offset = end
+
+
+_state_logs: Dict[Tuple[str, bool], StateLog] = {}
+_state_logs_lock = threading.Lock()
+
+
+def create_state_log(config: dict, base_dir: str = "eval_results") -> StateLog:
+    """Get the StateLog for a config, falling back to plain JSONL if zstd is unavailable.
+
+    Logs are shared process-wide per (base_dir, compress), so graphs running
+    concurrently append to a ticker's file under one lock.
+    """
+    compress = config.get("state_log_compress", False)
+    key = (os.path.abspath(base_dir), compress)
+    with _state_logs_lock:
+        if key not in _state_logs:
+            try:
+                _state_logs[key] = StateLog(base_dir, compress=compress)
+            except ImportError:
+                print(
+                    "WARNING: zstandard is not installed, writing uncompressed state logs"
+                )
+                fallback = (key[0], False)
+                if fallback not in _state_logs:
+                    _state_logs[fallback] = StateLog(base_dir, compress=False)
+                _state_logs[key] = _state_logs[fallback]
+        return _state_logs[key]
@@ -0,0 +1,270 @@
+# TradingAgents/graph/tool_node.py
+
+import asyncio
+import contextvars
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.messages import ToolMessage
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+
+from tradingagents.agents.utils.agent_utils import tool_calls_used
+from tradingagents.agents.utils.routed_tool import stream_routed_tool
+from tradingagents.dataflows.interface import _is_error_result
+
+BUDGET_EXHAUSTED_MESSAGE = (
+    "Tool call budget exhausted: this call was not executed. "
+    "Write your final report now using the data you already have."
+)
+BUDGET_REACHED_NOTE = (
+    "\n\n[Tool call budget reached. Do not request more tools; "
+    "write your final report now.]"
+)
+
+
+class ToolResultCache:
+    """Thread-safe LRU cache of tool results shared by all analyst tool nodes.
+
+    Keys include the ticker and trade date of the run, so results never leak
+    between runs even when a tool's own arguments do not mention them.
+    """
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, str]" = OrderedDict()
+
+    def get(self, key: tuple) -> Optional[str]:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key: tuple, value: str):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+class AnalystToolNode:
+    """Executes an analyst's tool calls with a budget, memoization and parallelism.
+
+    Compared to LangGraph's ToolNode:
+    - Identical (tool, args) calls are answered from earlier results in the
+      message history or the shared ToolResultCache instead of hitting the
+      data vendors again. Duplicates within one step run only once.
+    - Independent calls requested in the same step run concurrently, on
+      threads or, when the graph runs with ainvoke, as coroutines.
+    - With stream_output, the output of routed data tools is read in chunks
+      (route_to_vendor_stream) and each chunk is written to the graph's custom
+      stream as {"tool_output_chunk": {"tool", "tool_call_id", "chunk"}}, so
+      graph.stream(..., stream_mode="custom") shows data as it is read. Only
+      sync runs stream; the analyst still gets the whole output.
+    - Once `budget` tool calls have been made, further calls are answered with
+      an error instead of being executed, and the last executed result tells
+      the analyst to write its report. The analyst's next turn is its final
+      one, with tool calls disabled, and ConditionalLogic then ends the loop.
+    """
+
+    def __init__(
+        self,
+        tools: List[Any],
+        budget: Optional[int] = None,
+        cache: Optional[ToolResultCache] = None,
+        max_workers: int = 4,
+        stream_output: bool = False,
+    ):
+        """Initialize the tool node.
+
+        Args:
+            tools: LangChain tools the analyst can call
+            budget: Maximum tool calls over an analyst's whole tool loop. None means unlimited
+            cache: Cache shared between tool nodes. None disables cross-analyst caching
+            max_workers: Maximum tool calls executed concurrently
+            stream_output: Write routed tool output to the custom stream in chunks
+        """
+        self.tools_by_name = {tool.name: tool for tool in tools}
+        self.budget = budget
+        self.cache = cache
+        self.max_workers = max(1, max_workers)
+        self.stream_output = stream_output
+
+    def __call__(self, state: Dict[str, Any], config: RunnableConfig):
+        tool_calls, outputs, pending, finish = self._plan(state)
+        if pending:
+            calls = [group[0] for group in pending.values()]
+            if len(calls) == 1:
+                results = [self._run_tool(calls[0], config)]
+            else:
+                # Each call runs in its own copy of the context, so vendor routing
+                # in the workers sees the run's config (see dataflows.config.use_config)
+                contexts = [contextvars.copy_context() for _ in calls]
+                with ThreadPoolExecutor(max_workers=min(self.max_workers, len(calls))) as executor:
+                    results = list(
+                        executor.map(
+                            lambda context, call: context.run(self._run_tool, call, config),
+                            contexts,
+                            calls,
+                        )
+                    )
+            finish(results)
+        return self._tool_messages(state, tool_calls, outputs)
+
+    async def acall(self, state: Dict[str, Any], config: RunnableConfig):
+        """Async counterpart of __call__; pending calls are awaited together on the event loop."""
+        tool_calls, outputs, pending, finish = self._plan(state)
+        if pending:
+            results = await asyncio.gather(
+                *(self._arun_tool(group[0], config) for group in pending.values())
+            )
+            finish(results)
+        return self._tool_messages(state, tool_calls, outputs)
+
+    def as_runnable(self) -> RunnableLambda:
+        """The node as a Runnable with both a sync and an async implementation, for add_node."""
+        return RunnableLambda(self.__call__, afunc=self.acall)
+
+    def _plan(self, state: Dict[str, Any]):
+        """Answer calls from history, cache or budget, and group the rest by signature.
+
+        Returns the tool calls, the outputs known so far by call id, the
+        pending calls grouped by signature, and a function that stores the
+        (content, ok) results of the first call of each pending group.
+        """
+        messages = state["messages"]
+        tool_calls = messages[-1].tool_calls
+        remaining = None if self.budget is None else max(0, self.budget - tool_calls_used(messages))
+        run_key = (state.get("company_of_interest"), str(state.get("trade_date")))
+
+        # Results already in this analyst's history, keyed by call signature
+        history = self._history_results(messages)
+
+        outputs: Dict[str, str] = {}
+        pending: Dict[tuple, List[dict]] = {}
+        executed = 0
+        for call in tool_calls:
+            signature = self._signature(call)
+            cached = history.get(signature)
+            if cached is None and self.cache is not None:
+                cached = self.cache.get(run_key + signature)
+            if cached is not None:
+                outputs[call["id"]] = cached
+                continue
+
+            if remaining is not None and executed >= remaining and signature not in pending:
+                outputs[call["id"]] = BUDGET_EXHAUSTED_MESSAGE
+                continue
+
+            if signature not in pending:
+                executed += 1
+            pending.setdefault(signature, []).append(call)
+
+        def finish(results):
+            for (signature, group), (content, ok) in zip(pending.items(), results):
+                # "Error ..." results of vendors that all failed are not cached, so
+                # a transient outage is retried by later runs
+                if ok and self.cache is not None and not _is_error_result(content):
+                    self.cache.put(run_key + signature, content)
+                for call in group:
+                    outputs[call["id"]] = content
+
+        return tool_calls, outputs, pending, finish
+
+    def _tool_messages(self, state, tool_calls, outputs):
+        messages = state["messages"]
+        tool_messages = [
+            ToolMessage(
+                content=outputs[call["id"]],
+                name=call["name"],
+                tool_call_id=call["id"],
+            )
+            for call in tool_calls
+        ]
+        if self.budget is not None and tool_calls_used(messages) + len(tool_messages) >= self.budget:
+            tool_messages[-1].content += BUDGET_REACHED_NOTE
+
+        return {"messages": tool_messages}
+
+    def _run_tool(self, call: dict, config: RunnableConfig):
+        """Run one tool call, returning (content, succeeded)."""
+        tool = self.tools_by_name.get(call["name"])
+        if tool is None:
+            return self._unknown_tool(call), False
+        try:
+            if self.stream_output:
+                content = self._stream_tool(tool, call)
+                if content is not None:
+                    return content, True
+            return str(tool.invoke(call["args"], config)), True
+        except Exception as e:
+            return f"Error: {call['name']} failed with {type(e).__name__}: {e}", False
+
+    def _stream_tool(self, tool, call: dict) -> Optional[str]:
+        """Run a routed tool call chunk by chunk, writing each chunk to the custom stream.
+
+        Returns the joined output, or None when the tool cannot be streamed or
+        the node is not running inside a graph.
+        """
+        try:
+            from langgraph.config import get_stream_writer
+
+            writer = get_stream_writer()
+        except (ImportError, RuntimeError):
+            return None
+        chunks = stream_routed_tool(tool, call["args"])
+        if chunks is None:
+            return None
+
+        output = []
+        for chunk in chunks:
+            output.append(chunk)
+            writer({"tool_output_chunk": {"tool": call["name"], "tool_call_id": call["id"], "chunk": chunk}})
+        return "".join(output)
+
+    async def _arun_tool(self, call: dict, config: RunnableConfig):
+        """Async counterpart of _run_tool."""
+        tool = self.tools_by_name.get(call["name"])
+        if tool is None:
+            return self._unknown_tool(call), False
+        try:
+            return str(await tool.ainvoke(call["args"], config)), True
+        except Exception as e:
+            return f"Error: {call['name']} failed with {type(e).__name__}: {e}", False
+
+    def _unknown_tool(self, call: dict) -> str:
+        names = ", ".join(self.tools_by_name)
+        return f"Error: {call['name']} is not a valid tool, try one of [{names}]."
+
+    @staticmethod
+    def _signature(call: dict) -> tuple:
+        return (call["name"], json.dumps(call["args"], sort_keys=True, default=str))
+
+    def _history_results(self, messages: Sequence[Any]) -> Dict[tuple, str]:
+        """Map call signatures in earlier steps to their successful results."""
+        calls_by_id = {}
+        for message in messages[:-1]:
+            for call in getattr(message, "tool_calls", None) or []:
+                calls_by_id[call["id"]] = call
+
+        results = {}
+        for message in messages:
+            if not isinstance(message, ToolMessage):
+                continue
+            call = calls_by_id.get(message.tool_call_id)
+            content = message.content
+            if call is None or not isinstance(content, str):
+                continue
+            if _is_error_result(content) or content.startswith(BUDGET_EXHAUSTED_MESSAGE):
+                continue
+            if content.endswith(BUDGET_REACHED_NOTE):
+                content = content[: -len(BUDGET_REACHED_NOTE)]
+            results[self._signature(call)] = content
+        return results
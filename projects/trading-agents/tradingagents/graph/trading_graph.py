@@ -1,31 +1,27 @@
 # TradingAgents/graph/trading_graph.py
 
+import asyncio
+import logging
 import os
-from pathlib import Path
-import json
 from datetime import date
 from typing import Dict, Any, Tuple, List, Optional
 
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
-from langchain_google_genai import ChatGoogleGenerativeAI
-
-from langgraph.prebuilt import ToolNode
-
 from tradingagents.agents import *
 from tradingagents.default_config import DEFAULT_CONFIG
-from tradingagents.agents.utils.memory import FinancialSituationMemory
+from tradingagents.agents.utils.memory import FinancialSituationMemory, situation_metadata
 from tradingagents.agents.utils.agent_states import (
     AgentState,
     InvestDebateState,
     RiskDebateState,
 )
-from tradingagents.dataflows.config import set_config
+from tradingagents.dataflows.config import set_config, use_config
+from tradingagents.dataflows.llm_pool import get_chat_model, get_http_clients
 
 # Import the new abstract tool methods from agent_utils
 from tradingagents.agents.utils.agent_utils import (
     get_stock_data,
     get_indicators,
+    get_indicators_batch,
     get_fundamentals,
     get_balance_sheet,
     get_cashflow,
@@ -33,15 +29,28 @@ from tradingagents.agents.utils.agent_utils import (
     get_news,
     get_insider_sentiment,
     get_insider_transactions,
-    get_global_news
+    get_global_news,
+    routable_tools,
 )
 
+from .accounting import (
+    BudgetExceededError,
+    BudgetedChatModel,
+    UsageLog,
+    create_token_accountant,
+)
+from .checkpointer import create_checkpoint_manager, run_variant
+from .state_log import create_state_log
+from .tool_node import AnalystToolNode, ToolResultCache
 from .conditional_logic import ConditionalLogic
+from .model_routing import ModelRouter
 from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
 
+logger = logging.getLogger(__name__)
+
 
 class TradingAgentsGraph:
     """Main class that orchestrates the trading agents framework."""
@@ -51,6 +60,7 @@ class TradingAgentsGraph:
         selected_analysts=["market", "social", "news", "fundamentals"],
         debug=False,
         config: Dict[str, Any] = None,
+        tool_cache: Optional[ToolResultCache] = None,
     ):
         """Initialize the trading agents graph and components.
 
@@ -58,6 +68,8 @@ class TradingAgentsGraph:
             selected_analysts: List of analyst types to include
             debug: Whether to run in debug mode
             config: Configuration dictionary. If None, uses default config
+            tool_cache: Tool result cache to share with other graphs in the
+                process. If None, the graph gets its own
         """
         self.debug = debug
         self.config = config or DEFAULT_CONFIG
@@ -72,28 +84,30 @@ class TradingAgentsGraph:
         )
 
         # Initialize LLMs
-        if self.config["llm_provider"].lower() == "openai" or self.config["llm_provider"] == "ollama" or self.config["llm_provider"] == "openrouter":
-            self.deep_thinking_llm = ChatOpenAI(model=self.config["deep_think_llm"], base_url=self.config["backend_url"])
-            self.quick_thinking_llm = ChatOpenAI(model=self.config["quick_think_llm"], base_url=self.config["backend_url"])
-        elif self.config["llm_provider"].lower() == "anthropic" or self.config["llm_provider"].lower() == "minimax":
-            # MiniMax uses Anthropic-compatible API format
-            api_key = os.environ.get("MINIMAX_API_KEY", os.environ.get("ANTHROPIC_API_KEY", ""))
-            self.deep_thinking_llm = ChatAnthropic(
-                model=self.config["deep_think_llm"].replace("minimax/", ""),
-                base_url=self.config["backend_url"],
-                api_key=api_key
-            )
-            self.quick_thinking_llm = ChatAnthropic(
-                model=self.config["quick_think_llm"].replace("minimax/", ""),
-                base_url=self.config["backend_url"],
-                api_key=api_key
+        self.deep_thinking_llm = self._create_llm(self.config["deep_think_llm"])
+        self.quick_thinking_llm = self._create_llm(self.config["quick_think_llm"])
+
+        # Once a run exceeds its budget, its remaining LLM calls use a cheaper model
+        self.downgrade_llm = None
+        budget = self.config.get("run_budget") or {}
+        if budget.get("action") == "downgrade":
+            self.downgrade_llm = self._create_llm(
+                budget.get("downgrade_model") or self.config["quick_think_llm"]
             )
-        elif self.config["llm_provider"].lower() == "google":
-            self.deep_thinking_llm = ChatGoogleGenerativeAI(model=self.config["deep_think_llm"])
-            self.quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"])
-        else:
-            raise ValueError(f"Unsupported LLM provider: {self.config['llm_provider']}")
-        
+            self.deep_thinking_llm = BudgetedChatModel(self.deep_thinking_llm, self.downgrade_llm)
+            self.quick_thinking_llm = BudgetedChatModel(self.quick_thinking_llm, self.downgrade_llm)
+
+        # Per-node model assignment with timeout fallbacks
+        self.model_router = ModelRouter(
+            self.config.get("model_routing"),
+            {"quick": self.quick_thinking_llm, "deep": self.deep_thinking_llm},
+            self._create_routed_llm,
+            base_specs={
+                "quick": {"model": self.config["quick_think_llm"]},
+                "deep": {"model": self.config["deep_think_llm"]},
+            },
+        )
+
         # Initialize memories
         self.bull_memory = FinancialSituationMemory("bull_memory", self.config)
         self.bear_memory = FinancialSituationMemory("bear_memory", self.config)
@@ -102,10 +116,15 @@ class TradingAgentsGraph:
         self.risk_manager_memory = FinancialSituationMemory("risk_manager_memory", self.config)
 
         # Create tool nodes
+        self.tool_cache = tool_cache or ToolResultCache(self.config.get("tool_cache_size", 256))
         self.tool_nodes = self._create_tool_nodes()
 
         # Initialize components
-        self.conditional_logic = ConditionalLogic()
+        self.conditional_logic = ConditionalLogic(
+            max_debate_rounds=self.config.get("max_debate_rounds", 1),
+            max_risk_discuss_rounds=self.config.get("max_risk_discuss_rounds", 1),
+            tool_call_budgets=self.config.get("tool_call_budgets"),
+        )
         self.graph_setup = GraphSetup(
             self.quick_thinking_llm,
             self.deep_thinking_llm,
@@ -116,97 +135,314 @@ class TradingAgentsGraph:
             self.invest_judge_memory,
             self.risk_manager_memory,
             self.conditional_logic,
+            model_router=self.model_router,
         )
 
-        self.propagator = Propagator()
-        self.reflector = Reflector(self.quick_thinking_llm)
-        self.signal_processor = SignalProcessor(self.quick_thinking_llm)
+        self.propagator = Propagator(self.config.get("max_recur_limit", 100))
+        self.reflector = Reflector(self.model_router.get("Reflection"))
+        self.signal_processor = SignalProcessor(self.model_router.get("Signal Processing"))
 
         # State tracking
         self.curr_state = None
         self.ticker = None
-        self.log_states_dict = {}  # date to full state dict
+        self.state_log = create_state_log(self.config)
+        self.usage_log = UsageLog(self.state_log.base_dir)
+        self.last_usage = None
+
+        # Checkpointing so failed or interrupted runs can be resumed
+        self.checkpoints = create_checkpoint_manager(self.config)
+        self.checkpoint_variant = run_variant(selected_analysts, self.config)
 
         # Set up the graph
-        self.graph = self.graph_setup.setup_graph(selected_analysts)
+        self.graph = self.graph_setup.setup_graph(
+            selected_analysts,
+            checkpointer=self.checkpoints.saver if self.checkpoints else None,
+            precompute_features=(self.config.get("market_features") or {}).get("enabled", True),
+        )
 
-    def _create_tool_nodes(self) -> Dict[str, ToolNode]:
+    def _create_llm(
+        self,
+        model: str,
+        provider: str = None,
+        base_url: str = None,
+        fake_llm: dict = None,
+        timeout: float = None,
+    ):
+        """Get the chat model for the configured provider.
+
+        Models are shared process-wide per (provider, backend_url, model), so
+        every graph reuses the same connections and the provider's adaptive
+        concurrency limit (see dataflows.llm_pool). Provider SDKs are imported
+        on first use rather than at module level so only the one in use is loaded.
+
+        Args:
+            model: Model name
+            provider: Provider, defaults to llm_provider
+            base_url: API endpoint, defaults to backend_url
+            fake_llm: Overrides of the fake_llm settings when the provider is "fake"
+            timeout: Request timeout in seconds. When set, the SDK does not
+                retry, so a call fails with a timeout error after at most
+                this long (see model_routing.TimeoutFallbackChatModel)
+        """
+        # Provider-specific keyword arguments of a request timeout
+        timeout_kwargs = {} if timeout is None else {"timeout": timeout, "max_retries": 0}
+        provider = (provider or self.config["llm_provider"]).lower()
+        base_url = base_url or self.config["backend_url"]
+        if provider in ("openai", "ollama", "openrouter"):
+
+            def factory():
+                from langchain_openai import ChatOpenAI
+
+                http_client, http_async_client = get_http_clients(provider, base_url)
+                return ChatOpenAI(
+                    model=model,
+                    base_url=base_url,
+                    http_client=http_client,
+                    http_async_client=http_async_client,
+                    **timeout_kwargs,
+                )
+
+        elif provider in ("anthropic", "minimax"):
+
+            def factory():
+                from langchain_anthropic import ChatAnthropic
+
+                # MiniMax uses Anthropic-compatible API format
+                api_key = os.environ.get("MINIMAX_API_KEY", os.environ.get("ANTHROPIC_API_KEY", ""))
+                return ChatAnthropic(
+                    model=model.replace("minimax/", ""),
+                    base_url=base_url,
+                    api_key=api_key,
+                    **(
+                        {"default_request_timeout": timeout, "max_retries": 0}
+                        if timeout is not None
+                        else {}
+                    ),
+                )
+
+        elif provider == "google":
+
+            def factory():
+                from langchain_google_genai import ChatGoogleGenerativeAI
+
+                return ChatGoogleGenerativeAI(model=model, **timeout_kwargs)
+
+        elif provider == "fake":
+            # Deterministic offline model for profiling and regression runs
+            from .profiling import FakeChatModel
+
+            return FakeChatModel(
+                model=model,
+                timeout=timeout,
+                **{**self.config.get("fake_llm", {}), **(fake_llm or {})},
+            )
+        else:
+            raise ValueError(f"Unsupported LLM provider: {self.config['llm_provider']}")
+
+        return get_chat_model(provider, model, base_url, factory, timeout=timeout)
+
+    def _create_routed_llm(self, spec: Dict[str, Any], timeout: float = None):
+        """Build a model from an entry of model_routing["models"], with an optional request timeout."""
+        llm = self._create_llm(
+            spec["model"],
+            provider=spec.get("provider"),
+            base_url=spec.get("backend_url"),
+            fake_llm=spec.get("fake_llm"),
+            timeout=timeout,
+        )
+        if self.downgrade_llm is not None:
+            llm = BudgetedChatModel(llm, self.downgrade_llm)
+        return llm
+
+    def _create_tool_nodes(self) -> Dict[str, AnalystToolNode]:
         """Create tool nodes for different data sources using abstract methods."""
+        tools = {
+            # Core stock data and technical indicators
+            "market": [get_stock_data, get_indicators_batch, get_indicators],
+            # News tools for social media analysis
+            "social": [get_news],
+            # News and insider information
+            "news": [
+                get_news,
+                get_global_news,
+                get_insider_sentiment,
+                get_insider_transactions,
+            ],
+            # Fundamental analysis tools
+            "fundamentals": [
+                get_fundamentals,
+                get_balance_sheet,
+                get_cashflow,
+                get_income_statement,
+            ],
+        }
+        budgets = self.config.get("tool_call_budgets") or {}
         return {
-            "market": ToolNode(
-                [
-                    # Core stock data tools
-                    get_stock_data,
-                    # Technical indicators
-                    get_indicators,
-                ]
-            ),
-            "social": ToolNode(
-                [
-                    # News tools for social media analysis
-                    get_news,
-                ]
-            ),
-            "news": ToolNode(
-                [
-                    # News and insider information
-                    get_news,
-                    get_global_news,
-                    get_insider_sentiment,
-                    get_insider_transactions,
-                ]
-            ),
-            "fundamentals": ToolNode(
-                [
-                    # Fundamental analysis tools
-                    get_fundamentals,
-                    get_balance_sheet,
-                    get_cashflow,
-                    get_income_statement,
-                ]
-            ),
+            analyst: AnalystToolNode(
+                routable_tools(analyst_tools, self.config),
+                budget=budgets.get(analyst),
+                cache=self.tool_cache,
+                max_workers=self.config.get("max_parallel_tool_calls", 4),
+                stream_output=self.config.get("stream_tool_output", False),
+            )
+            for analyst, analyst_tools in tools.items()
         }
 
-    def propagate(self, company_name, trade_date):
-        """Run the trading agents graph for a company on a specific date."""
+    def has_resumable_run(self, company_name, trade_date) -> bool:
+        """Check whether an interrupted run for this ticker and date can be resumed."""
+        if self.checkpoints is None:
+            return False
+        return self.checkpoints.has_pending_run(
+            self.graph, company_name, trade_date, self.checkpoint_variant
+        )
+
+    def prepare_run(self, company_name, trade_date, resume=True):
+        """Build the graph input and invocation args for a run.
+
+        When resuming, the input is None so LangGraph continues from the last
+        checkpoint of the (company_name, trade_date) thread of this graph's
+        analysts, depth and models. Otherwise any stale
+        checkpoints for that thread are dropped and a fresh initial state is used.
+        """
+        run_config = None
+        graph_input = self.propagator.create_initial_state(company_name, trade_date)
+
+        if self.checkpoints is not None:
+            run_config = self.checkpoints.run_config(
+                company_name, trade_date, self.checkpoint_variant
+            )
+            if resume and self.has_resumable_run(company_name, trade_date):
+                logger.info("Resuming interrupted run for %s on %s", company_name, trade_date)
+                graph_input = None
+            else:
+                self.checkpoints.clear(company_name, trade_date, self.checkpoint_variant)
+
+        return graph_input, self.propagator.get_graph_args(run_config)
 
+    def clear_checkpoints(self, company_name, trade_date):
+        """Drop the checkpoints of a run that reached END.
+
+        A finished run is never resumed, so its per-node checkpoints would
+        only grow the checkpoint database with every ticker and date.
+        """
+        if self.checkpoints is not None:
+            self.checkpoints.clear(company_name, trade_date, self.checkpoint_variant)
+
+    def propagate(self, company_name, trade_date, resume=True, callbacks=None):
+        """Run the trading agents graph for a company on a specific date.
+
+        Args:
+            company_name: Ticker symbol to analyze
+            trade_date: Date to analyze
+            resume: Resume an interrupted run for the same ticker and date
+                from its last completed node (requires checkpointing)
+            callbacks: Optional LangChain callback handlers for this run,
+                e.g. a NodeLatencyCallback
+
+        Token usage and estimated cost of the run are kept in `last_usage` and
+        appended to the ticker's usage log. Raises BudgetExceededError when the
+        run_budget is exceeded with action "abort".
+
+        The run reads this graph's config (see use_config), so graphs with
+        different settings can propagate concurrently.
+        """
+        with use_config(self.config):
+            return self._propagate(company_name, trade_date, resume, callbacks)
+
+    def _propagate(self, company_name, trade_date, resume, callbacks):
         self.ticker = company_name
 
         # Initialize state
-        init_agent_state = self.propagator.create_initial_state(
-            company_name, trade_date
-        )
-        args = self.propagator.get_graph_args()
-
-        if self.debug:
-            # Debug mode with tracing
-            trace = []
-            for chunk in self.graph.stream(init_agent_state, **args):
-                if len(chunk["messages"]) == 0:
-                    pass
-                else:
-                    chunk["messages"][-1].pretty_print()
-                    trace.append(chunk)
-
-            final_state = trace[-1]
-        else:
-            # Standard mode without tracing
-            final_state = self.graph.invoke(init_agent_state, **args)
+        init_agent_state, args = self.prepare_run(company_name, trade_date, resume)
+        accountant = create_token_accountant(self.config)
+        args["config"]["callbacks"] = [accountant] + list(callbacks or [])
+
+        try:
+            if self.debug:
+                # Debug mode with tracing
+                trace = []
+                for chunk in self.graph.stream(init_agent_state, **args):
+                    if len(chunk["messages"]) == 0:
+                        pass
+                    else:
+                        chunk["messages"][-1].pretty_print()
+                        trace.append(chunk)
+
+                final_state = trace[-1]
+            else:
+                # Standard mode without tracing
+                final_state = self.graph.invoke(init_agent_state, **args)
+            self.clear_checkpoints(company_name, trade_date)
+
+            signal = self.decision_signal(final_state, callbacks=[accountant])
+        except BudgetExceededError:
+            self.log_usage(company_name, trade_date, accountant, status="over_budget")
+            raise
 
         # Store current state for reflection
         self.curr_state = final_state
 
-        # Log state
+        # Log state and usage
         self._log_state(trade_date, final_state)
+        self.log_usage(company_name, trade_date, accountant)
 
         # Return decision and processed signal
-        return final_state, self.process_signal(final_state["final_trade_decision"])
+        return final_state, signal
+
+    async def apropagate(self, company_name, trade_date, resume=True, callbacks=None):
+        """Async variant of propagate, for running many graphs on one event loop.
+
+        The graph runs with ainvoke, so analyst tool calls are awaited through
+        route_to_vendor_async instead of each holding a thread. Arguments,
+        logging and budget handling are the same as propagate; the debug
+        trace is not printed.
+        """
+        with use_config(self.config):
+            return await self._apropagate(company_name, trade_date, resume, callbacks)
+
+    async def _apropagate(self, company_name, trade_date, resume, callbacks):
+        self.ticker = company_name
+
+        init_agent_state, args = await asyncio.to_thread(
+            self.prepare_run, company_name, trade_date, resume
+        )
+        accountant = create_token_accountant(self.config)
+        args["config"]["callbacks"] = [accountant] + list(callbacks or [])
+
+        try:
+            final_state = await self.graph.ainvoke(init_agent_state, **args)
+            await asyncio.to_thread(self.clear_checkpoints, company_name, trade_date)
+            signal = await self.adecision_signal(final_state, callbacks=[accountant])
+        except BudgetExceededError:
+            self.log_usage(company_name, trade_date, accountant, status="over_budget")
+            raise
+
+        self.curr_state = final_state
+        await asyncio.to_thread(self._log_state, trade_date, final_state)
+        self.log_usage(company_name, trade_date, accountant)
+        return final_state, signal
+
+    def log_usage(self, ticker, trade_date, accountant, status="completed"):
+        """Record the token usage of a run next to the ticker's state log.
+
+        The summary goes to the module logger rather than stdout, so it does
+        not break the CLI's live display; the CLI shows last_usage itself.
+        """
+        self.last_usage = accountant.report()
+        self.usage_log.append(ticker, trade_date, self.last_usage, status=status)
+        totals = self.last_usage["totals"]
+        logger.debug(
+            "%s %s %s: %s tokens in %s LLM calls (~$%.4f)",
+            ticker, trade_date, status, totals["total_tokens"], totals["calls"], totals["cost"],
+        )
 
     def _log_state(self, trade_date, final_state):
-        """Log the final state to a JSON file."""
-        self.log_states_dict[str(trade_date)] = {
+        """Append the final state to the ticker's state log."""
+        ticker = final_state["company_of_interest"]
+        self.state_log.append(ticker, trade_date, {
             "company_of_interest": final_state["company_of_interest"],
             "trade_date": final_state["trade_date"],
+            "market_features": final_state.get("market_features", {}),
             "market_report": final_state["market_report"],
             "sentiment_report": final_state["sentiment_report"],
             "news_report": final_state["news_report"],
@@ -232,36 +468,59 @@ class TradingAgentsGraph:
             },
             "investment_plan": final_state["investment_plan"],
             "final_trade_decision": final_state["final_trade_decision"],
-        }
+            "investment_decision": final_state.get("investment_decision"),
+            "trader_decision": final_state.get("trader_decision"),
+            "final_decision": final_state.get("final_decision"),
+        })
 
-        # Save to file
-        directory = Path(f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/")
-        directory.mkdir(parents=True, exist_ok=True)
+    def reflect_and_remember(self, returns_losses, state=None, available_date=None):
+        """Reflect on decisions and update memory based on returns.
 
-        with open(
-            f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/full_states_log_{trade_date}.json",
-            "w",
-        ) as f:
-            json.dump(self.log_states_dict, f, indent=4)
+        Args:
+            returns_losses: Realized returns of the decision
+            state: Final state to reflect on. Defaults to the state of the
+                most recent propagate call.
+            available_date: Date (yyyy-mm-dd) the returns became known, i.e.
+                the end of the holding period. Runs for earlier trade dates
+                do not recall these reflections. Defaults to today.
+        """
+        with use_config(self.config):
+            self._reflect_and_remember(returns_losses, state, available_date)
 
-    def reflect_and_remember(self, returns_losses):
-        """Reflect on decisions and update memory based on returns."""
-        self.reflector.reflect_bull_researcher(
-            self.curr_state, returns_losses, self.bull_memory
-        )
-        self.reflector.reflect_bear_researcher(
-            self.curr_state, returns_losses, self.bear_memory
+    def _reflect_and_remember(self, returns_losses, state, available_date):
+        state = state if state is not None else self.curr_state
+        metadata = situation_metadata(
+            state, (self.config.get("memory_retrieval") or {}).get("sectors")
         )
-        self.reflector.reflect_trader(
-            self.curr_state, returns_losses, self.trader_memory
-        )
-        self.reflector.reflect_invest_judge(
-            self.curr_state, returns_losses, self.invest_judge_memory
-        )
-        self.reflector.reflect_risk_manager(
-            self.curr_state, returns_losses, self.risk_manager_memory
-        )
-
-    def process_signal(self, full_signal):
+        metadata["available_date"] = str(available_date or date.today().isoformat())[:10]
+        for reflect, memory in (
+            (self.reflector.reflect_bull_researcher, self.bull_memory),
+            (self.reflector.reflect_bear_researcher, self.bear_memory),
+            (self.reflector.reflect_trader, self.trader_memory),
+            (self.reflector.reflect_invest_judge, self.invest_judge_memory),
+            (self.reflector.reflect_risk_manager, self.risk_manager_memory),
+        ):
+            reflect(state, returns_losses, memory, metadata)
+
+    def process_signal(self, full_signal, callbacks=None):
         """Process a signal to extract the core decision."""
-        return self.signal_processor.process_signal(full_signal)
+        return self.signal_processor.process_signal(full_signal, callbacks=callbacks)
+
+    def decision_signal(self, final_state, callbacks=None):
+        """BUY, SELL or HOLD of a run's final state.
+
+        Read from the Risk Judge's structured decision when there is one, so
+        no extra LLM call is made; otherwise extracted from the prose final
+        decision by process_signal.
+        """
+        if final_state.get("final_decision"):
+            return final_state["final_decision"]["decision"]
+        return self.process_signal(final_state["final_trade_decision"], callbacks=callbacks)
+
+    async def adecision_signal(self, final_state, callbacks=None):
+        """Async variant of decision_signal."""
+        if final_state.get("final_decision"):
+            return final_state["final_decision"]["decision"]
+        return await self.signal_processor.aprocess_signal(
+            final_state["final_trade_decision"], callbacks=callbacks
+        )